@@ -0,0 +1,274 @@
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from imxInsights.compair.compairObject import ImxComparedObject
+from imxInsights.compair.compairStatusEnum import CompairStatus
+from imxInsights.domain.imxObject import ImxObject
+
+_STATUSES = list(CompairStatus)
+_CODE = {status: np.int8(idx) for idx, status in enumerate(_STATUSES)}
+_CHANGE_CODES = [
+    _CODE[CompairStatus.CHANGED],
+    _CODE[CompairStatus.DELETED],
+    _CODE[CompairStatus.CREATED],
+]
+_PRIORITY_KEYS = ("@name", "@puic")
+
+
+def _sort_keys(keys: Iterable[str]) -> list[str]:
+    return sorted(keys, key=lambda key: (key not in _PRIORITY_KEYS, key))
+
+
+def compair_codes(codes: np.ndarray) -> np.ndarray:
+    """
+    Determines the statuses of dictionary encoded values along the last (container) axis.
+
+    ??? info
+        Code 0 is a value that is not present, equal codes are equal values. The status of a value is
+        determined by the value in the previous container, the same way `compair_values` does.
+
+    Args:
+        codes: The value codes, the last axis is the container axis.
+
+    Returns:
+        The status codes, the index of the status in `CompairStatus`.
+    """
+    status = np.empty(codes.shape, dtype=np.int8)
+    present = codes != 0
+    status[..., 0] = np.where(
+        present[..., 0],
+        _CODE[CompairStatus.INITIAL_PRESENT],
+        _CODE[CompairStatus.NOT_PRESENT],
+    )
+    previous, current = codes[..., :-1], codes[..., 1:]
+    previous_present, current_present = present[..., :-1], present[..., 1:]
+    status[..., 1:] = np.select(
+        [
+            ~previous_present & ~current_present,
+            ~previous_present,
+            ~current_present,
+            previous == current,
+        ],
+        [
+            _CODE[CompairStatus.NOT_PRESENT],
+            _CODE[CompairStatus.CREATED],
+            _CODE[CompairStatus.DELETED],
+            _CODE[CompairStatus.NOT_CHANGED],
+        ],
+        _CODE[CompairStatus.CHANGED],
+    )
+    return status
+
+
+@dataclass
+class _TypeMatrix:
+    """The dictionary encoded values of the objects of one type, codes has shape (puic, field, container)."""
+
+    puics: list[str]
+    paths: list[str]
+    keys: list[str]
+    uniques: np.ndarray
+    codes: np.ndarray
+    container_status: np.ndarray
+    global_changed: np.ndarray
+
+
+class ImxColumnarCompair:
+    """
+    A columnar comparison of the objects of multiple containers.
+
+    ??? info
+        The objects are grouped by the type of their first occurrence. For every type the values are stored
+        in a (puic, field, container) matrix of dictionary encoded strings, the statuses of all values are
+        determined by vectorized comparisons along the container axis. The per container and global statuses
+        are reductions over the field axis. ImxComparedObjects are only created on request, see
+        `get_compared_objects`.
+
+    Args:
+        objects: The objects of every puic, one list per puic.
+        container_order: The container ids in order.
+
+    Attributes:
+        container_order: The container ids in order.
+    """
+
+    def __init__(
+        self, objects: Iterable[list[ImxObject]], container_order: tuple[str, ...]
+    ):
+        self.container_order: tuple[str, ...] = container_order
+        self._container_ids: list[str] = list(dict.fromkeys(container_order))
+        self._positions: dict[str, list[int]] = {}
+        for idx, container_id in enumerate(container_order):
+            self._positions.setdefault(container_id, []).append(idx)
+
+        # the index is in the order of the objects, so the compared objects are in the same order as the tree
+        by_type: dict[str, list[list[ImxObject]]] = {}
+        self._index: dict[str, tuple[str, int]] = {}
+        for imx_objects in objects:
+            groups = by_type.setdefault(imx_objects[0].tag, [])
+            self._index[imx_objects[0].puic] = (imx_objects[0].tag, len(groups))
+            groups.append(imx_objects)
+
+        self._matrices: dict[str, _TypeMatrix] = {
+            object_type: self._build_matrix(groups)
+            for object_type, groups in by_type.items()
+        }
+
+    def _build_matrix(self, groups: list[list[ImxObject]]) -> _TypeMatrix:
+        key_ids: dict[str, int] = {}
+        rows, columns, containers, values = [], [], [], []
+        for row, imx_objects in enumerate(groups):
+            for imx_object in imx_objects:
+                positions = self._positions.get(imx_object.container_id or "", [])
+                properties = imx_object.properties | imx_object.extension_properties
+                for key, value in [*properties.items(), ("tags", imx_object.tag)]:
+                    column = key_ids.setdefault(key, len(key_ids))
+                    for position in positions:
+                        rows.append(row)
+                        columns.append(column)
+                        containers.append(position)
+                        values.append(value)
+
+        keys = [*_sort_keys(key for key in key_ids if key != "tags"), "tags"]
+        order = np.empty(len(key_ids), dtype=np.int64)
+        order[[key_ids[key] for key in keys]] = np.arange(len(keys))
+
+        value_codes, uniques = pd.factorize(np.array(values, dtype=object))
+        codes = np.zeros(
+            (len(groups), len(keys), len(self.container_order)), dtype=np.int32
+        )
+        # later objects of the same container overwrite earlier ones, like the object engine does
+        codes[rows, order[columns], containers] = value_codes + 1
+
+        status = compair_codes(codes)
+        present: np.ndarray = np.asarray(
+            (status != _CODE[CompairStatus.NOT_PRESENT]).any(axis=1)
+        )
+        changed: np.ndarray = np.asarray(np.isin(status, _CHANGE_CODES).any(axis=1))
+        container_status = np.stack(
+            [
+                np.where(
+                    ~present[:, positions].any(axis=1),
+                    _CODE[CompairStatus.NOT_PRESENT],
+                    np.where(
+                        changed[:, positions].any(axis=1),
+                        _CODE[CompairStatus.CHANGED],
+                        _CODE[CompairStatus.NOT_CHANGED],
+                    ),
+                )
+                for positions in self._positions.values()
+            ],
+            axis=1,
+        ).reshape(len(groups), len(self._positions))
+        return _TypeMatrix(
+            puics=[imx_objects[0].puic for imx_objects in groups],
+            paths=[imx_objects[0].path for imx_objects in groups],
+            keys=keys,
+            uniques=np.asarray(uniques, dtype=object),
+            codes=codes,
+            container_status=container_status,
+            global_changed=(container_status == _CODE[CompairStatus.CHANGED]).any(
+                axis=1
+            ),
+        )
+
+    def _diff_data(self, matrix: _TypeMatrix, row: int) -> dict[str, list]:
+        codes = matrix.codes[row]
+        diff_data = {}
+        for column in np.flatnonzero(codes.any(axis=1)):
+            diff_data[matrix.keys[column]] = [
+                (container_id, matrix.uniques[code - 1] if code else None)
+                for container_id, code in zip(self.container_order, codes[column])
+            ]
+        # the tags hold one value per container id, also if a container is in the order more than once
+        diff_data["tags"] = list(dict(diff_data["tags"]).items())
+        return diff_data
+
+    def get_compared_object(self, puic: str) -> ImxComparedObject:
+        """
+        Creates the compared object of a puic, the fields are created when they are accessed.
+
+        Args:
+            puic: The puic of the object.
+
+        Returns:
+            The compared object.
+        """
+        object_type, row = self._index[puic]
+        matrix = self._matrices[object_type]
+        return ImxComparedObject.from_status(
+            lambda: self._diff_data(matrix, row),
+            self.container_order,
+            CompairStatus.CHANGED
+            if matrix.global_changed[row]
+            else CompairStatus.NOT_CHANGED,
+            tuple(
+                (idx, container_id, _STATUSES[code])
+                for idx, (container_id, code) in enumerate(
+                    zip(self._container_ids, matrix.container_status[row])
+                )
+            ),
+            puic=puic,
+            tag=object_type,
+            path=matrix.paths[row],
+        )
+
+    def get_compared_objects(self) -> Mapping[str, ImxComparedObject]:
+        """
+        Returns a mapping of puic to compared object, the objects are created on first access.
+
+        Returns:
+            The compared objects by puic.
+        """
+        return _ComparedObjects(self)
+
+    def get_status_frame(self) -> pd.DataFrame:
+        """
+        Returns the statuses of all objects as a pandas DataFrame.
+
+        Returns:
+            A DataFrame indexed by puic with the object type, the global status and a column per container.
+        """
+        frames = []
+        for object_type, matrix in self._matrices.items():
+            frame = pd.DataFrame(
+                np.array(_STATUSES, dtype=object)[matrix.container_status],
+                index=pd.Index(matrix.puics, name="puic"),
+                columns=self._container_ids,
+            )
+            frame.insert(0, "global_status", CompairStatus.NOT_CHANGED)
+            frame.loc[matrix.global_changed, "global_status"] = CompairStatus.CHANGED
+            frame.insert(0, "type", object_type)
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=["type", "global_status", *self._container_ids])
+        return pd.concat(frames)
+
+
+class _ComparedObjects(Mapping[str, ImxComparedObject]):
+    """A read only mapping that creates and caches the compared objects on access."""
+
+    def __init__(self, compair: ImxColumnarCompair):
+        self._compair = compair
+        self._cache: dict[str, ImxComparedObject] = {}
+
+    def __getitem__(self, puic: str) -> ImxComparedObject:
+        compared_object = self._cache.get(puic)
+        if compared_object is None:
+            compared_object = self._cache[puic] = self._compair.get_compared_object(
+                puic
+            )
+        return compared_object
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._compair._index)
+
+    def __len__(self) -> int:
+        return len(self._compair._index)
+
+    def __contains__(self, puic: Any) -> bool:
+        return puic in self._compair._index
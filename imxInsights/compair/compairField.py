@@ -7,6 +7,36 @@ from imxInsights.compair.compairStatusEnum import (
 )
 
 
+def compair_values(values: tuple[Any, ...] | list[Any]) -> list[CompairStatus]:
+    """
+    Determines the status of every value of a field compared to the value in the previous container.
+
+    Args:
+        values: The values of the field in container order, None if not present.
+
+    Returns:
+        The status of every value.
+    """
+    statuses = []
+    previous_value: Any = None
+    for idx, value in enumerate(values):
+        if idx == 0 and value is not None:
+            status = CompairStatus.INITIAL_PRESENT
+        elif previous_value is None and value is None:
+            status = CompairStatus.NOT_PRESENT
+        elif previous_value is None and value is not None:
+            status = CompairStatus.CREATED
+        elif previous_value is not None and value is None:
+            status = CompairStatus.DELETED
+        elif previous_value == value:
+            status = CompairStatus.NOT_CHANGED
+        else:
+            status = CompairStatus.CHANGED
+        statuses.append(status)
+        previous_value = value
+    return statuses
+
+
 class ImxFieldCompair:
     """
     Represents a comparison field with a set of values across containers.
@@ -34,23 +64,9 @@ class ImxFieldCompair:
         return f"<ImxFieldCompair name={self.name} {[item.status.name for item in self.values]}/>"
 
     def _set_status(self):
-        previous_value: Any = None
-
-        for idx, item in enumerate(self.values):
-            if idx == 0 and item.value is not None:
-                item.status = CompairStatus.INITIAL_PRESENT
-            elif previous_value is None and item.value is None:
-                item.status = CompairStatus.NOT_PRESENT
-            elif previous_value is None and item.value is not None:
-                item.status = CompairStatus.CREATED
-            elif previous_value is not None and item.value is None:
-                item.status = CompairStatus.DELETED
-            elif previous_value == item.value:
-                item.status = CompairStatus.NOT_CHANGED
-            elif previous_value != item.value and item.value is not None:
-                item.status = CompairStatus.CHANGED
-
-            previous_value = item.value
+        statuses = compair_values([item.value for item in self.values])
+        for item, status in zip(self.values, statuses):
+            item.status = status
 
     def _set_global_status(self):
         self.global_status = check_status_changed_deleted_or_created(
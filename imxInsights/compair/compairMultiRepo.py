@@ -1,6 +1,35 @@
+import zlib
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
 from typing import Any
 
+from imxInsights.compair.compairColumnar import ImxColumnarCompair
 from imxInsights.compair.compairObject import ImxComparedObject
+from imxInsights.compair.compairStatusEnum import CompairStatus
+from imxInsights.domain.imxObject import (
+    PropertiesSource,
+    flatten_extension_properties,
+    properties_from_source,
+)
+from imxInsights.utils.helpers import hash_properties
+
+ObjectSnapshot = tuple[str, tuple[tuple[str, str, dict[str, str], str], ...]]
+"""A picklable snapshot of a puic, the puic and per object the container id, tag, properties and content hash."""
+
+SourceSnapshot = tuple[
+    str,
+    tuple[
+        tuple[str, str, PropertiesSource, tuple[tuple[str, PropertiesSource], ...]],
+        ...,
+    ],
+]
+"""A picklable snapshot of a puic that is not flattened, the puic and per object the container id, tag,
+properties source and the tag and properties source of every extension object."""
+
+ObjectStatus = tuple[CompairStatus, tuple[tuple[int, str, CompairStatus], ...]]
+"""The global status and the status of each container of a compared object."""
 
 
 class ImxCompareMultiRepo:
@@ -8,11 +37,15 @@ class ImxCompareMultiRepo:
     A class to handle multi-repository comparisons of IMX objects.
 
     Attributes:
-        values (dict[str, ImxComparedObject]): A dictionary holding compared objects.
+        values (Mapping[str, ImxComparedObject]): A dictionary holding compared objects.
+        container_order (tuple[str, ...]): The container ids in order.
+        columnar (ImxColumnarCompair | None): The columnar comparison, if the columnar engine is used.
     """
 
     def __init__(self):
-        self.values: dict[str, ImxComparedObject] = {}
+        self.values: Mapping[str, ImxComparedObject] = {}
+        self.container_order: tuple[str, ...] = ()
+        self.columnar: ImxColumnarCompair | None = None
 
     @staticmethod
     def _is_priority_field(field):
@@ -28,10 +61,11 @@ class ImxCompareMultiRepo:
             ) if add_extension_objects else None
         return sorted(all_keys)
 
-    def _sort_priority_keys(self, all_keys):
-        priority_keys = [field for field in all_keys if self._is_priority_field(field)]
+    @classmethod
+    def _sort_priority_keys(cls, all_keys):
+        priority_keys = [field for field in all_keys if cls._is_priority_field(field)]
         non_priority_keys = [
-            field for field in all_keys if not self._is_priority_field(field)
+            field for field in all_keys if not cls._is_priority_field(field)
         ]
         return priority_keys + non_priority_keys
 
@@ -64,33 +98,433 @@ class ImxCompareMultiRepo:
                 merged_dict[key].append((container_id, value))
         return merged_dict
 
+    @classmethod
+    def _get_diff_data(cls, imx_obj, container_order) -> dict[str, list]:
+        sorted_keys = cls._sort_priority_keys(cls._get_all_properties_keys(imx_obj))
+        properties = cls._get_merged_properties(
+            cls._get_container_properties(imx_obj),
+            cls._get_container_extention_properties(imx_obj),
+        )
+        merged_dict = cls._populate_diff(sorted_keys, properties, container_order)
+
+        container_dict: dict[str, Any] = {item: None for item in container_order}
+        for item in imx_obj:
+            container_dict[item.container_id] = item.tag
+        merged_dict["tags"] = list(container_dict.items())
+        return merged_dict
+
+    @staticmethod
+    def _is_not_changed(imx_obj, container_order) -> bool:
+        if len(imx_obj) != len(container_order):
+            return False
+        if {item.container_id for item in imx_obj} != set(container_order):
+            return False
+        content_hash = imx_obj[0].content_hash
+        return all(item.content_hash == content_hash for item in imx_obj[1:])
+
+    @classmethod
+    def _get_snapshot(cls, imx_obj) -> ObjectSnapshot:
+        return cls._get_entries_snapshot(
+            imx_obj[0].puic, [(item.container_id or "", item) for item in imx_obj]
+        )
+
+    @classmethod
+    def _get_snapshot_diff_data(
+        cls, snapshot: ObjectSnapshot, container_order
+    ) -> dict[str, list]:
+        _, items = snapshot
+        all_keys = sorted({key for _, _, properties, _ in items for key in properties})
+        merged_dict = cls._populate_diff(
+            cls._sort_priority_keys(all_keys),
+            {container_id: properties for container_id, _, properties, _ in items},
+            container_order,
+        )
+
+        container_dict: dict[str, Any] = {item: None for item in container_order}
+        for container_id, tag, _, _ in items:
+            container_dict[container_id] = tag
+        merged_dict["tags"] = list(container_dict.items())
+        return merged_dict
+
+    @classmethod
+    def _compare_snapshot(
+        cls, snapshot: ObjectSnapshot, container_order
+    ) -> ObjectStatus:
+        _, items = snapshot
+        if (
+            len(items) == len(container_order)
+            and {container_id for container_id, _, _, _ in items}
+            == set(container_order)
+            and len({content_hash for _, _, _, content_hash in items}) == 1
+        ):
+            return CompairStatus.NOT_CHANGED, tuple(
+                (idx, container_id, CompairStatus.NOT_CHANGED)
+                for idx, container_id in enumerate(dict.fromkeys(container_order))
+            )
+        compared_object = ImxComparedObject(
+            cls._get_snapshot_diff_data(snapshot, container_order), container_order
+        )
+        return compared_object.global_status, compared_object.container_status
+
+    @staticmethod
+    def _get_source_snapshot(imx_obj) -> SourceSnapshot:
+        return (
+            imx_obj[0].puic,
+            tuple(
+                (
+                    item.container_id or "",
+                    item.tag,
+                    item.get_properties_source(),
+                    tuple(
+                        (extension.tag, extension.get_properties_source())
+                        for extension in item.imx_extensions
+                    ),
+                )
+                for item in imx_obj
+            ),
+        )
+
+    @staticmethod
+    def _resolve_source_snapshot(snapshot: SourceSnapshot) -> ObjectSnapshot:
+        puic, items = snapshot
+        resolved = []
+        for container_id, tag, source, extension_sources in items:
+            properties = properties_from_source(source)
+            extension_properties = flatten_extension_properties(
+                (extension_tag, properties_from_source(extension_source))
+                for extension_tag, extension_source in extension_sources
+            )
+            resolved.append(
+                (
+                    container_id,
+                    tag,
+                    properties | extension_properties,
+                    hash_properties(tag, properties, extension_properties),
+                )
+            )
+        return puic, tuple(resolved)
+
+    def _create_sharded_mapping(
+        self, tree, container_order, max_workers: int
+    ) -> dict[str, ImxComparedObject]:
+        """
+        Compares the objects of all containers in a process pool.
+
+        ??? info
+            The workers receive the serialized xml elements of the objects that are not flattened yet, they
+            flatten the properties, hash them and compare them. The snapshots are split in a shard per worker
+            by the crc32 of the puic, only the statuses are returned. The objects in this process are not
+            flattened, the compared objects create their fields when they are accessed.
+
+            Serializing and sending the elements has a cost of its own. The pool only pays off if the trees
+            are large and not flattened yet, for example directly after loading. For small or already
+            compared trees it is slower than the serial comparison.
+        """
+        objects = [list(imx_obj) for imx_obj in tree.get_all()]
+        shards: list[list[SourceSnapshot]] = [[] for _ in range(max_workers)]
+        for imx_obj in objects:
+            shards[zlib.crc32(imx_obj[0].puic.encode()) % max_workers].append(
+                self._get_source_snapshot(imx_obj)
+            )
+
+        statuses: dict[str, ObjectStatus] = {}
+        with ProcessPoolExecutor(max_workers) as process_pool:
+            for shard_statuses in process_pool.map(
+                _compare_shard, shards, repeat(container_order)
+            ):
+                statuses.update(shard_statuses)
+
+        compared_objects = {}
+        for imx_obj in objects:
+            first = imx_obj[0]
+            global_status, container_status = statuses[first.puic]
+            compared_objects[first.puic] = ImxComparedObject.from_status(
+                partial(self._get_diff_data, imx_obj, container_order),
+                container_order,
+                global_status,
+                container_status,
+                puic=first.puic,
+                tag=first.tag,
+                path=first.path,
+            )
+        return compared_objects
+
+    @classmethod
+    def _compare(cls, imx_obj, container_order) -> ImxComparedObject:
+        first = imx_obj[0]
+        if cls._is_not_changed(imx_obj, container_order):
+            return ImxComparedObject.not_changed(
+                # a copy, the list in the tree is extended if a container is added
+                partial(cls._get_diff_data, list(imx_obj), container_order),
+                container_order,
+                puic=first.puic,
+                tag=first.tag,
+                path=first.path,
+            )
+        return ImxComparedObject(
+            cls._get_diff_data(imx_obj, container_order),
+            container_order,
+            puic=first.puic,
+            tag=first.tag,
+            path=first.path,
+        )
+
     def _create_change_over_container_mapping(
         self, tree, container_order
     ) -> dict[str, ImxComparedObject]:
-        out = {}
+        """
+        Compares the objects of all containers.
+
+        ??? info
+            Objects that are present in all containers with the same content hash are not changed, for those
+            a record is created without comparing the fields, so the cost depends on the changed objects.
+        """
+        return {
+            compared_object.puic: compared_object
+            for compared_object in self.iter_multi_repo(tree, container_order)
+        }
+
+    @classmethod
+    def iter_multi_repo(
+        cls,
+        tree,
+        container_order,
+        global_status: CompairStatus | None = None,
+        object_types: Iterable[str] | None = None,
+    ) -> Iterator[ImxComparedObject]:
+        """
+        Yields the compared objects of a multi repo tree as they are compared.
+
+        ??? info
+            Nothing is kept after an object is yielded, so the memory use does not depend on the number of
+            objects. The type filter is applied before an object is compared, the status filter after.
+
+        Args:
+            tree: The tree holding the objects of all containers.
+            container_order: The container ids in order.
+            global_status: If set only compared objects with this global status are yielded.
+            object_types: If set only compared objects of these types are yielded.
+
+        Yields:
+            The compared objects in the order of the tree.
+        """
+        types = None if object_types is None else frozenset(object_types)
         for imx_obj in tree.get_all():
-            sorted_keys = self._sort_priority_keys(
-                self._get_all_properties_keys(imx_obj)
+            if types is not None and imx_obj[0].tag not in types:
+                continue
+            compared_object = cls._compare(imx_obj, container_order)
+            if global_status is None or compared_object.global_status == global_status:
+                yield compared_object
+
+    @classmethod
+    def from_multi_repo(
+        cls,
+        tree,
+        container_order,
+        columnar: bool = False,
+        max_workers: int | None = None,
+    ):
+        """
+        Compares the objects of a multi repo tree.
+
+        ??? info
+            The columnar engine determines the statuses of all objects of a type by vectorized comparisons,
+            the compared objects are created when they are accessed. Use it for many or large containers.
+
+        Args:
+            tree: The tree holding the objects of all containers.
+            container_order: The container ids in order.
+            columnar: If True the columnar engine is used.
+            max_workers: The number of processes to compare in, if None the objects are compared in this
+                process. The pool is only faster for large trees that are not flattened yet, it can not
+                be combined with the columnar engine.
+
+        Returns:
+            The comparison.
+
+        Raises:
+            ValueError: If max_workers is smaller than 1 or given together with columnar.
+        """
+        if max_workers is not None:
+            if max_workers < 1:
+                raise ValueError("max_workers must be at least 1")  # noqa: TRY003
+            if columnar:
+                raise ValueError("max_workers can not be used with columnar")  # noqa: TRY003
+        self = cls()
+        self.container_order = tuple(container_order)
+        if columnar:
+            self.columnar = ImxColumnarCompair(tree.get_all(), container_order)
+            self.values = self.columnar.get_compared_objects()
+        elif max_workers is not None:
+            self.values = self._create_sharded_mapping(
+                tree, container_order, max_workers
             )
-            properties = self._get_merged_properties(
-                self._get_container_properties(imx_obj),
-                self._get_container_extention_properties(imx_obj),
+        else:
+            self.values = self._create_change_over_container_mapping(
+                tree, container_order
             )
-            merged_dict = self._populate_diff(sorted_keys, properties, container_order)
+        return self
 
-            container_dict: dict[str, Any] = {item: None for item in container_order}
-            for item in imx_obj:
-                container_dict[item.container_id] = item.tag
-            merged_dict["tags"] = list(container_dict.items())
-            tester = ImxComparedObject(merged_dict, container_order)
+    @classmethod
+    def from_trees(cls, trees, container_order) -> "ImxCompareMultiRepo":
+        """
+        Compares the objects of the trees of multiple containers.
 
-            # tester2 = tester.as_pandas_df()
-            out[imx_obj[0].puic] = tester
+        ??? info
+            The objects are looked up per tree, so trees can share objects. A puic that has the same object
+            in all trees is not changed without hashing or comparing its properties. For other puics the
+            content hashes are compared first, the fields are created when they are accessed.
 
-        return out
+        Args:
+            trees: The trees of the containers, in container order.
+            container_order: The container ids in order, one per tree.
 
-    @classmethod
-    def from_multi_repo(cls, tree, container_order):
+        Returns:
+            The comparison.
+        """
         self = cls()
-        self.values = self._create_change_over_container_mapping(tree, container_order)
+        self.container_order = tuple(container_order)
+        puics = dict.fromkeys(puic for tree in trees for puic in tree.tree_dict)
+        values: dict[str, ImxComparedObject] = {}
+        for puic in puics:
+            entries = [
+                (container_id, imx_object)
+                for container_id, tree in zip(self.container_order, trees)
+                for imx_object in tree.tree_dict.get(puic, [])
+            ]
+            first = entries[0][1]
+            snapshot = partial(cls._get_entries_snapshot, puic, entries)
+            if len(entries) == len(trees) and all(
+                imx_object is first for _, imx_object in entries
+            ):
+                values[puic] = ImxComparedObject.not_changed(
+                    partial(
+                        cls._get_lazy_snapshot_diff_data, snapshot, container_order
+                    ),
+                    container_order,
+                    puic=first.puic,
+                    tag=first.tag,
+                    path=first.path,
+                )
+                continue
+            global_status, container_status = cls._compare_snapshot(
+                snapshot(), container_order
+            )
+            values[puic] = ImxComparedObject.from_status(
+                partial(cls._get_lazy_snapshot_diff_data, snapshot, container_order),
+                container_order,
+                global_status,
+                container_status,
+                puic=first.puic,
+                tag=first.tag,
+                path=first.path,
+            )
+        self.values = values
         return self
+
+    @staticmethod
+    def _get_entries_snapshot(puic: str, entries) -> ObjectSnapshot:
+        return (
+            puic,
+            tuple(
+                (
+                    container_id,
+                    item.tag,
+                    item.properties | item.extension_properties,
+                    item.content_hash,
+                )
+                for container_id, item in entries
+            ),
+        )
+
+    @classmethod
+    def _get_lazy_snapshot_diff_data(cls, snapshot, container_order):
+        return cls._get_snapshot_diff_data(snapshot(), container_order)
+
+    @staticmethod
+    def _get_pair_status(imx_obj, previous_id: str, container_id: str) -> CompairStatus:
+        previous, current = None, None
+        for item in imx_obj:
+            if item.container_id == previous_id:
+                previous = item
+            elif item.container_id == container_id:
+                current = item
+        if previous is None and current is None:
+            return CompairStatus.NOT_PRESENT
+        if previous is None or current is None:
+            return CompairStatus.CHANGED
+        if previous.content_hash == current.content_hash:
+            return CompairStatus.NOT_CHANGED
+        return CompairStatus.CHANGED
+
+    def extend(self, tree, container_order) -> "ImxCompareMultiRepo":
+        """
+        Returns the comparison extended with a container that is added to the end of the order.
+
+        ??? info
+            The statuses of the existing containers do not depend on a container that is added after them,
+            so only the status of the new container relative to the previous container is determined. Equal
+            content hashes are not changed, for other objects the fields are only compared when accessed.
+            Puics that are new in the tree are compared as a whole, so they get CREATED values. This
+            comparison is not changed. If the container is already in the order or the columnar engine is
+            used the comparison is created from scratch.
+
+        Args:
+            tree: The tree holding the objects of all containers, including the added container.
+            container_order: The container ids in order, the added container last.
+
+        Returns:
+            The comparison of all containers.
+        """
+        container_order = tuple(container_order)
+        if (
+            self.columnar is not None
+            or not self.container_order
+            or container_order[:-1] != self.container_order
+            or container_order[-1] in self.container_order
+        ):
+            return self.from_multi_repo(tree, container_order)
+
+        previous_id, container_id = container_order[-2], container_order[-1]
+        status_index = len(dict.fromkeys(self.container_order))
+
+        out = type(self)()
+        out.container_order = container_order
+        values: dict[str, ImxComparedObject] = {}
+        for imx_obj in tree.get_all():
+            compared_object = self.values.get(imx_obj[0].puic)
+            if compared_object is None:
+                values[imx_obj[0].puic] = self._compare(imx_obj, container_order)
+                continue
+            status = self._get_pair_status(imx_obj, previous_id, container_id)
+            values[imx_obj[0].puic] = ImxComparedObject.from_status(
+                partial(self._get_diff_data, list(imx_obj), container_order),
+                container_order,
+                CompairStatus.CHANGED
+                if CompairStatus.CHANGED in (compared_object.global_status, status)
+                else CompairStatus.NOT_CHANGED,
+                (
+                    *compared_object.container_status,
+                    (status_index, container_id, status),
+                ),
+                puic=compared_object.puic,
+                tag=compared_object.tag,
+                path=compared_object.path,
+            )
+        out.values = values
+        return out
+
+
+def _compare_shard(
+    snapshots: list[SourceSnapshot], container_order
+) -> list[tuple[str, ObjectStatus]]:
+    """Flattens and determines the statuses of a shard of snapshots, runs in a worker process."""
+    return [
+        (
+            snapshot[0],
+            ImxCompareMultiRepo._compare_snapshot(
+                ImxCompareMultiRepo._resolve_source_snapshot(snapshot), container_order
+            ),
+        )
+        for snapshot in snapshots
+    ]
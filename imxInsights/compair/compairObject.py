@@ -1,6 +1,7 @@
+from collections.abc import Callable
 from typing import Any, cast
 
-from imxInsights.compair.compairField import ImxFieldCompair
+from imxInsights.compair.compairField import ImxFieldCompair, compair_values
 from imxInsights.compair.compairStatusEnum import (
     CompairStatus,
     check_status_changed_deleted_or_created,
@@ -29,7 +30,15 @@ class ImxComparedObject:
     """
     Represents a compared object with fields and statuses.
 
+    ??? info
+        The statuses are determined from the values of the diff data when the object is created, the
+        ImxFieldCompair objects are only created when `fields` is accessed. Reading `global_status` or
+        `container_status` does not create any field objects.
+
     Attributes:
+        puic: The puic of the compared object.
+        tag: The tag of the compared object.
+        path: The path of the compared object.
         fields: A list of ImxFieldCompair objects representing the fields.
         global_status: The global status of the compared object.
         container_status: The status of each container.
@@ -37,16 +46,122 @@ class ImxComparedObject:
     Args:
         diff_data_dict: A dictionary containing the diff data.
         container_order: The order of containers, if tuple of dict the dict represents {'id': 'alias'}.
+        puic: The puic of the compared object.
+        tag: The tag of the compared object.
+        path: The path of the compared object.
     """
 
     def __init__(
         self,
         diff_data_dict: dict[str, list[tuple[str, Any]]],
         container_order: tuple[str, ...] | tuple[dict[str, str], ...],
+        *,
+        puic: str = "",
+        tag: str = "",
+        path: str = "",
     ):
         # todo: make sure we can use a names container from the init of the compair,
-        self._data: dict[str, list[tuple[str, Any]]] = diff_data_dict
+        self.puic: str = puic
+        self.tag: str = tag
+        self.path: str = path
+        self._data: dict[str, list[tuple[str, Any]]] | None = diff_data_dict
+        self._get_data: Callable[[], dict[str, list[tuple[str, Any]]]] | None = None
+        self._set_container_order(container_order)
+
+        self._fields: list[ImxFieldCompair] | None = None
+        self.global_status: CompairStatus = CompairStatus.NOT_CHANGED
+        self.container_status: tuple[tuple[int, str, CompairStatus], ...] = tuple()
+
+        self._post_init()
+
+    @classmethod
+    def not_changed(
+        cls,
+        get_diff_data: Callable[[], dict[str, list[tuple[str, Any]]]],
+        container_order: tuple[str, ...] | tuple[dict[str, str], ...],
+        *,
+        puic: str = "",
+        tag: str = "",
+        path: str = "",
+    ) -> "ImxComparedObject":
+        """
+        Creates a compared object of an object that is equal in all containers.
+
+        ??? info
+            The statuses of an equal object are known without comparing the fields, so the diff data and
+            fields are only created when `fields` is accessed.
 
+        Args:
+            get_diff_data: A callable that returns the diff data.
+            container_order: The order of containers, if tuple of dict the dict represents {'id': 'alias'}.
+            puic: The puic of the compared object.
+            tag: The tag of the compared object.
+            path: The path of the compared object.
+
+        Returns:
+            A compared object with status NOT_CHANGED for all containers.
+        """
+        self = cls.from_status(
+            get_diff_data,
+            container_order,
+            CompairStatus.NOT_CHANGED,
+            (),
+            puic=puic,
+            tag=tag,
+            path=path,
+        )
+        self.container_status = tuple(
+            (idx, container_id, CompairStatus.NOT_CHANGED)
+            for idx, container_id in enumerate(dict.fromkeys(self._container_order))
+        )
+        return self
+
+    @classmethod
+    def from_status(
+        cls,
+        get_diff_data: Callable[[], dict[str, list[tuple[str, Any]]]],
+        container_order: tuple[str, ...] | tuple[dict[str, str], ...],
+        global_status: CompairStatus,
+        container_status: tuple[tuple[int, str, CompairStatus], ...],
+        *,
+        puic: str = "",
+        tag: str = "",
+        path: str = "",
+    ) -> "ImxComparedObject":
+        """
+        Creates a compared object of which the statuses are already determined.
+
+        ??? info
+            Used by comparisons that determine the statuses in bulk, the diff data and fields are only
+            created when `fields` is accessed.
+
+        Args:
+            get_diff_data: A callable that returns the diff data.
+            container_order: The order of containers, if tuple of dict the dict represents {'id': 'alias'}.
+            global_status: The global status of the compared object.
+            container_status: The status of each container.
+            puic: The puic of the compared object.
+            tag: The tag of the compared object.
+            path: The path of the compared object.
+
+        Returns:
+            A compared object with the given statuses.
+        """
+        self = cls.__new__(cls)
+        self.puic = puic
+        self.tag = tag
+        self.path = path
+        self._data = None
+        self._get_data = get_diff_data
+        self._set_container_order(container_order)
+        self._fields = None
+        self.global_status = global_status
+        self.container_status = container_status
+        return self
+
+    def _set_container_order(
+        self, container_order: tuple[str, ...] | tuple[dict[str, str], ...]
+    ) -> None:
         if all(isinstance(item, str) for item in container_order):
             # todo: try to remove the case, make sure we can handle aliases
             container_order = cast(tuple[str, ...], container_order)
@@ -68,16 +183,20 @@ class ImxComparedObject:
                 "container_order must be a tuple of strings or a tuple of dictionaries"
             )
 
-        self.fields: list[ImxFieldCompair] = []
-        self.global_status: CompairStatus = CompairStatus.NOT_CHANGED
-        self.container_status: tuple[tuple[int, str, CompairStatus], ...] = tuple()
+    def _post_init(self):
+        self._determinate_change_status()
 
-        self._post_init()
+    @property
+    def fields(self) -> list[ImxFieldCompair]:
+        """
+        Get the compared fields, created on first access.
 
-    def _post_init(self):
-        self._set_compair_fields()
-        self._determinate_global_change_status()
-        self._determinate_container_change_status()
+        Returns:
+            A list of ImxFieldCompair objects representing the fields.
+        """
+        if self._fields is None:
+            self._set_compair_fields()
+        return cast(list[ImxFieldCompair], self._fields)
 
     @property
     def container_aliases(self) -> dict[str, str]:
@@ -90,26 +209,30 @@ class ImxComparedObject:
         return dict(zip(self._container_order, self._container_aliases))
 
     def _set_compair_fields(self):
-        for key, value in self._data.items():
-            self.fields.append(ImxFieldCompair(key, value))
-
-    def _determinate_global_change_status(self):
-        status = [item.global_status for item in self.fields]
-        if CompairStatus.CHANGED in status:
-            self.global_status = CompairStatus.CHANGED
+        if self._data is None and self._get_data is not None:
+            self._data = self._get_data()
+            self._get_data = None
+        self._fields = [
+            ImxFieldCompair(key, value) for key, value in (self._data or {}).items()
+        ]
 
-    def _determinate_container_change_status(self):
-        container_status_list: dict[str, list] = {
-            container: [] for container in self._container_order
+    def _determinate_change_status(self):
+        container_status_set: dict[str, set[CompairStatus]] = {
+            container: set() for container in self._container_order
         }
-        for field_ in self.fields:
-            for item in field_.values:
-                container_status_list[item.container_id].append(item.status)
+        for values in (self._data or {}).values():
+            statuses = compair_values([value for _, value in values])
+            for (container_id, _), status in zip(values, statuses):
+                container_status_set[container_id].add(status)
 
         self.container_status = tuple(
-            (idx, value[0], check_status_changed_deleted_or_created(value[1]))
-            for idx, value in enumerate(container_status_list.items())
+            (idx, container_id, check_status_changed_deleted_or_created(list(status)))
+            for idx, (container_id, status) in enumerate(container_status_set.items())
         )
+        if any(
+            status == CompairStatus.CHANGED for _, _, status in self.container_status
+        ):
+            self.global_status = CompairStatus.CHANGED
 
     # def apply_highlight(s):
     #     return [highlight_changes(val) for val in s]
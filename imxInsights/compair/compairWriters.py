@@ -0,0 +1,103 @@
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any, TextIO
+
+from imxInsights.compair.compairObject import ImxComparedObject
+from imxInsights.compair.compairStatusEnum import CompairStatus
+
+CHANGE_ROW_FIELDS = ("puic", "path", "field", "container", "value", "status")
+"""The columns of a change row."""
+
+CHANGE_STATUSES = frozenset(
+    [CompairStatus.CHANGED, CompairStatus.CREATED, CompairStatus.DELETED]
+)
+"""The value statuses that are written by default."""
+
+
+def iter_change_rows(
+    compared_objects: Iterable[ImxComparedObject],
+    statuses: Iterable[CompairStatus] = CHANGE_STATUSES,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yields a row for every field value of the compared objects with one of the given statuses.
+
+    ??? info
+        Compared objects with a NOT_CHANGED global status have no changed values, their fields are not
+        created. The rows are yielded per compared object, so an iterator of compared objects is streamed.
+
+    Args:
+        compared_objects: The compared objects, for example `ImxMultiRepo.iter_compair()`.
+        statuses: The statuses of the values to yield.
+
+    Yields:
+        A dict with the puic, path, field, container, value and status of a value.
+    """
+    statuses = frozenset(statuses)
+    skip_not_changed = statuses <= CHANGE_STATUSES
+    for compared_object in compared_objects:
+        if (
+            skip_not_changed
+            and compared_object.global_status == CompairStatus.NOT_CHANGED
+        ):
+            continue
+        for field in compared_object.fields:
+            for value in field.values:
+                if value.status in statuses:
+                    yield {
+                        "puic": compared_object.puic,
+                        "path": compared_object.path,
+                        "field": field.name,
+                        "container": value.container_id,
+                        "value": value.value,
+                        "status": value.status.value,
+                    }
+
+
+def write_ndjson(
+    compared_objects: Iterable[ImxComparedObject],
+    file: TextIO,
+    statuses: Iterable[CompairStatus] = CHANGE_STATUSES,
+) -> int:
+    """
+    Writes the change rows of the compared objects as newline delimited JSON.
+
+    Args:
+        compared_objects: The compared objects, for example `ImxMultiRepo.iter_compair()`.
+        file: A text file or stream to write to.
+        statuses: The statuses of the values to write.
+
+    Returns:
+        The number of rows written.
+    """
+    count = 0
+    for row in iter_change_rows(compared_objects, statuses):
+        file.write(json.dumps(row, ensure_ascii=False))
+        file.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(
+    compared_objects: Iterable[ImxComparedObject],
+    file: TextIO,
+    statuses: Iterable[CompairStatus] = CHANGE_STATUSES,
+) -> int:
+    """
+    Writes the change rows of the compared objects as CSV with a header row.
+
+    Args:
+        compared_objects: The compared objects, for example `ImxMultiRepo.iter_compair()`.
+        file: A text file or stream to write to, open files with `newline=""`.
+        statuses: The statuses of the values to write.
+
+    Returns:
+        The number of rows written.
+    """
+    writer = csv.DictWriter(file, fieldnames=CHANGE_ROW_FIELDS)
+    writer.writeheader()
+    count = 0
+    for row in iter_change_rows(compared_objects, statuses):
+        writer.writerow(row)
+        count += 1
+    return count
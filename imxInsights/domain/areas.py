@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from lxml.etree import _Element as Element
 from shapely.geometry import Polygon
 
+from imxInsights.domain.imxEnums import ImxAreaEnum
 from imxInsights.utils.shapley_helpers import GmlShapleyFactory
 
 
@@ -24,3 +25,60 @@ class Areas:
             coordinates=coordinates,
             shapely=GmlShapleyFactory.gml_polygon_to_shapely(coordinates),
         )
+
+
+@dataclass
+class ProjectAreas:
+    """
+    Represents the areas of a project.
+
+    Attributes:
+        user_area: The area the user is working in.
+        work_area: The area that can be changed by the project.
+        context_area: The area that is delivered as context.
+    """
+
+    user_area: Areas | None = None
+    work_area: Areas | None = None
+    context_area: Areas | None = None
+
+    @staticmethod
+    def from_element(project_metadata_element: Element) -> "ProjectAreas":
+        """
+        Create a ProjectAreas instance from a ProjectMetadata element.
+
+        Args:
+            project_metadata_element: The ProjectMetadata element, areas that are not present are None.
+
+        Returns:
+            The areas of the project.
+        """
+        self = ProjectAreas()
+        for area_type, attribute_name in [
+            (ImxAreaEnum.USER_AREA, "user_area"),
+            (ImxAreaEnum.WORK_AREA, "work_area"),
+            (ImxAreaEnum.CONTEXT_AREA, "context_area"),
+        ]:
+            area_element = project_metadata_element.find(
+                f"{{http://www.prorail.nl/IMSpoor}}{area_type.value}"
+            )
+            if area_element is not None:
+                setattr(self, attribute_name, Areas.from_element(area_element))
+        return self
+
+    def items(self) -> list[tuple[ImxAreaEnum, Areas]]:
+        """
+        Returns the present areas, innermost area first.
+
+        Returns:
+            The area type and area of every present area.
+        """
+        return [
+            (area_type, area)
+            for area_type, area in [
+                (ImxAreaEnum.USER_AREA, self.user_area),
+                (ImxAreaEnum.WORK_AREA, self.work_area),
+                (ImxAreaEnum.CONTEXT_AREA, self.context_area),
+            ]
+            if area is not None
+        ]
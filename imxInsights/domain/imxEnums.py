@@ -32,3 +32,12 @@ class Imx12DataExchangePhaseEnum(Enum):
             if member.value == value:
                 return member
         raise ValueError(f"{value} is not a valid {cls.__name__}")  # noqa: TRY003
+
+
+class ImxAreaEnum(Enum):
+    """Area of a project an object is located in, the innermost area that intersects the object geometry."""
+
+    USER_AREA = "UserArea"
+    WORK_AREA = "WorkArea"
+    CONTEXT_AREA = "ContextArea"
+    OUTSIDE = "Outside"
@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Optional
 
+from loguru import logger
 from lxml.etree import _Element
 from shapely import LineString, Point, Polygon
 
@@ -21,7 +22,7 @@ class ImxGeographicLocation:
 
     """
 
-    _element: _Element  # todo: find solution for mypy stuff
+    _element: _Element | None  # todo: find solution for mypy stuff
     shapely: Point | LineString | Polygon = field(init=False)
     azimuth: float | None = field(init=False, default=None)
     data_acquisition_method: str | None = field(init=False, default=None)
@@ -45,17 +46,66 @@ class ImxGeographicLocation:
             geographic location data, otherwise None.
         """
 
-        location_node = element.find(
-            ".//{http://www.prorail.nl/IMSpoor}GeographicLocation"
+        location_node = ImxGeographicLocation._find_location_node(element)
+        if location_node is None:
+            return None
+        return ImxGeographicLocation._from_location_node(
+            location_node, GmlShapleyFactory.shapley(location_node)
         )
-        if element.tag == "{http://www.prorail.nl/IMSpoor}ObservedLocation":
-            location_node = element
 
-        elif location_node is None:
-            return None
+    @staticmethod
+    def from_elements(
+        elements: list[_Element],
+    ) -> list[Optional["ImxGeographicLocation"]]:
+        """
+        Create ImxGeographicLocation instances for many XML elements at once.
+
+        ??? info
+            The GML coordinates of all elements are decoded first, after that all shapely geometries are created
+            in bulk by `GmlShapleyFactory.shapley_bulk`. An element with an unsupported or invalid geometry does
+            not fail the batch, a warning is logged and None is returned for it.
+
+        Args:
+            elements (list[Element]): The XML elements to parse.
 
+        Returns:
+            list[Optional[ImxGeographicLocation]]: The geographic locations in the same order as the elements,
+            None for elements without geographic location data or with an unsupported geometry.
+        """
+        location_nodes: list[_Element | None] = []
+        gml_coordinates = []
+        for element in elements:
+            location_node = ImxGeographicLocation._find_location_node(element)
+            if location_node is not None:
+                try:
+                    gml_coordinates.append(
+                        GmlShapleyFactory.gml_coordinates(location_node)
+                    )
+                except (NotImplementedError, ValueError) as e:
+                    logger.warning(f"geographic location not parsed: {e}")
+                    location_node = None
+            location_nodes.append(location_node)
+
+        geometries = iter(GmlShapleyFactory.shapley_bulk(gml_coordinates))
+        return [
+            ImxGeographicLocation._from_location_node(node, next(geometries))
+            if node is not None
+            else None
+            for node in location_nodes
+        ]
+
+    @staticmethod
+    def _find_location_node(element: _Element) -> _Element | None:
+        if element.tag == "{http://www.prorail.nl/IMSpoor}ObservedLocation":
+            return element
+        return element.find(".//{http://www.prorail.nl/IMSpoor}GeographicLocation")
+
+    @staticmethod
+    def _from_location_node(
+        location_node: _Element, geometry: Point | LineString | Polygon
+    ) -> "ImxGeographicLocation":
         instance = ImxGeographicLocation(location_node)
-        instance.shapely = GmlShapleyFactory.shapley(location_node)
+        instance.shapely = geometry
 
         instance.data_acquisition_method = location_node.attrib.get(
             "dataAcquisitionMethod", None
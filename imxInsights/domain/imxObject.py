@@ -1,8 +1,11 @@
+import sys
 import warnings
 from collections import defaultdict
 from collections.abc import Iterable
+from itertools import chain
 from typing import Optional
 
+from lxml import etree
 from lxml.etree import _Element as Element
 from shapely import (
     LineString,
@@ -14,11 +17,12 @@ from shapely import (
 )
 from shapely.geometry import GeometryCollection
 
+from imxInsights.domain.imxEnums import ImxAreaEnum
 from imxInsights.domain.imxGeographicLocation import ImxGeographicLocation
 from imxInsights.file.containerizedImx.imxDesignCoreFile import ImxDesignCoreFile
 from imxInsights.file.containerizedImx.imxDesignPetalFile import ImxDesignPetalFile
 from imxInsights.file.imxFile import ImxFile
-from imxInsights.utils.helpers import flatten_dict
+from imxInsights.utils.helpers import flatten_dict, hash_properties, is_ref_key
 from imxInsights.utils.xml_helpers import (
     find_parent_entity,
     find_parent_with_tag,
@@ -26,6 +30,45 @@ from imxInsights.utils.xml_helpers import (
     trim_tag,
 )
 
+_EMPTY_GEOMETRY = GeometryCollection()
+
+PropertiesSource = dict[str, str] | bytes
+"""The flattened properties of an object, or its serialized xml element if they are not flattened yet."""
+
+
+def properties_from_source(source: PropertiesSource) -> dict[str, str]:
+    """
+    Returns the flattened properties of a properties source, see `ImxObject.get_properties_source`.
+
+    Args:
+        source: The flattened properties or the serialized xml element.
+
+    Returns:
+        The flattened properties.
+    """
+    if isinstance(source, bytes):
+        return flatten_dict(lxml_element_to_dict(etree.fromstring(source)))
+    return source
+
+
+def flatten_extension_properties(
+    extensions: Iterable[tuple[str, dict[str, str]]],
+) -> dict[str, str]:
+    """
+    Flattens the properties of extension objects, keyed by `extension.` and the tag of the extension.
+
+    Args:
+        extensions: The tag and flattened properties of every extension object.
+
+    Returns:
+        The flattened extension properties.
+    """
+    extensions_dict = defaultdict(list)
+    for tag, properties in extensions:
+        extensions_dict[f"extension.{tag}"].append(properties)
+    # todo: make flatten_dict also handle defaultdict
+    return flatten_dict(dict(extensions_dict))
+
 
 class ImxObject:
     """
@@ -34,7 +77,8 @@ class ImxObject:
     ??? info
         This class is used to encapsulate the data and functionality for an object within an IMX file.
         It contains attributes parsed from the XML element representing the object, and methods to
-        manipulate and query the object.
+        manipulate and query the object. The class is slotted and tag, path, puic and name are computed
+        once on init, the parent of an object should not be changed after creation.
 
     Todo:
         = Find way to make immutable after building repo.
@@ -46,25 +90,71 @@ class ImxObject:
         parent: The parent ImxObject of the object. Defaults to None.
 
     Attributes:
-        element: Returns the XML element representing the object.
+        element: Returns the XML element representing the object, None if the object is detached.
         tag: Returns the tag of the XML element.
         path: Returns the path of the object within the XML structure.
         name: Returns the name attribute of the XML element.
         puic: Returns the puic attribute of the XML element.
+        properties: The flattened properties of the XML element, computed on first access.
+        extension_properties: The flattened properties of the extension objects, computed on first access.
+        refs: The references of the object and its extension objects, property key to referenced puics,
+            computed on first access.
+        content_hash: A hash of the tag, properties and extension properties, computed on first access.
         geometry: Object geometer
-        geographic_location: Returns the geographic location associated with the object.
+        geographic_location: Returns the geographic location associated with the object, parsed once and cached.
+        direct_children: The direct child objects, use `get_descendants` for all nested objects.
+        children: Deprecated, all nested objects like `get_descendants`. Use `direct_children` or
+            `get_descendants`.
+        area: The project area the object is located in, None if not classified or without geometry. Objects
+            are classified by `ImxRepo.classify_areas` or the first `ImxRepo.get_by_areas`.
+        container_id: The container id of the tree that created the object. An object of a NewSituation that
+            is shared with the InitialSituation keeps the container id of the InitialSituation, use
+            `ImxRepo.get_container_id` for the container it is retrieved from.
+        imx_situation: The situation tag of the element (pre imx 12.0). A shared object of a NewSituation
+            keeps InitialSituation, use `ImxSituation.situation_type` of the situation it is retrieved from.
     """
 
+    __slots__ = (
+        "_content_hash",
+        "_element",
+        "_extension_properties",
+        "_geographic_location",
+        "_geographic_location_parsed",
+        "_name",
+        "_path",
+        "_properties",
+        "_puic",
+        "_refs",
+        "_tag",
+        "area",
+        "container_id",
+        "direct_children",
+        "geometry",
+        "imx_extensions",
+        "imx_file",
+        "imx_situation",
+        "parent",
+    )
+
     def __init__(
         self,
         element: Element,
         imx_file: ImxFile,
         parent: Optional["ImxObject"] = None,
     ):
-        self._element: Element = element
+        self._element: Element | None = element
+        # tag and path are shared by many objects, interned they are stored once and compare by identity
+        self._tag: str = sys.intern(trim_tag(element.tag))
+        self._path: str = (
+            self._tag if parent is None else sys.intern(f"{parent.path}.{self._tag}")
+        )
+        self._puic: str = element.get("puic", "")
+        self._name: str = element.get("name", "")
+        self._geographic_location: ImxGeographicLocation | None = None
+        self._geographic_location_parsed: bool = False
         self.imx_file: ImxFile | ImxDesignCoreFile | ImxDesignPetalFile = imx_file
         self.parent: ImxObject | None = parent
-        self.children: list[ImxObject | None] = []
+        self.direct_children: list[ImxObject] = []
         self.imx_extensions: list[ImxObject] = []
         self.geometry: (
             LineString
@@ -74,50 +164,134 @@ class ImxObject:
             | MultiPoint
             | MultiPolygon
             | GeometryCollection
-        ) = GeometryCollection()
-        self.properties: dict[str, str] = flatten_dict(
-            lxml_element_to_dict(self._element)
+        ) = _EMPTY_GEOMETRY
+        self._properties: dict[str, str] | None = None
+        self._extension_properties: dict[str, str] | None = None
+        self._refs: dict[str, tuple[str, ...]] | None = None
+        self._content_hash: str | None = None
+        self.imx_situation: str | None = (
+            self._get_imx_situation() if parent is None else parent.imx_situation
         )
-        self.imx_situation: str | None = self._get_imx_situation()
         self.container_id: str | None = None
+        self.area: ImxAreaEnum | None = None
 
     def __repr__(self) -> str:
         return f"<ImxObject {self.path} puic={self.puic} name='{self.name}'/>"
 
     @property
-    def element(self) -> Element:
+    def element(self) -> Element | None:
         return self._element
 
     @property
     def tag(self) -> str:
-        return trim_tag(self._element.tag)
+        return self._tag
 
     @property
     def path(self) -> str:
-        tags = [parent.tag for parent in self._parents_generator()]
-        tags.reverse()
-        tags.append(self.tag)
-        return ".".join(tags)
+        return self._path
 
     @property
     def name(self) -> str:
-        return self._element.get("name", "")
+        return self._name
 
     @property
     def puic(self) -> str:
-        return self._element.get("puic", "")
+        return self._puic
+
+    @property
+    def properties(self) -> dict[str, str]:
+        if self._properties is None:
+            self._properties = flatten_dict(lxml_element_to_dict(self._element))
+        return self._properties
+
+    @properties.setter
+    def properties(self, value: dict[str, str]) -> None:
+        self._properties = value
+        self._refs = None
+        self._content_hash = None
+
+    @property
+    def refs(self) -> dict[str, tuple[str, ...]]:
+        if self._refs is None:
+            self._refs = {
+                key: tuple(value.split())
+                for key, value in chain(
+                    self.properties.items(), self.extension_properties.items()
+                )
+                if is_ref_key(key) and value
+            }
+        return self._refs
+
+    @property
+    def content_hash(self) -> str:
+        if self._content_hash is None:
+            self._content_hash = hash_properties(
+                self._tag, self.properties, self.extension_properties
+            )
+        return self._content_hash
 
     @property
     def geographic_location(self) -> ImxGeographicLocation | None:
-        return ImxGeographicLocation.from_element(self._element)
+        if not self._geographic_location_parsed:
+            self.set_geographic_location(
+                ImxGeographicLocation.from_element(self._element)
+                if self._element is not None
+                else None
+            )
+        return self._geographic_location
+
+    def set_geographic_location(
+        self, geographic_location: ImxGeographicLocation | None
+    ) -> None:
+        """
+        Sets the parsed geographic location, used by the geometry builder to fill the cache in bulk.
+
+        Marks for internal use.
+
+        Args:
+            geographic_location: The geographic location of the object, None if the object has none.
+        """
+        self._geographic_location = geographic_location
+        self._geographic_location_parsed = True
+
+    def detach(self) -> None:
+        """
+        Releases the XML element of the object so it can be garbage collected.
+
+        ??? info
+            The properties and geographic location are parsed before the element is released, all other data
+            is already captured on init. After detaching, `element` returns None.
+        """
+        if self._element is None:
+            return
+        _ = self.properties
+        geographic_location = self.geographic_location
+        if geographic_location is not None:
+            geographic_location._element = None
+        self._element = None
 
     @property
     def extension_properties(self) -> dict[str, str]:
-        extensions_dict = defaultdict(list)
-        for item in self.imx_extensions:
-            extensions_dict[f"extension.{item.tag}"].append(item.properties)
-        # todo: make flatten_dict also handle defaultdict
-        return flatten_dict(dict(extensions_dict))
+        if self._extension_properties is None:
+            self._extension_properties = flatten_extension_properties(
+                (item.tag, item.properties) for item in self.imx_extensions
+            )
+        return self._extension_properties
+
+    def get_properties_source(self) -> PropertiesSource:
+        """
+        Returns the flattened properties if they are known, else the serialized xml element.
+
+        ??? info
+            Used to flatten the properties in another process, see `properties_from_source`. The object is not
+            changed, its properties are still flattened on first access.
+
+        Returns:
+            The flattened properties or the serialized xml element.
+        """
+        if self._properties is None and self._element is not None:
+            return etree.tostring(self._element, with_tail=False)
+        return self.properties
 
     def extend_imx_object(self, imx_extension_object: "ImxObject") -> None:
         """
@@ -127,6 +301,9 @@ class ImxObject:
             imx_extension_object (ImxObject): The ImxObject to extend with.
         """
         self.imx_extensions.append(imx_extension_object)
+        self._extension_properties = None
+        self._refs = None
+        self._content_hash = None
 
     def _get_imx_situation(self) -> str | None:
         """Retrieves the situation tag (pre imx 12.0) from the element.
@@ -140,6 +317,8 @@ class ImxObject:
             f"{namespace}InitialSituation",
             f"{namespace}NewSituation",
         ]
+        if self._element is None:
+            return None
         parent_element = find_parent_with_tag(self._element, tags)
         if parent_element is not None:
             return parent_element.tag.removeprefix(namespace)
@@ -157,6 +336,41 @@ class ImxObject:
             yield parent
             parent = parent.parent
 
+    def get_descendants(self) -> list["ImxObject"]:
+        """
+        Retrieves all nested objects of the object, `direct_children` only holds the direct children.
+
+        Returns:
+            list[ImxObject]: The children, grandchildren etc. in document order.
+        """
+        descendants: list[ImxObject] = []
+        stack = list(reversed(self.direct_children))
+        while stack:
+            child = stack.pop()
+            descendants.append(child)
+            stack.extend(reversed(child.direct_children))
+        return descendants
+
+    @property
+    def children(self) -> list["ImxObject"]:
+        """
+        Returns all nested objects of the object.
+
+        ??? info
+            Deprecated, kept for compatibility with the former `children` that held all nested objects. Use
+            `get_descendants` for all nested objects or `direct_children` for the direct children.
+
+        Returns:
+            list[ImxObject]: The children, grandchildren etc. in document order.
+        """
+        warnings.warn(
+            "ImxObject.children is deprecated, use get_descendants() for all nested objects "
+            "or direct_children for the direct children",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self.get_descendants()
+
     def can_compare(self, other: Optional["ImxObject"]) -> bool:
         """
         Checks if the object can be compared with another object.
@@ -214,6 +428,22 @@ class ImxObject:
 
         return result
 
+    @classmethod
+    def lookup_tree_from_entities(
+        cls, entities: list[Element], imx_file: ImxFile
+    ) -> list["ImxObject"]:
+        """
+        Generates a lookup tree from a selection of the XML entities of an IMX file.
+
+        Args:
+            entities (List[Element]): The XML entities in document order, parents before their nested entities.
+            imx_file (ImxFile): The IMX file associated with the XML entities.
+
+        Returns:
+            List[ImxObject]: The lookup tree generated from the XML entities.
+        """
+        return cls._get_lookup_tree_from_element(entities, imx_file)
+
     @classmethod
     def lookup_tree_from_imx_file(cls, imx_file: ImxFile) -> list["ImxObject"]:
         """
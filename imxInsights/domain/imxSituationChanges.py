@@ -5,30 +5,50 @@ from lxml.etree import _Element as Element
 
 @dataclass
 class SituationChanges:
+    """
+    The puics that are created, updated or deleted in the NewSituation of a project.
+
+    Attributes:
+        created: The puics of the created objects.
+        updated: The puics of the updated objects.
+        deleted: The puics of the deleted objects.
+    """
+
     created: list[str]
     updated: list[str]
     deleted: list[str]
 
+    @property
+    def puics(self) -> frozenset[str]:
+        """
+        Returns the puics of all changes.
+
+        Returns:
+            The created, updated and deleted puics.
+        """
+        return frozenset([*self.created, *self.updated, *self.deleted])
+
     @staticmethod
-    def from_element(element: Element):
-        created_elem = element.find("Created")
-        updated_elem = element.find("Updated")
-        deleted_elem = element.find("Deleted")
-
-        created = (
-            created_elem.text.split()
-            if created_elem is not None and created_elem.text
-            else []
-        )
-        updated = (
-            updated_elem.text.split()
-            if updated_elem is not None and updated_elem.text
-            else []
-        )
-        deleted = (
-            deleted_elem.text.split()
-            if deleted_elem is not None and deleted_elem.text
-            else []
-        )
+    def from_element(element: Element) -> "SituationChanges":
+        """
+        Reads the changes from a SituationChanges element.
+
+        ??? info
+            The Created, Updated and Deleted elements are looked up in the namespace of the SituationChanges
+            element, so IMSpoor files and elements without a namespace are both supported.
+
+        Args:
+            element: The SituationChanges element.
 
-        return SituationChanges(created, updated, deleted)
+        Returns:
+            The situation changes, empty lists for missing elements.
+        """
+        namespace = element.tag[: element.tag.find("}") + 1]
+
+        def _get_puics(tag: str) -> list[str]:
+            child = element.find(f"{namespace}{tag}")
+            return child.text.split() if child is not None and child.text else []
+
+        return SituationChanges(
+            _get_puics("Created"), _get_puics("Updated"), _get_puics("Deleted")
+        )
@@ -141,3 +141,26 @@ class ImxRailConnectionMultiLinestring(ImxException):
         data: list[str] | None = None,
     ) -> None:
         super().__init__(msg, level, data)
+
+
+class ImxRefNotPresent(ImxException):
+    """
+    Exception for references to PUICs that are not present.
+
+    ??? info
+        This exception is added when a tree is build with `check_refs` and a reference, also of an
+        extension object, points to a PUIC that is not present in the tree. The additional data is expected to be a list of the missing PUICs.
+
+    Args:
+        msg: The exception message.
+        level: The error level of the exception.
+        data: Optional additional data associated with the exception, expected to be a list.
+    """
+
+    def __init__(
+        self,
+        msg: str = "reffed puic not present",
+        level: ErrorLevelEnum = ErrorLevelEnum.WARNING,
+        data: list[str] | None = None,
+    ) -> None:
+        super().__init__(msg, level, data)
@@ -1,3 +1,4 @@
+import zipfile
 from pathlib import Path
 
 from loguru import logger
@@ -15,22 +16,47 @@ class ImxContainer(ImxRepo):
 
     Args:
         imx_file_path: Path to the IMX container.
+        max_workers: Number of workers to load the container files concurrently, if None load one after another.
+        use_processes: If True sniff and hash the container files in a process pool before parsing, zip archives
+            are always read in place by threads.
+        parse_geometries: If True all geographic locations are parsed in bulk when the tree is build.
+        check_refs: If True the references to puics that are not present are added to the build exceptions.
 
     Attributes:
         files: The IMX files inside the container
 
     """
 
-    def __init__(self, imx_file_path: Path | str):
+    def __init__(
+        self,
+        imx_file_path: Path | str,
+        max_workers: int | None = None,
+        use_processes: bool = False,
+        parse_geometries: bool = False,
+        check_refs: bool = False,
+    ):
         logger.info(f"processing {Path(imx_file_path).name}")
-        super().__init__(imx_file_path)
+        super().__init__(
+            imx_file_path, parse_geometries=parse_geometries, check_refs=check_refs
+        )
 
-        if not self.path.is_dir():
+        self.files: ImxContainerFiles
+        if zipfile.is_zipfile(self.path):
+            self.files = ImxContainerFiles.from_zip(
+                zip_path=self.path,
+                container_id=self.container_id,
+                max_workers=max_workers,
+            )
+        elif self.path.is_dir():
+            self.files = ImxContainerFiles.from_container(
+                container_path=self.path,
+                container_id=self.container_id,
+                max_workers=max_workers,
+                use_processes=use_processes,
+            )
+        else:
             raise ValueError("container is not a valid directory, zip or path string")  # noqa: TRY003
 
-        self.files: ImxContainerFiles = ImxContainerFiles.from_container(
-            container_path=self.path, container_id=self.container_id
-        )
         self.imx_version = (
             self.files.signaling_design.imx_version
             if self.files.signaling_design
@@ -42,6 +68,7 @@ class ImxContainer(ImxRepo):
         logger.success(f"finished processing {Path(imx_file_path).name}")
 
     def _populate_project_metadata(self):
+        self.project_metadata: ImxContainerMetadata | None = None
         if self.files.signaling_design is not None:
             self.project_metadata = ImxContainerMetadata.from_element(
                 self.files.signaling_design.root
@@ -49,7 +76,12 @@ class ImxContainer(ImxRepo):
 
     def _populate_tree(self):
         if self.files.signaling_design is not None:
-            self._tree.add_imx_file(self.files.signaling_design, self.container_id)
+            if self.project_metadata is not None:
+                self.set_project_areas(self.project_metadata.areas)
+
+            self._tree.add_imx_file(
+                self.files.signaling_design, self.container_id, build=False
+            )
 
             for petal in [
                 "furniture",
@@ -64,4 +96,6 @@ class ImxContainer(ImxRepo):
             ]:
                 imx_file = getattr(self.files, petal)
                 if imx_file is not None:
-                    self._tree.add_imx_file(imx_file, self.container_id)
+                    self._tree.add_imx_file(imx_file, self.container_id, build=False)
+
+            self._tree.build()
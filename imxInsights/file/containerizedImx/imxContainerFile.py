@@ -4,6 +4,7 @@ from imxInsights.file.containerizedImx.imxContainerFileReference import (
     ImxContainerFileReference,
 )
 from imxInsights.file.imxFile import ImxFile
+from imxInsights.utils.xmlFile import XmlFile
 
 
 class ImxContainerFile(ImxFile):
@@ -13,10 +14,16 @@ class ImxContainerFile(ImxFile):
     Args:
         imx_file_path: The path to the IMX file.
         file_id: Optional file ID.
+        xml_file: Optional already loaded XmlFile.
     """
 
-    def __init__(self, imx_file_path: Path, file_id: str | None = None):
-        super().__init__(imx_file_path, file_id or "")
+    def __init__(
+        self,
+        imx_file_path: Path,
+        file_id: str | None = None,
+        xml_file: XmlFile | None = None,
+    ):
+        super().__init__(imx_file_path, file_id or "", xml_file)
 
     @property
     def previous_versions(self) -> list[ImxContainerFileReference]:
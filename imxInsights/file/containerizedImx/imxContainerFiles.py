@@ -1,9 +1,155 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Any
+from zipfile import ZipFile
 
 from imxInsights.file.containerizedImx.imxDesignCoreFile import ImxDesignCoreFile
 from imxInsights.file.containerizedImx.imxDesignPetalFile import ImxDesignPetalFile
 from imxInsights.file.imxFile import ImxFile
+from imxInsights.utils.helpers import hash_sha256
+from imxInsights.utils.xml_helpers import sniff_root_element
+from imxInsights.utils.xmlFile import XmlFile
+
+TAG_TO_ATTR = {
+    "{http://www.prorail.nl/IMSpoor}SignalingDesign": "signaling_design",
+    "{http://www.prorail.nl/IMSpoor}Manifest": "manifest",
+    "{http://www.prorail.nl/IMSpoor}Furniture": "furniture",
+    "{http://www.prorail.nl/IMSpoor}TrainControl": "train_control",
+    "{http://www.prorail.nl/IMSpoor}ManagementAreas": "management_areas",
+    "{http://www.prorail.nl/IMSpoor}InstallationDesign": "installation_design",
+    "{http://www.prorail.nl/IMSpoor}NetworkConfiguration": "network_configuration",
+    "{http://www.prorail.nl/IMSpoor}SchemaLayout": "schema_layout",
+    "{http://www.prorail.nl/IMSpoor}RailwayElectrification": "railway_electrification",
+    "{http://www.prorail.nl/IMSpoor}Bgt": "bgt",
+    "{http://www.prorail.nl/IMSpoor}Observations": "observations",
+}
+
+
+@dataclass(frozen=True)
+class ImxContainerFileInfo:
+    """
+    Picklable summary of a xml file in a container.
+
+    ??? info
+        lxml trees can not be pickled, when using a process pool the worker processes read the file, sniff the
+        root element and hash the content. The file info and the content are handed back to the main process
+        where the content is parsed, so the file is read once.
+
+    Attributes:
+        path: The path of the xml file.
+        tag: The tag of the xml root element.
+        imx_version: The imxVersion attribute of the root element, if present.
+        file_hash: The SHA-256 hash of the file, if calculated.
+    """
+
+    path: Path
+    tag: str
+    imx_version: str | None
+    file_hash: str | None = None
+
+    @classmethod
+    def from_path(cls, path: Path, hash_file: bool = False) -> "ImxContainerFileInfo":
+        """
+        Sniffs the root element of a xml file and optional calculates the hash of the file.
+
+        Args:
+            path: The path of the xml file.
+            hash_file: If True the SHA-256 hash of the file will be calculated.
+
+        Returns:
+            The file info of the xml file.
+        """
+        if not hash_file:
+            tag, attributes = sniff_root_element(path)
+            return cls(path, tag, attributes.get("imxVersion"))
+
+        return cls.from_content(path, path.read_bytes())
+
+    @classmethod
+    def from_content(cls, path: Path, content: bytes) -> "ImxContainerFileInfo":
+        """
+        Sniffs the root element and calculates the hash of the already read content of a xml file.
+
+        Args:
+            path: The path of the xml file.
+            content: The content of the xml file.
+
+        Returns:
+            The file info of the xml file.
+        """
+        tag, attributes = sniff_root_element(content)
+        return cls(path, tag, attributes.get("imxVersion"), hash_sha256(content))
+
+
+def _read_container_file(path: Path) -> tuple[ImxContainerFileInfo, bytes]:
+    """Reads, sniffs and hashes a xml file, the picklable result of a worker process."""
+    content = path.read_bytes()
+    return ImxContainerFileInfo.from_content(path, content), content
+
+
+def _load_container_file(
+    file_info: ImxContainerFileInfo, container_id: str, content: bytes | None = None
+) -> tuple[str, ImxFile] | None:
+    """
+    Loads a container xml file as the ImxFile type that matches the root element.
+
+    Args:
+        file_info: The file info of the xml file.
+        container_id: The container ID to associate with the file.
+        content: The already read content of the xml file, if None the file is read from the path.
+
+    Returns:
+        The ImxContainerFiles attribute name and the loaded ImxFile, None if the file is not an imx file.
+
+    Raises:
+        ValueError: If the imx version is missing or not supported.
+    """
+    if file_info.imx_version is None:
+        raise ValueError("imxVersion attribute not found")  # noqa: TRY003
+    if file_info.imx_version != "12.0.0":
+        raise ValueError(  # noqa: TRY003
+            f"Imx version {file_info.imx_version} not supported"
+        )
+
+    attr_name = TAG_TO_ATTR.get(file_info.tag)
+    if attr_name is None:
+        return None
+
+    xml_file = (
+        XmlFile(file_info.path, file_hash=file_info.file_hash)
+        if content is None
+        else XmlFile.from_bytes(file_info.path, content, file_info.file_hash)
+    )
+    imx_file: ImxFile
+    if attr_name == "signaling_design":
+        imx_file = ImxDesignCoreFile(file_info.path, container_id, xml_file)
+    elif attr_name != "manifest":
+        imx_file = ImxDesignPetalFile(file_info.path, container_id, xml_file)
+    else:
+        imx_file = ImxFile(file_info.path, container_id, xml_file)
+    return attr_name, imx_file
+
+
+def _load_zip_member(
+    zip_file: ZipFile, name: str, zip_path: Path, container_id: str
+) -> tuple[str, ImxFile] | None:
+    """
+    Loads a xml member of a zip archive without extracting it to disk.
+
+    Args:
+        zip_file: The opened zip archive.
+        name: The name of the member.
+        zip_path: The path of the zip archive, the member path is relative to this path.
+        container_id: The container ID to associate with the file.
+
+    Returns:
+        The ImxContainerFiles attribute name and the loaded ImxFile, None if the file is not an imx file.
+    """
+    content = zip_file.read(name)
+    file_info = ImxContainerFileInfo.from_content(zip_path / name, content)
+    return _load_container_file(file_info, container_id, content)
 
 
 class ImxContainerFiles:
@@ -46,43 +192,131 @@ class ImxContainerFiles:
 
     @classmethod
     def from_container(
-        cls, container_path: Path, container_id: str
+        cls,
+        container_path: Path,
+        container_id: str,
+        max_workers: int | None = None,
+        use_processes: bool = False,
     ) -> "ImxContainerFiles":
-        self = cls()
+        """
+        Loads the files of a container directory.
+
+        ??? info
+            The xml files are independent of each other, when `max_workers` is set they are parsed and hashed
+            concurrently in a thread pool, lxml releases the GIL while parsing. Largest files are submitted
+            first so the total load time is close to the time of the largest file. When `use_processes` is set
+            the files are read, sniffed and hashed in a process pool first, the content is handed back and
+            parsed in the thread pool, so every file is read once. lxml trees can not be pickled, parsing is
+            always done in this process.
 
-        tag_to_attr = {
-            "{http://www.prorail.nl/IMSpoor}SignalingDesign": "signaling_design",
-            "{http://www.prorail.nl/IMSpoor}Manifest": "manifest",
-            "{http://www.prorail.nl/IMSpoor}Furniture": "furniture",
-            "{http://www.prorail.nl/IMSpoor}TrainControl": "train_control",
-            "{http://www.prorail.nl/IMSpoor}ManagementAreas": "management_areas",
-            "{http://www.prorail.nl/IMSpoor}InstallationDesign": "installation_design",
-            "{http://www.prorail.nl/IMSpoor}NetworkConfiguration": "network_configuration",
-            "{http://www.prorail.nl/IMSpoor}SchemaLayout": "schema_layout",
-            "{http://www.prorail.nl/IMSpoor}RailwayElectrification": "railway_electrification",
-            "{http://www.prorail.nl/IMSpoor}Bgt": "bgt",
-            "{http://www.prorail.nl/IMSpoor}Observations": "observations",
-        }
+        Args:
+            container_path: The path of the container directory.
+            container_id: The container ID to associate with the files.
+            max_workers: The number of workers, if None the files are loaded one after another.
+            use_processes: If True read, sniff and hash the files in a process pool.
 
+        Returns:
+            The loaded container files.
+
+        Raises:
+            ValueError: If a file has a not supported imx version or if files are present multiple times.
+        """
+        self = cls()
+
+        xml_paths: list[Path] = []
         for file_path in container_path.glob("*"):
             if file_path.is_file() and file_path.suffix == ".xml":
-                imx_file = ImxFile(file_path, container_id)
-                if imx_file.imx_version != "12.0.0":
-                    raise ValueError(  # noqa: TRY003
-                        f"Imx version {imx_file.imx_version} not supported"
+                xml_paths.append(file_path)
+            else:
+                self.additional_files.append(file_path)
+
+        load = partial(_load_container_file, container_id=container_id)
+        if max_workers is None:
+            # sniff root so every file is only parsed and hashed once
+            loaded = [
+                load(ImxContainerFileInfo.from_path(file_path))
+                for file_path in xml_paths
+            ]
+        else:
+            xml_paths.sort(key=lambda file_path: file_path.stat().st_size, reverse=True)
+            if use_processes:
+                with ProcessPoolExecutor(max_workers) as process_pool:
+                    read_files = list(process_pool.map(_read_container_file, xml_paths))
+                with ThreadPoolExecutor(max_workers) as thread_pool:
+                    loaded = list(
+                        thread_pool.map(
+                            lambda read_file: load(read_file[0], content=read_file[1]),
+                            read_files,
+                        )
                     )
+            else:
+                file_infos = [
+                    ImxContainerFileInfo.from_path(file_path) for file_path in xml_paths
+                ]
+                with ThreadPoolExecutor(max_workers) as thread_pool:
+                    loaded = list(thread_pool.map(load, file_infos))
+
+        self._set_loaded_files(loaded)
+        return self
+
+    @classmethod
+    def from_zip(
+        cls, zip_path: Path, container_id: str, max_workers: int | None = None
+    ) -> "ImxContainerFiles":
+        """
+        Loads the files of a zipped container in place.
 
-                attr_name = tag_to_attr.get(imx_file.tag)
-                if attr_name == "signaling_design":
-                    imx_file = ImxDesignCoreFile(file_path, container_id)
-                elif attr_name and attr_name != "manifest":
-                    imx_file = ImxDesignPetalFile(file_path, container_id)
+        ??? info
+            Every xml member is read once from the archive, the same bytes are hashed and parsed by lxml, no
+            files are extracted to disk. When `max_workers` is set the members are loaded in a thread pool.
+            Additional files are referenced by their path relative to the zip archive.
 
-                if attr_name:
-                    if getattr(self, attr_name) is not None:
-                        raise ValueError(f"Multiple {attr_name} xml files")  # noqa: TRY003
-                    setattr(self, attr_name, imx_file)
+        Args:
+            zip_path: The path of the zip archive.
+            container_id: The container ID to associate with the files.
+            max_workers: The number of workers, if None the files are loaded one after another.
+
+        Returns:
+            The loaded container files.
+
+        Raises:
+            ValueError: If a file has a not supported imx version or if files are present multiple times.
+        """
+        self = cls()
+
+        with ZipFile(zip_path) as zip_file:
+            xml_members: list[str] = []
+            for zip_info in zip_file.infolist():
+                if zip_info.is_dir():
+                    continue
+                if Path(zip_info.filename).suffix == ".xml":
+                    xml_members.append(zip_info.filename)
+                else:
+                    self.additional_files.append(zip_path / zip_info.filename)
+
+            load = partial(
+                _load_zip_member,
+                zip_file,
+                zip_path=zip_path,
+                container_id=container_id,
+            )
+            if max_workers is None:
+                loaded = [load(name) for name in xml_members]
             else:
-                self.additional_files.append(file_path)
+                xml_members.sort(
+                    key=lambda name: zip_file.getinfo(name).file_size, reverse=True
+                )
+                with ThreadPoolExecutor(max_workers) as thread_pool:
+                    loaded = list(thread_pool.map(load, xml_members))
 
+        self._set_loaded_files(loaded)
         return self
+
+    def _set_loaded_files(self, loaded: list[tuple[str, ImxFile] | None]) -> None:
+        for item in loaded:
+            if item is None:
+                continue
+            attr_name, imx_file = item
+            if getattr(self, attr_name) is not None:
+                raise ValueError(f"Multiple {attr_name} xml files")  # noqa: TRY003
+            setattr(self, attr_name, imx_file)
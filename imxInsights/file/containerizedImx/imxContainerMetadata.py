@@ -5,7 +5,7 @@ from typing import Optional
 from lxml.etree import _Element as Element
 from lxml.etree import _ElementTree as ElementTree
 
-from imxInsights.domain.areas import Areas
+from imxInsights.domain.areas import ProjectAreas
 from imxInsights.domain.imxEnums import (
     Imx12DataExchangePhaseEnum,
     Imx12ProjectDisciplineEnum,
@@ -23,7 +23,7 @@ class ImxContainerMetadata:
     data_exchange_phase: Imx12DataExchangePhaseEnum | None = None
     created_date: datetime | None = None
     planned_delivery_date: datetime | None = None
-    areas: Areas | None = None
+    areas: ProjectAreas | None = None
 
     @staticmethod
     def from_element(
@@ -74,6 +74,8 @@ class ImxContainerMetadata:
                 else None
             )
 
+            self.areas = ProjectAreas.from_element(project_metadata_element)
+
             return self
 
         else:
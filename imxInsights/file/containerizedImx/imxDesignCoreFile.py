@@ -4,6 +4,7 @@ from pathlib import Path
 import dateparser
 
 from imxInsights.file.containerizedImx.imxContainerFile import ImxContainerFile
+from imxInsights.utils.xmlFile import XmlFile
 
 
 class ImxDesignCoreFile(ImxContainerFile):
@@ -13,10 +14,16 @@ class ImxDesignCoreFile(ImxContainerFile):
     Args:
         imx_file_path: The path to the IMX file.
         file_id: Optional file ID.
+        xml_file: Optional already loaded XmlFile.
     """
 
-    def __init__(self, imx_file_path: Path, file_id: str | None):
-        super().__init__(imx_file_path, file_id)
+    def __init__(
+        self,
+        imx_file_path: Path,
+        file_id: str | None,
+        xml_file: XmlFile | None = None,
+    ):
+        super().__init__(imx_file_path, file_id, xml_file)
 
     @property
     def reference_date(self) -> datetime.datetime | None:
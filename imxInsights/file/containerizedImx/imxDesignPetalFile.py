@@ -4,6 +4,7 @@ from imxInsights.file.containerizedImx.imxContainerFile import ImxContainerFile
 from imxInsights.file.containerizedImx.imxContainerFileReference import (
     ImxContainerFileReference,
 )
+from imxInsights.utils.xmlFile import XmlFile
 
 
 class ImxDesignPetalFile(ImxContainerFile):
@@ -13,11 +14,17 @@ class ImxDesignPetalFile(ImxContainerFile):
     Args:
         imx_file_path: The path to the IMX file.
         file_id: Optional file ID.
+        xml_file: Optional already loaded XmlFile.
 
     """
 
-    def __init__(self, imx_file_path: Path, file_id: str | None):
-        super().__init__(imx_file_path, file_id)
+    def __init__(
+        self,
+        imx_file_path: Path,
+        file_id: str | None,
+        xml_file: XmlFile | None = None,
+    ):
+        super().__init__(imx_file_path, file_id, xml_file)
 
     @property
     def base_reference(self) -> ImxContainerFileReference | None:
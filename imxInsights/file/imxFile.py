@@ -4,6 +4,7 @@ from pathlib import Path
 from lxml.etree import _Element as Element
 from lxml.etree import _ElementTree as ElementTree
 
+from imxInsights.utils.xml_helpers import sniff_root_element
 from imxInsights.utils.xmlFile import XmlFile
 
 
@@ -14,6 +15,7 @@ class ImxFile:
     Args:
         imx_file_path: The path to the IMX file.
         file_id: The UUID4 of the container.
+        xml_file: An optional already loaded XmlFile, if None the file will be loaded from the path.
 
     Attributes:
         imx_version: The IMX version.
@@ -24,15 +26,26 @@ class ImxFile:
         tag: The tag of the XML root element.
     """
 
-    def __init__(self, imx_file_path: Path, file_id: str = str(uuid.uuid4())):
+    def __init__(
+        self,
+        imx_file_path: Path,
+        file_id: str = str(uuid.uuid4()),
+        xml_file: XmlFile | None = None,
+    ):
         # todo: should handle strings aswel, make sure file exist else raise error.
         # todo: check if valid UUID if string is given else raise error.
-        self._xml_file: XmlFile = XmlFile(imx_file_path)
+        self._xml_file: XmlFile = (
+            xml_file if xml_file is not None else XmlFile(imx_file_path)
+        )
         self.container_id: str = file_id
 
-        # Check if the root is not None
+        # Without a parsed root (streaming) the version is sniffed from the root element
         if self._xml_file.root is None:
-            raise ValueError("Root of the XML file is None")  # noqa: TRY003
+            _, attributes = sniff_root_element(self._xml_file.path)
+            if "imxVersion" not in attributes:
+                raise ValueError("imxVersion attribute not found")  # noqa: TRY003
+            self.imx_version: str = attributes["imxVersion"]
+            return
 
         # Find the element with the imxVersion attribute
 
@@ -45,7 +58,7 @@ class ImxFile:
         ):
             raise ValueError("imxVersion attribute not found")  # noqa: TRY003
 
-        self.imx_version: str = imx_version_element.attrib["imxVersion"]
+        self.imx_version = imx_version_element.attrib["imxVersion"]
 
     @property
     def file_hash(self) -> str:
@@ -1,35 +1,121 @@
 from pathlib import Path
 
 from loguru import logger
+from lxml.etree import _Element as Element
 
+from imxInsights.compair.compairMultiRepo import ImxCompareMultiRepo
+from imxInsights.domain.areas import ProjectAreas
+from imxInsights.domain.imxSituationChanges import SituationChanges
 from imxInsights.file.imxFile import ImxFile
 from imxInsights.file.singleFileImx.imxSituation import ImxSituation
+from imxInsights.file.singleFileImx.imxSituationEnum import ImxSituationEnum
+from imxInsights.file.singleFileImx.imxSituationStream import iter_situations
+from imxInsights.utils.xmlFile import XmlFile
+
+SITUATION_ATTRIBUTES: dict[ImxSituationEnum, str] = {
+    ImxSituationEnum.Situation: "situation",
+    ImxSituationEnum.InitialSituation: "initial_situation",
+    ImxSituationEnum.NewSituation: "new_situation",
+}
 
 
 class ImxSingleFile:
     """
     Represents an IMX file that contains project situations or just a situation.
 
+    ??? info
+        Shared objects keep the container id and situation of the InitialSituation, the trees know which
+        container they belong to. Use `compair` to compare the situations, it skips the shared objects.
+        Shared situations can not be added to an ImxMultiRepo.
+
     Args:
         imx_file_path: Path to the IMX container.
+        streaming: If True the file is read with `iterparse` situation by situation and the xml is released
+            after processing, this keeps memory bounded for very large files. Objects will not hold an xml element.
+        parse_geometries: If True all geographic locations are parsed in bulk when the tree is build.
+        check_refs: If True the references to puics that are not present are added to the build exceptions.
+        share_unchanged: If True the NewSituation shares the objects that are not changed with the
+            InitialSituation, only the changed objects are build. The SituationChanges are not trusted to be
+            complete, objects that are not listed are compared with the InitialSituation before they are
+            shared, so a missing or empty SituationChanges is supported. Not supported with streaming.
 
     Attributes:
         file: The IMX file.
         situation: The IMX Situation.
         new_situation: The IMX NewSituation.
         initial_situation: The IMX InitialSituation.
+        project_areas: The areas of the project, used to classify the objects by area.
+        situation_changes: The SituationChanges of the project, None if not present or streaming.
 
+    Raises:
+        ValueError: If streaming and share_unchanged are both set.
     """
 
-    def __init__(self, imx_file_path: Path | str):
+    def __init__(
+        self,
+        imx_file_path: Path | str,
+        streaming: bool = False,
+        parse_geometries: bool = False,
+        share_unchanged: bool = False,
+        check_refs: bool = False,
+    ):
+        if streaming and share_unchanged:
+            raise ValueError("share_unchanged is not supported when streaming")  # noqa: TRY003
+
         imx_file_path = Path(imx_file_path)
         logger.info(f"processing {imx_file_path.name}")
 
-        self.file: ImxFile = ImxFile(imx_file_path=imx_file_path)
+        self.file: ImxFile = ImxFile(
+            imx_file_path=imx_file_path,
+            xml_file=XmlFile(imx_file_path, parse=False) if streaming else None,
+        )
         self.situation: ImxSituation | None = None
         self.new_situation: ImxSituation | None = None
         self.initial_situation: ImxSituation | None = None
+        self.project_areas: ProjectAreas | None = None
+        self.situation_changes: SituationChanges | None = None
+
+        if streaming:
+            situations: list[ImxSituation] = []
+            for streamed_situation in iter_situations(
+                self.file, on_project_metadata=self._set_project_areas
+            ):
+                imx_situation = ImxSituation(
+                    imx_file_path,
+                    streamed_situation,
+                    self.file,
+                    parse_geometries=parse_geometries,
+                    check_refs=check_refs,
+                )
+                setattr(
+                    self,
+                    SITUATION_ATTRIBUTES[streamed_situation.situation_type],
+                    imx_situation,
+                )
+                situations.append(imx_situation)
+
+            # the project metadata can be located after the situations, set the areas when the file is read
+            for imx_situation in situations:
+                imx_situation.set_project_areas(self.project_areas)
+            logger.success(f"finished processing {self.file.path.name}")
+            return
 
+        if self.file.root is not None:
+            project_metadata = self.file.root.find(
+                ".//{http://www.prorail.nl/IMSpoor}ProjectMetadata"
+            )
+            if project_metadata is not None:
+                self._set_project_areas(project_metadata)
+            situation_changes = self.file.root.find(
+                ".//{http://www.prorail.nl/IMSpoor}SituationChanges"
+            )
+            if situation_changes is not None:
+                self.situation_changes = SituationChanges.from_element(
+                    situation_changes
+                )
+
+        # unlisted changes are detected by the situation, so missing changes are not an error
+        base_changes = self.situation_changes or SituationChanges([], [], [])
         for situation_type, attribute_name in [
             ("Situation", "situation"),
             ("InitialSituation", "initial_situation"),
@@ -40,7 +126,41 @@ class ImxSingleFile:
                     f".//{{http://www.prorail.nl/IMSpoor}}{situation_type}"
                 )
                 if situation is not None:
-                    imx_situation = ImxSituation(imx_file_path, situation, self.file)
+                    share = share_unchanged and attribute_name == "new_situation"
+                    imx_situation = ImxSituation(
+                        imx_file_path,
+                        situation,
+                        self.file,
+                        parse_geometries=parse_geometries,
+                        check_refs=check_refs,
+                        project_areas=self.project_areas,
+                        base_situation=self.initial_situation if share else None,
+                        changes=base_changes if share else None,
+                    )
                     setattr(self, attribute_name, imx_situation)
 
         logger.success(f"finished processing {self.file.path.name}")
+
+    def _set_project_areas(self, project_metadata_element: Element) -> None:
+        self.project_areas = ProjectAreas.from_element(project_metadata_element)
+
+    def compair(self) -> ImxCompareMultiRepo:
+        """
+        Compares the InitialSituation with the NewSituation.
+
+        ??? info
+            Objects that are shared between the situations are not changed by definition, they are not
+            compared. Other objects with equal content hashes are not compared either.
+
+        Returns:
+            The comparison of the InitialSituation and the NewSituation.
+
+        Raises:
+            ValueError: If the file has no InitialSituation or NewSituation.
+        """
+        if self.initial_situation is None or self.new_situation is None:
+            raise ValueError("InitialSituation and NewSituation are required")  # noqa: TRY003
+        return ImxCompareMultiRepo.from_trees(
+            [self.initial_situation._tree, self.new_situation._tree],
+            (self.initial_situation.container_id, self.new_situation.container_id),
+        )
@@ -1,18 +1,108 @@
+from collections import defaultdict
 from pathlib import Path
 
 from loguru import logger
-from lxml.etree import QName
+from lxml import etree
 from lxml.etree import _Element as Element
 
+from imxInsights.domain.areas import ProjectAreas
+from imxInsights.domain.imxObject import (
+    ImxObject,
+    PropertiesSource,
+    properties_from_source,
+)
+from imxInsights.domain.imxSituationChanges import SituationChanges
 from imxInsights.file.imxFile import ImxFile
 from imxInsights.file.singleFileImx.imxSituationEnum import ImxSituationEnum
+from imxInsights.file.singleFileImx.imxSituationStream import ImxStreamedSituation
+from imxInsights.repo.config import Configuration, get_valid_version
 from imxInsights.repo.imxRepo import ImxRepo
+from imxInsights.repo.tree.imxObjectTree import ObjectTree
+from imxInsights.utils.xml_helpers import find_parent_entity
+
+
+def _get_root_puic(imx_object: ImxObject) -> str:
+    while imx_object.parent is not None:
+        imx_object = imx_object.parent
+    return imx_object.puic
+
+
+def _get_geometry_refs(rail_connection: ImxObject) -> list[str]:
+    # the geometry is merged from the referenced tracks and passages and oriented by the micro nodes, the
+    # refs include the node refs of the micro link
+    return [ref for refs in rail_connection.refs.values() for ref in refs]
+
+
+def _is_same_root(elements: list[Element], base_objects: list[ImxObject]) -> bool:
+    # a root with a duplicated puic is not shared, the elements are compared as serialized, so a root that is
+    # only formatted differently is created again
+    if len(elements) != 1 or len(base_objects) != 1:
+        return False
+    base_element = base_objects[0].element
+    return base_element is not None and etree.tostring(
+        elements[0], with_tail=False
+    ) == etree.tostring(base_element, with_tail=False)
+
+
+def _get_sorted_properties(
+    sources: list[PropertiesSource],
+) -> list[list[tuple[str, str]]]:
+    return sorted(sorted(properties_from_source(source).items()) for source in sources)
+
+
+def _is_same_extensions(
+    sources: list[PropertiesSource], other_sources: list[PropertiesSource]
+) -> bool:
+    if sources == other_sources:
+        return True
+    # the serialized elements also differ in whitespace, attribute order or order in the file
+    return len(sources) == len(other_sources) and _get_sorted_properties(
+        sources
+    ) == _get_sorted_properties(other_sources)
+
+
+def _get_changed_extension_refs(
+    element: Element, imx_file: ImxFile, base_tree: ObjectTree
+) -> set[str]:
+    """Returns the refs of the objects whose extension objects differ from the extension objects in the base tree."""
+    sources: defaultdict[str, list[PropertiesSource]] = defaultdict(list)
+    for object_type, ref_attr in Configuration.get_object_type_to_extend_config(
+        get_valid_version(imx_file.imx_version)
+    ).__dict__.items():
+        for extension in element.iterfind(
+            f".//{{http://www.prorail.nl/IMSpoor}}{object_type}"
+        ):
+            sources[extension.get(ref_attr[0].lstrip("@"), "")].append(
+                etree.tostring(extension, with_tail=False)
+            )
+
+    base_sources: defaultdict[str, list[PropertiesSource]] = defaultdict(list)
+    for puic, imx_objects in base_tree.tree_dict.items():
+        for extension in imx_objects[0].imx_extensions:
+            base_sources[puic].append(extension.get_properties_source())
+
+    return {
+        ref
+        for ref in sources.keys() | base_sources.keys()
+        if not _is_same_extensions(sources.get(ref, []), base_sources.get(ref, []))
+    }
 
 
 class ImxSituation(ImxRepo):
     """
     Represents a IMX Situation.
 
+    Args:
+        imx_file_path: The path to the IMX file.
+        situation_element: The situation xml element, or a situation read by the streaming loader.
+        imx_file: The IMX file of the situation.
+        parse_geometries: If True all geographic locations are parsed in bulk when the tree is build.
+        project_areas: Optional areas of the project, if given the objects can be queried by area.
+        base_situation: Optional situation this situation is changed from, the objects that are not in the
+            changes are shared with it. Only used with `changes` and a situation element.
+        changes: The changes relative to the base situation.
+        check_refs: If True the references to puics that are not present are added to the build exceptions.
+
     Attributes:
         situation_type: imx situation Type
 
@@ -21,17 +111,124 @@ class ImxSituation(ImxRepo):
     def __init__(
         self,
         imx_file_path: Path,
-        situation_element: Element,
+        situation_element: Element | ImxStreamedSituation,
         imx_file: ImxFile,
+        parse_geometries: bool = False,
+        project_areas: ProjectAreas | None = None,
+        base_situation: "ImxSituation | None" = None,
+        changes: SituationChanges | None = None,
+        check_refs: bool = False,
     ):
-        super().__init__(imx_file_path)
-        logger.info(f"processing {QName(situation_element.tag).localname}")
+        super().__init__(
+            imx_file_path, parse_geometries=parse_geometries, check_refs=check_refs
+        )
+        self.set_project_areas(project_areas)
         self.imx_version = imx_file.imx_version
-        self.situation_type: ImxSituationEnum = ImxSituationEnum[
-            situation_element.tag.split("}")[-1]
-        ]
-        self._populate_tree(situation_element, imx_file)
+        if isinstance(situation_element, ImxStreamedSituation):
+            self.situation_type: ImxSituationEnum = situation_element.situation_type
+        else:
+            self.situation_type = ImxSituationEnum[situation_element.tag.split("}")[-1]]
+        logger.info(f"processing {self.situation_type.value}")
+        if (
+            base_situation is not None
+            and changes is not None
+            and not isinstance(situation_element, ImxStreamedSituation)
+        ):
+            self._populate_delta_tree(
+                situation_element, imx_file, base_situation, changes
+            )
+        else:
+            self._populate_tree(situation_element, imx_file)
         self._tree.build_extensions.handle_all()
 
-    def _populate_tree(self, element: Element, imx_file: ImxFile):
-        self._tree.add_imx_element(element, imx_file, self.container_id)
+    def _populate_tree(
+        self, element: Element | ImxStreamedSituation, imx_file: ImxFile
+    ):
+        if isinstance(element, ImxStreamedSituation):
+            self._tree.add_imx_objects(
+                element.objects,
+                imx_file,
+                self.container_id,
+                element.extension_objects,
+            )
+        else:
+            self._tree.add_imx_element(element, imx_file, self.container_id)
+
+    def _populate_delta_tree(
+        self,
+        element: Element,
+        imx_file: ImxFile,
+        base_situation: "ImxSituation",
+        changes: SituationChanges,
+    ):
+        """
+        Populates the tree with new objects for the changed roots and the objects of the base for the others.
+
+        ??? info
+            Objects are shared or created per root object, the object with its nested objects, so parents and
+            children always belong to the same situation. A root is created if it, or one of its nested objects,
+            is in the changes or is not in the base situation. The changes are not trusted to be complete, the
+            serialized element of every other root is compared with the element of the base root, a root that
+            differs is created as well. Roots of the base that are not in this situation are not shared.
+            Extension objects, like micro links and micro nodes, have no puic and are not in the changes, a root
+            is also created if the extension objects of one of its objects differ from the base situation. Rail
+            connections that reference a created track, passage or node are created as well, their geometry is
+            build from the referenced objects.
+        """
+        base_tree = base_situation._tree
+        entities = element.findall(".//*[@puic]")
+        roots: dict[Element, str] = {}
+        root_elements: defaultdict[str, list[Element]] = defaultdict(list)
+        for entity in entities:
+            parent_entity = find_parent_entity(entity)
+            if parent_entity in roots:
+                roots[entity] = roots[parent_entity]
+            else:
+                roots[entity] = entity.get("puic", "")
+                root_elements[roots[entity]].append(entity)
+
+        changed_puics = changes.puics | _get_changed_extension_refs(
+            element, imx_file, base_tree
+        )
+        changed_roots = {
+            root
+            for entity, root in roots.items()
+            if entity.get("puic") in changed_puics
+        }
+        changed_roots.update(
+            _get_root_puic(imx_object)
+            for puic in changed_puics
+            for imx_object in base_tree.tree_dict.get(puic, [])
+        )
+        changed_roots.update(
+            root
+            for root, elements in root_elements.items()
+            if root not in changed_roots
+            and not _is_same_root(elements, base_tree.tree_dict.get(root, []))
+        )
+        changed_roots.update(
+            _get_root_puic(rail_connection)
+            for rail_connection in base_tree.get_by_types(["RailConnection"])
+            if not changed_roots.isdisjoint(_get_geometry_refs(rail_connection))
+        )
+
+        unchanged_roots = root_elements.keys() - changed_roots
+        self._tree.share_objects(
+            (
+                imx_object
+                for imx_objects in base_tree.tree_dict.values()
+                for imx_object in imx_objects
+                if _get_root_puic(imx_object) in unchanged_roots
+            ),
+            self.container_id,
+            base_tree.build_extensions,
+        )
+        self._tree.add_imx_objects(
+            ImxObject.lookup_tree_from_entities(
+                [entity for entity, root in roots.items() if root in changed_roots],
+                imx_file,
+            ),
+            imx_file,
+            self.container_id,
+            element=element,
+        )
@@ -0,0 +1,122 @@
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+
+from lxml import etree
+from lxml.etree import _Element as Element
+
+from imxInsights.domain.imxObject import ImxObject
+from imxInsights.file.imxFile import ImxFile
+from imxInsights.file.singleFileImx.imxSituationEnum import ImxSituationEnum
+from imxInsights.repo.config import Configuration, get_valid_version
+from imxInsights.utils.xml_helpers import trim_tag
+
+IMSPOOR_NAMESPACE = "{http://www.prorail.nl/IMSpoor}"
+
+
+@dataclass
+class ImxStreamedSituation:
+    """
+    Represents a situation read by the streaming loader.
+
+    Attributes:
+        situation_type: The imx situation type.
+        objects: The detached ImxObjects of the situation in document order, parents are set.
+        extension_objects: The detached extension objects of the situation in document order.
+    """
+
+    situation_type: ImxSituationEnum
+    objects: list[ImxObject] = field(default_factory=list)
+    extension_objects: list[ImxObject] = field(default_factory=list)
+
+
+def _release(element: Element) -> None:
+    """Clears a processed element and removes its already processed siblings from the document."""
+    element.clear(keep_tail=False)
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def _objects_from_entity(element: Element, imx_file: ImxFile) -> list[ImxObject]:
+    """
+    Creates the detached ImxObjects of a top level entity and all its descendant entities.
+
+    ??? info
+        The subtree is complete when its end event is read, so the objects are build the same way as the
+        non streaming loader does, after that the objects are detached from the xml.
+    """
+    entities = [element, *element.iterfind(".//*[@puic]")]
+    objects = ImxObject._get_lookup_tree_from_element(entities, imx_file)
+    for imx_object in objects:
+        imx_object.detach()
+    return objects
+
+
+def iter_situations(
+    imx_file: ImxFile,
+    on_project_metadata: Callable[[Element], None] | None = None,
+) -> Iterator[ImxStreamedSituation]:
+    """
+    Streams the situations of a single file IMX without keeping the document in memory.
+
+    ??? info
+        The file is read by `lxml.iterparse`. When the end of a top level entity within a situation is read,
+        the ImxObjects of the entity are created and detached, after that the xml is cleared. Extension
+        elements are captured the same way, so memory use depends on the amount of objects and not on the
+        size of the xml file.
+
+    Args:
+        imx_file: The IMX file to stream, the root does not have to be parsed.
+        on_project_metadata: Optional callable that is called with the complete ProjectMetadata element.
+
+    Yields:
+        The situations in document order.
+    """
+    extension_tags = {
+        f"{IMSPOOR_NAMESPACE}{object_type}"
+        for object_type in Configuration.get_object_type_to_extend_config(
+            get_valid_version(imx_file.imx_version)
+        ).__dict__
+    }
+    situation_tags = {f"{IMSPOOR_NAMESPACE}{item.value}" for item in ImxSituationEnum}
+
+    situation: ImxStreamedSituation | None = None
+    entity_depth = 0
+    for event, element in etree.iterparse(
+        str(imx_file.path), events=("start", "end"), remove_comments=True
+    ):
+        if event == "start":
+            if element.tag in situation_tags:
+                situation = ImxStreamedSituation(ImxSituationEnum[trim_tag(element)])
+            elif situation is not None and "puic" in element.attrib:
+                entity_depth += 1
+            continue
+
+        if situation is None:
+            if (
+                on_project_metadata is not None
+                and element.tag == f"{IMSPOOR_NAMESPACE}ProjectMetadata"
+            ):
+                on_project_metadata(element)
+            continue
+
+        if element.tag in situation_tags:
+            yield situation
+            situation = None
+            _release(element)
+            continue
+
+        is_extension = element.tag in extension_tags
+        if is_extension:
+            extension_object = ImxObject(element=element, imx_file=imx_file)
+            extension_object.detach()
+            situation.extension_objects.append(extension_object)
+
+        if "puic" in element.attrib:
+            entity_depth -= 1
+            if entity_depth == 0:
+                situation.objects.extend(_objects_from_entity(element, imx_file))
+                _release(element)
+        elif is_extension and entity_depth == 0:
+            _release(element)
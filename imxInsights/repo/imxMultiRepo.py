@@ -1,7 +1,13 @@
-from copy import deepcopy
+from collections.abc import Iterable, Iterator
+
+from shapely import Geometry
 
 from imxInsights.compair.compairMultiRepo import ImxCompareMultiRepo
+from imxInsights.compair.compairObject import ImxComparedObject
+from imxInsights.compair.compairStatusEnum import CompairStatus
+from imxInsights.domain.imxObject import ImxObject
 from imxInsights.repo.imxRepo import ImxRepo
+from imxInsights.repo.tree.fingerprints import Fingerprint, diff_fingerprints
 from imxInsights.repo.tree.imxMultiObjectTree import MultiObjectTree
 
 
@@ -9,8 +15,17 @@ class ImxMultiRepo:
     """
     Represents a collection of ImxContainers.
 
+    ??? info
+        The containers are not copied, the tree holds references to the objects of the containers. The objects
+        are tagged with their container id by the container itself, so the multi repo does not change them and
+        comparing containers takes no more memory than loading them.
+
+        The comparison is kept, adding a container only compares the added container with the last container,
+        removing a container discards it. Objects that are changed after the comparison are not detected.
+
     Attributes:
         containers: A list of ImxContainers.
+        container_order: The container ids in the order of the containers.
         tree: An ObjectTree representing the merged structure of all containers.
 
     Args:
@@ -30,44 +45,13 @@ class ImxMultiRepo:
                     "Containers should have same imx version, use version_safe to explicit ignore versions"
                 )
 
-        # this will copy the element not the references
-        containers = deepcopy(containers)
-        self.containers: list[ImxRepo] = [item for item in containers]
+        self.containers: list[ImxRepo] = list(containers)
         self.container_order: tuple[str, ...] = tuple(
             [item.container_id for item in self.containers]
         )
         self.tree: MultiObjectTree = MultiObjectTree()
         self._merge_containers(self.containers)
-
-    @staticmethod
-    def _merge_tree(source_tree, destination_tree):
-        """
-        Merge two tree structures.
-
-        Args:
-            source_tree: The source tree to merge.
-            destination_tree: The destination tree to merge into.
-        """
-        for key, value in source_tree.items():
-            if key in destination_tree:
-                destination_tree[key].extend(value)
-            else:
-                destination_tree[key] = list(value)
-
-    @staticmethod
-    def _remove_tree(source_tree, destination_tree):
-        """
-        Remove items from a tree structure.
-
-        Args:
-            source_tree: The source tree containing items to remove.
-            destination_tree: The destination tree to remove items from.
-        """
-        for key, value in source_tree.items():
-            if key in destination_tree:
-                destination_tree[key] = [
-                    item for item in destination_tree[key] if item not in value
-                ]
+        self._compair: ImxCompareMultiRepo | None = None
 
     def _merge_containers(self, containers: list[ImxRepo]):
         """
@@ -77,12 +61,7 @@ class ImxMultiRepo:
             containers (list[ImxRepo]): The list of containers to merge.
         """
         for container in containers:
-            self._merge_tree(container._tree.tree_dict, self.tree.tree_dict)
-            self._merge_tree(
-                container._tree.build_extensions.exceptions,
-                self.tree.build_extensions.exceptions,
-            )
-        self.tree.update_keys()
+            self.tree.add_tree(container._tree)
 
     def add_container(self, container: ImxRepo):
         """
@@ -91,13 +70,11 @@ class ImxMultiRepo:
         Args:
             container (ImxRepo): The container to add.
         """
-        container = deepcopy(container)
         self.containers.append(container)
-        self._merge_tree(container._tree.tree_dict, self.tree.tree_dict)
-        self._merge_tree(
-            container._tree.build_extensions.exceptions,
-            self.tree.build_extensions.exceptions,
-        )
+        self.container_order = (*self.container_order, container.container_id)
+        self.tree.add_tree(container._tree)
+        if self._compair is not None:
+            self._compair = self._compair.extend(self.tree, self.container_order)
 
     def remove_container(self, container: ImxRepo):
         """
@@ -106,17 +83,151 @@ class ImxMultiRepo:
         Args:
             container (ImxRepo): The container to remove.
         """
-        self.containers.remove(container)
-        self._remove_tree(container._tree.tree_dict, self.tree.tree_dict)
-        self._remove_tree(
-            container._tree.build_extensions.exceptions,
-            self.tree.build_extensions.exceptions,
+        index = self.containers.index(container)
+        del self.containers[index]
+        self.container_order = (
+            *self.container_order[:index],
+            *self.container_order[index + 1 :],
+        )
+        self.tree.remove_tree(container._tree)
+        self._compair = None
+
+    def query_bbox(
+        self, min_x: float, min_y: float, max_x: float, max_y: float
+    ) -> list[ImxObject]:
+        """
+        Queries the objects that intersect a bounding box.
+
+        ??? info
+            The queries use a shapely STRtree that is build on first use and rebuild after the tree changed.
+
+        Args:
+            min_x (float): The minimum x of the box.
+            min_y (float): The minimum y of the box.
+            max_x (float): The maximum x of the box.
+            max_y (float): The maximum y of the box.
+
+        Returns:
+            list[ImxObject]: The matching objects.
+        """
+        return self.tree.get_spatial_index().query_bbox(min_x, min_y, max_x, max_y)
+
+    def query_intersects(self, geometry: Geometry) -> list[ImxObject]:
+        """
+        Queries the objects that intersect a geometry.
+
+        Args:
+            geometry (Geometry): The geometry to query with.
+
+        Returns:
+            list[ImxObject]: The matching objects.
+        """
+        return self.tree.get_spatial_index().query_intersects(geometry)
+
+    def query_within_distance(
+        self, geometry: Geometry, distance: float
+    ) -> list[ImxObject]:
+        """
+        Queries the objects within a distance of a geometry.
+
+        Args:
+            geometry (Geometry): The geometry to query with.
+            distance (float): The maximum distance.
+
+        Returns:
+            list[ImxObject]: The matching objects.
+        """
+        return self.tree.get_spatial_index().query_within_distance(geometry, distance)
+
+    def query_nearest(self, geometry: Geometry, k: int = 1) -> list[ImxObject]:
+        """
+        Queries the k nearest objects of a geometry.
+
+        Args:
+            geometry (Geometry): The geometry to query with.
+            k (int): The number of objects to return.
+
+        Returns:
+            list[ImxObject]: The nearest objects ordered by distance.
+        """
+        return self.tree.get_spatial_index().query_nearest(geometry, k)
+
+    def get_fingerprints(self) -> dict[str, Fingerprint]:
+        """
+        Returns the Merkle fingerprint of every container.
+
+        Returns:
+            dict[str, Fingerprint]: The root fingerprint by container id.
+        """
+        return self.tree.get_fingerprints()
+
+    def diff_containers(
+        self, container_id: str, other_container_id: str
+    ) -> list[tuple[str, ...]]:
+        """
+        Finds where the content of two containers differs without comparing all objects.
+
+        Args:
+            container_id (str): The id of the container to compare.
+            other_container_id (str): The id of the container to compare with.
+
+        Returns:
+            list[tuple[str, ...]]: The paths of the differing nodes, for example (file, type, bucket, puic).
+        """
+        fingerprints = self.get_fingerprints()
+        return diff_fingerprints(
+            fingerprints.get(container_id), fingerprints.get(other_container_id)
         )
 
-    def compair(self) -> ImxCompareMultiRepo:
+    def compair(
+        self, columnar: bool = False, max_workers: int | None = None
+    ) -> ImxCompareMultiRepo:
         """Returns the compair of the repository
 
+        ??? info
+            The comparison is kept and extended when a container is added. The columnar comparison is not
+            kept, with max_workers the kept comparison is replaced.
+
+        Args:
+            columnar: If True the statuses are determined per object type by vectorized comparisons.
+            max_workers: If set the objects are compared in a process pool of this size, split by puic.
+                Can not be combined with columnar.
+
+        returns:
+            A ImxCompareMultiRepo object. Without columnar or max_workers the kept comparison is returned,
+            the same object on every call, so changes to it are shared by all callers.
+        """
+        if columnar:
+            return ImxCompareMultiRepo.from_multi_repo(
+                self.tree, self.container_order, columnar=True, max_workers=max_workers
+            )
+        if self._compair is None or max_workers is not None:
+            self._compair = ImxCompareMultiRepo.from_multi_repo(
+                self.tree, self.container_order, max_workers=max_workers
+            )
+        return self._compair
+
+    def iter_compair(
+        self,
+        global_status: CompairStatus | None = None,
+        object_types: Iterable[str] | None = None,
+    ) -> Iterator[ImxComparedObject]:
+        """Yields the compared objects of the repository as they are compared
+
+        ??? info
+            Use with the writers in `imxInsights.compair.compairWriters` to stream the changes of large
+            repositories to a file or pipe, without holding the full comparison in memory.
+
+        Args:
+            global_status: If set only compared objects with this global status are yielded.
+            object_types: If set only compared objects of these types are yielded.
+
         returns:
-            A ImxCompareMultiRepo object
+            An iterator of ImxComparedObjects
         """
-        return ImxCompareMultiRepo.from_multi_repo(self.tree, self.container_order)
+        return ImxCompareMultiRepo.iter_multi_repo(
+            self.tree,
+            self.container_order,
+            global_status=global_status,
+            object_types=object_types,
+        )
@@ -1,15 +1,18 @@
-import tempfile
 import uuid
-import zipfile
 from collections import defaultdict
 from collections.abc import Iterable
 from pathlib import Path
 
 import pandas as pd
+from shapely import Geometry
 
+from imxInsights.domain.areas import ProjectAreas
+from imxInsights.domain.imxEnums import ImxAreaEnum
 from imxInsights.domain.imxObject import ImxObject
 from imxInsights.exceptions import ImxException
+from imxInsights.repo.tree.fingerprints import Fingerprint, diff_fingerprints
 from imxInsights.repo.tree.imxObjectTree import ObjectTree
+from imxInsights.repo.tree.topologyGraph import TopologyGraph
 
 
 class ImxRepo:
@@ -18,6 +21,8 @@ class ImxRepo:
 
     Args:
         imx_file_path: The path to the IMX container or IMX File.
+        parse_geometries: If True all geographic locations are parsed in bulk when the tree is build.
+        check_refs: If True the references to puics that are not present are added to the build exceptions.
 
     Attributes:
         container_id: UUID4 of the container
@@ -26,35 +31,19 @@ class ImxRepo:
 
     # todo: maybe we should inheritance from the tree so we dont need to duplicated the methods
 
-    def __init__(self, imx_file_path: Path | str):
+    def __init__(
+        self,
+        imx_file_path: Path | str,
+        parse_geometries: bool = False,
+        check_refs: bool = False,
+    ):
         # todo: imx_file_path should be only Path
         self.container_id: str = str(uuid.uuid4())
-        self._tree: ObjectTree = ObjectTree()
-        self.imx_version: str | None = None
-        if zipfile.is_zipfile(imx_file_path):
-            imx_file_path = self._parse_zip_container(imx_file_path)
-        elif isinstance(imx_file_path, str):
-            imx_file_path = Path(imx_file_path)
-        self.path: Path = (
-            imx_file_path if isinstance(imx_file_path, Path) else Path(imx_file_path)
+        self._tree: ObjectTree = ObjectTree(
+            parse_geometries=parse_geometries, check_refs=check_refs
         )
-
-    @staticmethod
-    def _parse_zip_container(imx_container_as_zip: str | Path):
-        """
-        Parse the IMX container if it's a zip file.
-
-        Args:
-            imx_container_as_zip (Union[str, Path]): The path to the IMX container as a zip file.
-
-        Returns:
-            Path: The extracted directory path of the zip container.
-        """
-        with tempfile.TemporaryDirectory(delete=False) as temp_dir:
-            temp_path = Path(temp_dir)
-            with zipfile.ZipFile(imx_container_as_zip, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-            return temp_path
+        self.imx_version: str | None = None
+        self.path: Path = Path(imx_file_path)
 
     def get_all(self) -> Iterable[ImxObject]:
         """
@@ -121,6 +110,143 @@ class ImxRepo:
         """
         return self._tree.get_by_path(object_paths)
 
+    def get_by_areas(self, areas: list[ImxAreaEnum]) -> list[ImxObject]:
+        """
+        Retrieves objects located in the specified project areas.
+
+        ??? info
+            Objects are classified on the first call after the tree changed, see `classify_areas`. The innermost
+            project area that intersects the object geometry is used. Objects without geometry are never
+            returned.
+
+        Args:
+            areas (list[ImxAreaEnum]): The areas to retrieve the objects of.
+
+        Returns:
+            list[ImxObject]: The list of matching ImxObjects.
+        """
+        return self._tree.get_by_areas(areas)
+
+    def set_project_areas(self, project_areas: ProjectAreas | None) -> None:
+        """
+        Sets the project areas, the objects are classified when they are queried by area.
+
+        Args:
+            project_areas (ProjectAreas | None): The areas of the project.
+        """
+        self._tree.set_project_areas(project_areas)
+
+    def classify_areas(self) -> None:
+        """
+        Sets the area of all objects, if not done since the tree or the project areas changed.
+
+        ??? info
+            The geographic locations of all objects are parsed in bulk to classify them, so this is not done
+            on load. `get_by_areas` classifies the objects itself, call this before reading `ImxObject.area`.
+        """
+        self._tree.classify_areas()
+
+    def get_container_id(self, imx_object: ImxObject) -> str | None:
+        """
+        Retrieves the container id of an object in this repo.
+
+        ??? info
+            Objects of a NewSituation that are shared with the InitialSituation keep the container id of the
+            InitialSituation in `ImxObject.container_id`, this returns the container id of this repo.
+
+        Args:
+            imx_object (ImxObject): The object in this repo.
+
+        Returns:
+            str | None: The container id.
+        """
+        return self._tree.get_container_id(imx_object)
+
+    def get_refs(self, key: str | ImxObject) -> dict[str, tuple[str, ...]]:
+        """
+        Retrieves the references of an object.
+
+        Args:
+            key (str | ImxObject): The key or ImxObject to get the references of.
+
+        Returns:
+            dict[str, tuple[str, ...]]: The property key and referenced puics of every reference.
+        """
+        if isinstance(key, ImxObject):
+            key = key.puic
+        return self._tree.get_ref_index().get_refs(key)
+
+    def get_referenced_by(self, key: str | ImxObject) -> list[tuple[str, str]]:
+        """
+        Retrieves the objects that reference an object.
+
+        ??? info
+            The reference index is build on first use and rebuild after the tree changed.
+
+        Args:
+            key (str | ImxObject): The key or ImxObject that is referenced.
+
+        Returns:
+            list[tuple[str, str]]: The puic and property key of every referencing object.
+        """
+        if isinstance(key, ImxObject):
+            key = key.puic
+        return self._tree.get_ref_index().get_referenced_by(key)
+
+    def get_dangling_refs(self) -> list[tuple[str, str, str]]:
+        """
+        Retrieves the references to puics that are not present.
+
+        Returns:
+            list[tuple[str, str, str]]: The source puic, property key and referenced puic of every reference.
+        """
+        return list(self._tree.get_ref_index().dangling)
+
+    def get_topology(self) -> TopologyGraph:
+        """
+        Returns the topology graph of the MicroNode and MicroLink extensions.
+
+        ??? info
+            The graph is build on first use and rebuild after the tree changed. It supports breadth first
+            traversal, shortest routes by RailConnection length, reachability and connected components.
+
+        Returns:
+            TopologyGraph: The topology graph.
+        """
+        return self._tree.get_topology_graph()
+
+    def get_fingerprint(self) -> Fingerprint:
+        """
+        Returns the Merkle fingerprint of the container.
+
+        ??? info
+            The fingerprint is a hierarchy of file, object type, puic hash bucket and object subtree hashes
+            build from the content hash of every object. Equal digests mean equal content, use
+            `diff_fingerprint` to find where two containers differ.
+
+        Returns:
+            Fingerprint: The root fingerprint.
+        """
+        return self._tree.get_fingerprints().get(
+            self.container_id, Fingerprint(self.container_id, "")
+        )
+
+    def diff_fingerprint(self, other: "ImxRepo") -> list[tuple[str, ...]]:
+        """
+        Finds where the content of this container differs from another container.
+
+        ??? info
+            Only the branches of the fingerprints that differ are descended, so the cost depends on the
+            number of changed objects and not on the size of the containers.
+
+        Args:
+            other (ImxRepo): The container to compare with.
+
+        Returns:
+            list[tuple[str, ...]]: The paths of the differing nodes, for example (file, type, bucket, puic).
+        """
+        return diff_fingerprints(self.get_fingerprint(), other.get_fingerprint())
+
     def get_keys(self) -> list[str]:
         """
         Returns the set of keys currently in the tree dictionary.
@@ -136,6 +262,66 @@ class ImxRepo:
         """
         return self._tree.build_extensions.exceptions
 
+    def query_bbox(
+        self, min_x: float, min_y: float, max_x: float, max_y: float
+    ) -> list[ImxObject]:
+        """
+        Queries the objects that intersect a bounding box.
+
+        ??? info
+            The queries use a shapely STRtree that is build on first use and rebuild after the tree changed.
+
+        Args:
+            min_x (float): The minimum x of the box.
+            min_y (float): The minimum y of the box.
+            max_x (float): The maximum x of the box.
+            max_y (float): The maximum y of the box.
+
+        Returns:
+            list[ImxObject]: The matching objects.
+        """
+        return self._tree.get_spatial_index().query_bbox(min_x, min_y, max_x, max_y)
+
+    def query_intersects(self, geometry: Geometry) -> list[ImxObject]:
+        """
+        Queries the objects that intersect a geometry.
+
+        Args:
+            geometry (Geometry): The geometry to query with.
+
+        Returns:
+            list[ImxObject]: The matching objects.
+        """
+        return self._tree.get_spatial_index().query_intersects(geometry)
+
+    def query_within_distance(
+        self, geometry: Geometry, distance: float
+    ) -> list[ImxObject]:
+        """
+        Queries the objects within a distance of a geometry.
+
+        Args:
+            geometry (Geometry): The geometry to query with.
+            distance (float): The maximum distance.
+
+        Returns:
+            list[ImxObject]: The matching objects.
+        """
+        return self._tree.get_spatial_index().query_within_distance(geometry, distance)
+
+    def query_nearest(self, geometry: Geometry, k: int = 1) -> list[ImxObject]:
+        """
+        Queries the k nearest objects of a geometry.
+
+        Args:
+            geometry (Geometry): The geometry to query with.
+            k (int): The number of objects to return.
+
+        Returns:
+            list[ImxObject]: The nearest objects ordered by distance.
+        """
+        return self._tree.get_spatial_index().query_nearest(geometry, k)
+
     def get_pandas_df(
         self, object_type_or_path: str | None = None, puic_as_index: bool = True
     ) -> pd.DataFrame:
@@ -1,33 +1,26 @@
-from collections import defaultdict
-from collections.abc import Callable
+from collections.abc import Iterable
 
 from imxInsights.domain.imxObject import ImxObject
 
 
-def add_children(
-    tree_dict: defaultdict[str, list[ImxObject]],
-    find: Callable[[str], ImxObject | None],
-) -> None:
+def add_children(objects: Iterable[ImxObject]) -> None:
     """
-    Adds child objects to each IMX object in a tree dictionary.
+    Adds the direct child objects to each IMX object in an iterable of IMX objects.
 
     ??? info
-        This function iterates over each IMX object in the provided tree dictionary, finds
-        its child elements by their unique identifiers (PUIC), and assigns these child objects
-        to the `children` attribute of the parent IMX object.
+        The parent of every object is already set when the objects are created from the xml, so the children
+        are build in a single linear pass over that parent mapping. Children always live in the same xml element
+        as the parent, so only newly added objects have to be processed. The objects are expected in document
+        order, the children will be in document order as well. Use `ImxObject.get_descendants` to query all
+        nested objects.
 
     Args:
-        tree_dict: A dictionary containing lists of IMX objects indexed by their unique identifiers.
-        find: A callable to find an IMX object by its unique identifier (PUIC).
+        objects: The IMX objects to set the children on.
     """
+    objects = list(objects)
+    for imx_object in objects:
+        imx_object.direct_children = []
 
-    for key, values in tree_dict.items():
-        for value in values:
-            if value.element is not None:
-                elements_with_puic = value.element.xpath(".//*[@puic]")
-                children = [
-                    find(element.get("puic"))
-                    for element in elements_with_puic
-                    if value.puic != element.get("puic")
-                ]
-                value.children = children
+    for imx_object in objects:
+        if imx_object.parent is not None:
+            imx_object.parent.direct_children.append(imx_object)
@@ -1,12 +1,57 @@
 from collections.abc import Callable
 
-from shapely.geometry import LineString, MultiLineString, Point
-from shapely.ops import linemerge
+import numpy as np
+import shapely
+from shapely import GeometryType
 
+from imxInsights.domain.imxGeographicLocation import ImxGeographicLocation
 from imxInsights.domain.imxObject import ImxObject
 from imxInsights.exceptions.imxExceptions import ImxRailConnectionRefNotPresent
+from imxInsights.repo.tree.builders.parseGeometries import parse_geometries
 from imxInsights.repo.tree.buildExceptions import BuildExceptions
-from imxInsights.utils.shapley_helpers import reverse_line
+
+RAIL_CONNECTION_INPUT_TYPES = frozenset(["RailConnection", "Track", "Passage"])
+"""Object types the rail connection geometry is build from, if none of them changed there is no need to rebuild."""
+
+_LINE_TYPES = (GeometryType.LINESTRING, GeometryType.MULTILINESTRING)
+
+
+def _find_referenced(
+    rail_connection: ImxObject,
+    find: Callable[[str], ImxObject | None],
+    exceptions: BuildExceptions,
+) -> list[ImxObject]:
+    refs = rail_connection.refs
+    track_ref = next(iter(refs.get("@trackRef", ())), None)
+    passage_refs = refs.get("@passageRefs") or refs.get("PassageRefs", ())
+
+    referenced = []
+    for object_type, ref in [("Passage", item) for item in passage_refs] + (
+        [("Track", track_ref)] if track_ref else []
+    ):
+        imx_object = find(ref)
+        if imx_object is None:
+            exceptions.add(
+                ImxRailConnectionRefNotPresent(
+                    msg=f"{object_type} {ref} of rail_connection {rail_connection.puic} not present"
+                ),
+                rail_connection.puic,
+            )
+        else:
+            referenced.append(imx_object)
+    return referenced
+
+
+def _find_node_location(
+    rail_connection: ImxObject,
+    find: Callable[[str], ImxObject | None],
+    key: str,
+) -> ImxGeographicLocation | None:
+    node_ref = rail_connection.extension_properties.get(
+        f"extension.MicroLink.{key}.@nodeRef"
+    )
+    junction = find(node_ref) if node_ref else None
+    return None if junction is None else junction.geographic_location
 
 
 def build_rail_connections(
@@ -18,9 +63,12 @@ def build_rail_connections(
     Constructs rail connections by merging geometries of referenced track and passage objects.
 
     ??? info
-        This function retrieves rail connection objects, fetches their referenced track and passage objects,
-        merges their geometries, and assigns the resulting geometry to the rail connection. It handles exceptions
-        when references are missing or invalid and logs these exceptions.
+        The referenced track and passage objects of all rail connections are resolved first, missing
+        references are logged. Their geographic locations are parsed in bulk and the geometries of all rail
+        connections are merged and oriented from the FromMicroNode to the ToMicroNode by shapely array
+        operations, so the build time scales with the number of rail connections and not with the number of
+        shapely calls. Merges that do not result in a single LineString and missing or invalid MicroNodes are
+        logged, those rail connections get no geometry.
 
     Args:
         get_by_types : A callable to retrieve objects by their types.
@@ -28,115 +76,91 @@ def build_rail_connections(
         exceptions: An object to collect exceptions that occur during the build process.
     """
 
-    rail_connections = get_by_types(["RailConnection"])
-    for rail_connection in rail_connections:
-        track_ref = rail_connection.element.attrib.get("trackRef")
-        passage_refs_str = rail_connection.element.attrib.get("passageRefs", "")
-
-        passage_refs = passage_refs_str.split() if passage_refs_str else []
-
-        if not passage_refs:
-            passage_refs_elements = rail_connection.element.findall(".//{*}PassageRefs")
-            if passage_refs_elements:
-                passage_ref_text = passage_refs_elements[0].text
-                if passage_ref_text:
-                    passage_refs = (
-                        passage_ref_text.split()
-                        if " " in passage_ref_text
-                        else [passage_ref_text]
-                    )
-
-        geometries = []
-        for passage_ref in passage_refs:
-            passage_obj = find(passage_ref)
-            if passage_obj is None:
-                exceptions.add(
-                    ImxRailConnectionRefNotPresent(
-                        msg=f"Passage {passage_ref} of rail_connection {rail_connection.puic} not present"
-                    ),
-                    rail_connection.puic,
-                )
-            else:
-                geographic_location = passage_obj.geographic_location
-                if geographic_location:
-                    geometries.append(geographic_location.shapely)
-
-        if track_ref:
-            track_obj = find(track_ref)
-            if track_obj is None:
-                exceptions.add(
-                    ImxRailConnectionRefNotPresent(
-                        msg=f"Track {track_ref} of rail_connection {rail_connection.puic} not present"
-                    ),
-                    rail_connection.puic,
-                )
-            else:
-                geographic_location = track_obj.geographic_location
-                if geographic_location:
-                    geometries.append(geographic_location.shapely)
-
-        if geometries:
-            # Ensure geometries are of the expected type for linemerge
-            valid_geometries = [
-                geom
-                for geom in geometries
-                if isinstance(geom, LineString | MultiLineString)
-            ]
-            line_geometry = linemerge(valid_geometries)
-
-            # Check if linemerge resulted in a LineString
-            if isinstance(line_geometry, MultiLineString):
-                exceptions.add(
-                    ImxRailConnectionRefNotPresent(
-                        msg=f"RailConnection {rail_connection.puic} merge geometries result in MultiLineString"
-                    ),
-                    rail_connection.puic,
-                )
-                continue
-
-            if not isinstance(line_geometry, LineString):
-                exceptions.add(
-                    ImxRailConnectionRefNotPresent(
-                        msg=f"RailConnection {rail_connection.puic} merge geometries result is not a LineString"
-                    ),
-                    rail_connection.puic,
-                )
-                continue
-
-            from_node_ref = rail_connection.extension_properties.get(
-                "extension.MicroLink.FromMicroNode.@nodeRef"
+    rail_connections = []
+    referenced: list[list[ImxObject]] = []
+    for rail_connection in get_by_types(["RailConnection"]):
+        referenced_objects = _find_referenced(rail_connection, find, exceptions)
+        if referenced_objects:
+            rail_connections.append(rail_connection)
+            referenced.append(referenced_objects)
+    parse_geometries(imx_object for objects in referenced for imx_object in objects)
+
+    # collect the line parts of all referenced geometries, indexed by rail connection
+    geometries, geometry_index = [], []
+    has_geometry = np.zeros(len(rail_connections), dtype=bool)
+    for index, referenced_objects in enumerate(referenced):
+        for imx_object in referenced_objects:
+            geographic_location = imx_object.geographic_location
+            if geographic_location:
+                geometries.append(geographic_location.shapely)
+                geometry_index.append(index)
+                has_geometry[index] = True
+    geometry_array = np.array(geometries, dtype=object)
+    index_array = np.array(geometry_index, dtype=np.int64)
+    is_line = np.isin(shapely.get_type_id(geometry_array), _LINE_TYPES)
+    parts, part_index = shapely.get_parts(geometry_array[is_line], return_index=True)
+
+    merged = np.full(len(rail_connections), None, dtype=object)
+    with_parts = np.unique(index_array[is_line][part_index])
+    if with_parts.size:
+        multi_lines = shapely.multilinestrings(
+            parts,
+            indices=np.searchsorted(with_parts, index_array[is_line][part_index]),
+        )
+        merged[with_parts] = shapely.line_merge(multi_lines)
+    merged_type = shapely.get_type_id(merged)
+
+    valid, from_points, to_points = [], [], []
+    for index, rail_connection in enumerate(rail_connections):
+        if not has_geometry[index]:
+            continue
+        if merged_type[index] == GeometryType.MULTILINESTRING:
+            exceptions.add(
+                ImxRailConnectionRefNotPresent(
+                    msg=f"RailConnection {rail_connection.puic} merge geometries result in MultiLineString"
+                ),
+                rail_connection.puic,
             )
-            from_junction = find(from_node_ref) if from_node_ref else None
-            if from_junction is None or from_junction.geographic_location is None:
-                exceptions.add(
-                    ImxRailConnectionRefNotPresent(
-                        msg=f"RailConnection {rail_connection.puic} missing or invalid FromMicroNode"
-                    ),
-                    rail_connection.puic,
-                )
-                continue
-
-            to_node_ref = rail_connection.extension_properties.get(
-                "extension.MicroLink.ToMicroNode.@nodeRef"
+            continue
+        if merged_type[index] != GeometryType.LINESTRING:
+            exceptions.add(
+                ImxRailConnectionRefNotPresent(
+                    msg=f"RailConnection {rail_connection.puic} merge geometries result is not a LineString"
+                ),
+                rail_connection.puic,
             )
-            to_junction = find(to_node_ref) if to_node_ref else None
-            if to_junction is None or to_junction.geographic_location is None:
-                exceptions.add(
-                    ImxRailConnectionRefNotPresent(
-                        msg=f"RailConnection {rail_connection.puic} missing or invalid ToMicroNode"
-                    ),
-                    rail_connection.puic,
-                )
-                continue
-
-            first_coord_distance_from_from_node = Point(
-                line_geometry.coords[0]
-            ).distance(from_junction.geographic_location.shapely)
-            first_coord_distance_from_to_node = Point(line_geometry.coords[0]).distance(
-                to_junction.geographic_location.shapely
+            continue
+
+        from_location = _find_node_location(rail_connection, find, "FromMicroNode")
+        if from_location is None:
+            exceptions.add(
+                ImxRailConnectionRefNotPresent(
+                    msg=f"RailConnection {rail_connection.puic} missing or invalid FromMicroNode"
+                ),
+                rail_connection.puic,
             )
-
-            if first_coord_distance_from_to_node < first_coord_distance_from_from_node:
-                line_geometry = reverse_line(line_geometry)
-
-            rail_connection.geometry = line_geometry
+            continue
+        to_location = _find_node_location(rail_connection, find, "ToMicroNode")
+        if to_location is None:
+            exceptions.add(
+                ImxRailConnectionRefNotPresent(
+                    msg=f"RailConnection {rail_connection.puic} missing or invalid ToMicroNode"
+                ),
+                rail_connection.puic,
+            )
+            continue
+
+        valid.append(index)
+        from_points.append(from_location.shapely)
+        to_points.append(to_location.shapely)
+
+    if not valid:
+        return
+    lines = merged[valid]
+    first_points = shapely.get_point(lines, 0)
+    reverse = shapely.distance(first_points, np.array(to_points)) < shapely.distance(
+        first_points, np.array(from_points)
+    )
+    lines[reverse] = shapely.reverse(lines[reverse])
+    for index, line in zip(valid, lines):
+        rail_connections[index].geometry = line
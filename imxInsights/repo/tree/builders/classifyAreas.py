@@ -0,0 +1,62 @@
+from collections.abc import Iterable
+
+import numpy as np
+import shapely
+
+from imxInsights.domain.areas import ProjectAreas
+from imxInsights.domain.imxEnums import ImxAreaEnum
+from imxInsights.domain.imxObject import ImxObject
+from imxInsights.repo.tree.builders.parseGeometries import parse_geometries
+from imxInsights.repo.tree.spatialIndex import object_geometry
+
+
+def classify_areas(objects: Iterable[ImxObject], project_areas: ProjectAreas) -> None:
+    """
+    Sets the area of the IMX objects based on the areas of the project.
+
+    ??? info
+        The area of an object is the innermost project area that intersects its geometry, or outside if none
+        does. Objects without geometry get no area. All geometries are tested at once per area by vectorized
+        shapely predicates on the prepared area polygon, points are tested by their coordinates only.
+
+    Args:
+        objects: The IMX objects to classify.
+        project_areas: The areas of the project.
+    """
+    area_items = project_areas.items()
+    if not area_items:
+        return
+
+    objects = list(objects)
+    parse_geometries(objects)
+    classified: list[ImxObject] = []
+    geometries = []
+    for imx_object in objects:
+        geometry = object_geometry(imx_object)
+        if geometry is None:
+            imx_object.area = None
+        else:
+            classified.append(imx_object)
+            geometries.append(geometry)
+    if not classified:
+        return
+
+    geometry_array = np.array(geometries, dtype=object)
+    is_point = shapely.get_type_id(geometry_array) == shapely.GeometryType.POINT
+    point_x = shapely.get_x(geometry_array[is_point])
+    point_y = shapely.get_y(geometry_array[is_point])
+
+    area_types = [ImxAreaEnum.OUTSIDE]
+    area_codes = np.zeros(len(classified), dtype=np.int8)
+    # outermost area first, so the innermost intersecting area is kept
+    for area_type, area in reversed(area_items):
+        polygon = area.shapely
+        shapely.prepare(polygon)
+        in_area = np.zeros(len(classified), dtype=bool)
+        in_area[is_point] = shapely.intersects_xy(polygon, point_x, point_y)
+        in_area[~is_point] = shapely.intersects(polygon, geometry_array[~is_point])
+        area_types.append(area_type)
+        area_codes[in_area] = len(area_types) - 1
+
+    for imx_object, area_code in zip(classified, area_codes):
+        imx_object.area = area_types[area_code]
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from collections.abc import Container
 
 from lxml.etree import _Element as Element
 
@@ -10,12 +11,22 @@ from imxInsights.repo.config import Configuration, get_valid_version
 from imxInsights.repo.tree.buildExceptions import BuildExceptions
 
 
+def _get_ref(extension_object: ImxObject, ref_key: str) -> str:
+    """Reads a ref attribute from the element if possible, so the properties of the extension are not flattened."""
+    element = extension_object.element
+    if element is not None and ref_key.startswith("@"):
+        return element.attrib[ref_key[1:]]
+    return extension_object.properties[ref_key]
+
+
 def extend_objects(
     tree_dict: defaultdict[str, list[ImxObject]],
     build_exceptions: BuildExceptions,
     imx_file: ImxFile,
     element: Element | None,
-):
+    extension_objects: list[ImxObject] | None = None,
+    shared_objects: Container[int] = frozenset(),
+) -> list[ImxObject]:
     """
     Extends IMX objects in a tree structure with additional properties and handles exceptions.
 
@@ -29,9 +40,15 @@ def extend_objects(
         build_exceptions: An object to collect exceptions that occur during the build process.
         imx_file: An object representing the IMX file to be processed.
         element: An optional XML element to narrow down the search scope within the IMX file.
+        extension_objects: Optional already created extension objects, for example by the streaming loader,
+            if given the IMX file and element are not searched.
+        shared_objects: The ids of objects that are shared with another tree, they are already extended.
+
+    Returns:
+        The IMX objects that are extended.
 
     Raises:
-        ValueError: If `element` is None and `imx_file.root` is also None.
+        ValueError: If `extension_objects` and `element` are None and `imx_file.root` is also None.
     """
 
     def _extend_imx_object():
@@ -68,13 +85,17 @@ def extend_objects(
 
         if extend:
             imx_object.extend_imx_object(extension_object)
+            extended_objects.append(imx_object)
 
     # main method
+    extended_objects: list[ImxObject] = []
     valid_version = get_valid_version(imx_file.imx_version)
     for object_type, ref_attr in Configuration.get_object_type_to_extend_config(
         valid_version
     ).__dict__.items():
-        if element is None:
+        if extension_objects is not None:
+            objects = [item for item in extension_objects if item.tag == object_type]
+        elif element is None:
             if imx_file.root is not None:
                 objects = [
                     ImxObject(element=element, imx_file=imx_file)
@@ -94,11 +115,12 @@ def extend_objects(
                 )
             ]
         for extension_object in objects:
-            puic_to_find = extension_object.properties[ref_attr[0]]
+            puic_to_find = _get_ref(extension_object, ref_attr[0])
             if puic_to_find in tree_dict.keys():
                 object_to_extend = tree_dict[puic_to_find]
                 for imx_object in object_to_extend:
-                    _extend_imx_object()
+                    if id(imx_object) not in shared_objects:
+                        _extend_imx_object()
             else:
                 build_exceptions.add(
                     ImxUnconnectedExtension(
@@ -107,3 +129,5 @@ def extend_objects(
                     ),
                     puic_to_find,
                 )
+
+    return extended_objects
@@ -0,0 +1,28 @@
+from collections.abc import Iterable
+
+from imxInsights.domain.imxGeographicLocation import ImxGeographicLocation
+from imxInsights.domain.imxObject import ImxObject
+
+
+def parse_geometries(objects: Iterable[ImxObject]) -> None:
+    """
+    Parses the geographic location of all given IMX objects in one pass.
+
+    ??? info
+        The geographic location of an object is parsed on first access and cached. Parsing all of them
+        during the build moves that cost to load time, so spatial queries and exports do not parse GML.
+        The coordinates of all objects are decoded first and the shapely geometries are created in bulk.
+
+    Args:
+        objects: The IMX objects to parse the geographic location of.
+    """
+    to_parse = [
+        imx_object
+        for imx_object in objects
+        if imx_object.element is not None and not imx_object._geographic_location_parsed
+    ]
+    geographic_locations = ImxGeographicLocation.from_elements(
+        [imx_object.element for imx_object in to_parse]
+    )
+    for imx_object, geographic_location in zip(to_parse, geographic_locations):
+        imx_object.set_geographic_location(geographic_location)
@@ -0,0 +1,160 @@
+import hashlib
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from imxInsights.domain.imxObject import ImxObject
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """
+    A node of a Merkle fingerprint hierarchy.
+
+    Attributes:
+        name: The name of the node, for example a file, type, bucket or puic.
+        digest: The hash of the node, equal digests mean equal content.
+        children: The child nodes by name.
+    """
+
+    name: str
+    digest: str
+    children: dict[str, "Fingerprint"] = field(default_factory=dict)
+
+
+def _hash(*parts: str) -> str:
+    return hashlib.blake2b("\x1e".join(parts).encode(), digest_size=16).hexdigest()
+
+
+def _branch(name: str, children: dict[str, Fingerprint]) -> Fingerprint:
+    children = dict(sorted(children.items()))
+    return Fingerprint(
+        name,
+        _hash(*(f"{key}\x1f{child.digest}" for key, child in children.items())),
+        children,
+    )
+
+
+def _file_key(imx_object: ImxObject) -> str:
+    # the root tag without namespace, for example SignalingDesign, so petal files match by kind and not by name
+    return imx_object.imx_file.tag.rsplit("}", 1)[-1] or imx_object.imx_file.path.name
+
+
+def _bucket_key(puic: str) -> str:
+    return hashlib.blake2b(puic.encode(), digest_size=1).hexdigest()
+
+
+def _subtree_fingerprint(
+    imx_object: ImxObject, subtrees: dict[int, Fingerprint]
+) -> Fingerprint:
+    fingerprint = subtrees.get(id(imx_object))
+    if fingerprint is None:
+        children = {
+            child.puic: _subtree_fingerprint(child, subtrees)
+            for child in imx_object.direct_children
+        }
+        fingerprint = Fingerprint(
+            imx_object.puic,
+            _hash(
+                imx_object.content_hash,
+                *(f"{key}\x1f{child.digest}" for key, child in children.items()),
+            ),
+            children,
+        )
+        subtrees[id(imx_object)] = fingerprint
+    return fingerprint
+
+
+def build_fingerprint(name: str, objects: Iterable[ImxObject]) -> Fingerprint:
+    """
+    Builds the Merkle fingerprint hierarchy of the objects of a container.
+
+    ??? info
+        The hierarchy is container, file, object type, puic hash bucket and object subtree. The digest of an
+        object subtree is the hash of the object content hash and the digests of its direct children, the
+        digest of every other node is the hash of the names and digests of its children. All objects are
+        under their type, so a changed nested object is found under its type and under its parents. The
+        buckets split large types in 256 parts, so descending a type does not compare every object.
+
+    Args:
+        name: The name of the root node, for example the container id.
+        objects: The objects of the container.
+
+    Returns:
+        The root fingerprint.
+    """
+    subtrees: dict[int, Fingerprint] = {}
+    buckets: defaultdict[str, defaultdict[str, defaultdict[str, dict]]] = defaultdict(
+        lambda: defaultdict(lambda: defaultdict(dict))
+    )
+    for imx_object in objects:
+        buckets[_file_key(imx_object)][imx_object.tag][_bucket_key(imx_object.puic)][
+            imx_object.puic
+        ] = _subtree_fingerprint(imx_object, subtrees)
+
+    return _branch(
+        name,
+        {
+            file_key: _branch(
+                file_key,
+                {
+                    tag: _branch(
+                        tag,
+                        {
+                            bucket: _branch(bucket, objects_by_puic)
+                            for bucket, objects_by_puic in tag_buckets.items()
+                        },
+                    )
+                    for tag, tag_buckets in file_buckets.items()
+                },
+            )
+            for file_key, file_buckets in buckets.items()
+        },
+    )
+
+
+def diff_fingerprints(
+    fingerprint: Fingerprint | None, other: Fingerprint | None
+) -> list[tuple[str, ...]]:
+    """
+    Finds where two fingerprint hierarchies differ.
+
+    ??? info
+        Only branches with different digests are descended, so the cost depends on the number of changed
+        objects and the depth of the hierarchy and not on the size of the containers. A node is reported if
+        it is only present in one of the hierarchies, or if its digest differs and none of its children do,
+        so the deepest differing nodes are returned.
+
+    Args:
+        fingerprint: The fingerprint to compare.
+        other: The fingerprint to compare with.
+
+    Returns:
+        The paths of the differing nodes, the names of the nodes below the roots, for example
+        (file, type, bucket, puic, child puic).
+    """
+    differences: list[tuple[str, ...]] = []
+    stack: list[tuple[Fingerprint | None, Fingerprint | None, tuple[str, ...]]] = [
+        (fingerprint, other, ())
+    ]
+    while stack:
+        node, other_node, path = stack.pop()
+        if node is None or other_node is None:
+            differences.append(path)
+            continue
+        if node.digest == other_node.digest:
+            continue
+        differing_children = [
+            (node.children.get(key), other_node.children.get(key), (*path, key))
+            for key in node.children.keys() | other_node.children.keys()
+            if key not in node.children
+            or key not in other_node.children
+            or node.children[key].digest != other_node.children[key].digest
+        ]
+        if differing_children:
+            stack.extend(
+                sorted(differing_children, key=lambda item: item[2], reverse=True)
+            )
+        else:
+            differences.append(path)
+    return differences
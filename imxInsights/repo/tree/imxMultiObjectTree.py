@@ -4,6 +4,20 @@ from imxInsights.domain.imxObject import ImxObject
 from imxInsights.repo.tree.imxObjectTree import ObjectTree
 
 
+def _remove_once(items: list, to_remove: list) -> list:
+    """Removes one occurrence of every item by identity, a container can be added more than once."""
+    counts: dict[int, int] = {}
+    for item in to_remove:
+        counts[id(item)] = counts.get(id(item), 0) + 1
+    remaining = []
+    for item in items:
+        if counts.get(id(item), 0) > 0:
+            counts[id(item)] -= 1
+        else:
+            remaining.append(item)
+    return remaining
+
+
 class MultiObjectTree(ObjectTree):
     """
     Represents a tree structure of multiple ImxObject lists.
@@ -17,6 +31,66 @@ class MultiObjectTree(ObjectTree):
     def __init__(self):
         super().__init__()
 
+    def add_tree(self, tree: ObjectTree) -> None:
+        """
+        Merges the objects and build exceptions of a tree into this tree.
+
+        Marks for internal use.
+
+        Args:
+            tree (ObjectTree): The tree to add.
+
+        Raises:
+            ValueError: If the tree holds objects that are shared with another tree.
+        """
+        if tree.has_shared_objects:
+            # a shared object has the container id of the tree that created it
+            raise ValueError(  # noqa: TRY003
+                "Trees with shared objects can not be merged, load without share_unchanged"
+            )
+        for key, value in tree.tree_dict.items():
+            self.tree_dict[key].extend(value)
+        for key, exceptions in tree.build_extensions.exceptions.items():
+            self.build_extensions.exceptions[key].extend(exceptions)
+        self.update_keys()
+        self.update_index(tree.tree_dict.keys())
+
+    def remove_tree(self, tree: ObjectTree) -> None:
+        """
+        Removes the objects and build exceptions of a tree from this tree.
+
+        ??? info
+            The objects are shared with the tree of the container, they are removed by identity. If the same
+            tree is added more than once only one occurrence is removed.
+
+        Marks for internal use.
+
+        Args:
+            tree (ObjectTree): The tree to remove.
+        """
+        for key, value in tree.tree_dict.items():
+            if key not in self.tree_dict:
+                continue
+            remaining = _remove_once(self.tree_dict[key], value)
+            if remaining:
+                self.tree_dict[key] = remaining
+            else:
+                del self.tree_dict[key]
+
+        for key, exceptions in tree.build_extensions.exceptions.items():
+            if key not in self.build_extensions.exceptions:
+                continue
+            remaining_exceptions = _remove_once(
+                self.build_extensions.exceptions[key], exceptions
+            )
+            if remaining_exceptions:
+                self.build_extensions.exceptions[key] = remaining_exceptions
+            else:
+                del self.build_extensions.exceptions[key]
+
+        self.update_keys()
+        self.update_index(tree.tree_dict.keys())
+
     def get_all(self) -> Iterable[list[ImxObject]]:  # type: ignore
         """
         Get an iterable of all ImxObjects in the tree.
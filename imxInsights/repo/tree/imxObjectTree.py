@@ -4,31 +4,74 @@ from itertools import chain
 
 from lxml.etree import _Element as Element
 
+from imxInsights.domain.areas import ProjectAreas
+from imxInsights.domain.imxEnums import ImxAreaEnum
 from imxInsights.domain.imxObject import ImxObject
-from imxInsights.exceptions.imxExceptions import ImxDuplicatedPuicsInContainer
+from imxInsights.exceptions.imxExceptions import (
+    ImxDuplicatedPuicsInContainer,
+    ImxRefNotPresent,
+)
 from imxInsights.file.imxFile import ImxFile
 from imxInsights.repo.tree.builders.addChildren import add_children
 from imxInsights.repo.tree.builders.buildRailConnections import (
+    RAIL_CONNECTION_INPUT_TYPES,
     build_rail_connections,
 )
+from imxInsights.repo.tree.builders.classifyAreas import classify_areas
 from imxInsights.repo.tree.builders.extendObjects import extend_objects
+from imxInsights.repo.tree.builders.parseGeometries import parse_geometries
 from imxInsights.repo.tree.buildExceptions import BuildExceptions
+from imxInsights.repo.tree.fingerprints import Fingerprint, build_fingerprint
+from imxInsights.repo.tree.refIndex import RefIndex
+from imxInsights.repo.tree.spatialIndex import SpatialIndex
+from imxInsights.repo.tree.topologyGraph import TopologyGraph
 
 
 class ObjectTree:
     """
     Manages and constructs a tree of ImxObjects, allowing for extensions, validation, and various operations on the tree.
 
+    ??? info
+        Besides the tree dictionary the tree keeps a type and a path index, both map to the puics in insertion
+        order. The indexes are updated for every puic that is added or removed, so type and path lookups take
+        time proportional to the result size. The type and path of a puic are the ones of its first object.
+
+    Args:
+        parse_geometries (bool): If True the geographic locations of all objects are parsed in bulk during
+            build, else they are parsed on first access.
+        check_refs (bool): If True the references to puics that are not present are added to the build
+            exceptions during build, this flattens the properties of all objects.
+
     Attributes:
         tree_dict (defaultdict[str, list[ImxObject]]): The dictionary representing the tree of ImxObjects.
         build_extensions (BuildExceptions): Holds exceptions encountered during the build process.
     """
 
-    def __init__(self):
+    def __init__(self, parse_geometries: bool = False, check_refs: bool = False):
         # todo: not private for easy debug, should be private, objects should return stuff
         self.tree_dict: defaultdict[str, list[ImxObject]] = defaultdict(list)
         self._keys: frozenset[str] = frozenset()
         self.build_extensions: BuildExceptions = BuildExceptions()
+        self.parse_geometries: bool = parse_geometries
+        self.check_refs: bool = check_refs
+        self.project_areas: ProjectAreas | None = None
+        self._staged_files: list[
+            tuple[ImxFile, Element | None, list[ImxObject] | None]
+        ] = []
+        self._staged_objects: list[ImxObject] = []
+        # dicts are used as insertion ordered sets of puics
+        self._type_index: dict[str, dict[str, None]] = {}
+        self._path_index: dict[str, dict[str, None]] = {}
+        self._indexed: dict[str, tuple[str, str]] = {}
+        self._version: int = 0
+        self._spatial_index: SpatialIndex | None = None
+        self._ref_index: RefIndex | None = None
+        # the tree version the objects are classified by area for, None if not classified
+        self._areas_version: int | None = None
+        self._topology_graph: TopologyGraph | None = None
+        self._fingerprints: tuple[int, dict[str, Fingerprint]] | None = None
+        # the container id in this tree of the objects that are shared with another tree, by object id
+        self._shared_objects: dict[int, str] = {}
 
     @property
     def keys(self) -> frozenset[str]:
@@ -40,6 +83,16 @@ class ObjectTree:
         """
         return self._keys
 
+    @property
+    def version(self) -> int:
+        """
+        Returns the version of the tree, it is increased every time the tree changes.
+
+        Returns:
+            int: The version of the tree.
+        """
+        return self._version
+
     def update_keys(self) -> None:
         """
         Updates the set of keys in the tree dictionary.
@@ -47,8 +100,151 @@ class ObjectTree:
         Marks for internal use.
         """
         self._keys = frozenset[str](key for key in self.tree_dict.keys())
+        self._version += 1
+
+    def get_spatial_index(self) -> SpatialIndex:
+        """
+        Returns the spatial index of the tree, it is created on first use and recreated after the tree changed.
 
-    def add_imx_element(self, element: Element, imx_file: ImxFile, container_id: str):
+        Returns:
+            SpatialIndex: The spatial index over the geometries of all objects in the tree.
+        """
+        if self._spatial_index is None or self._spatial_index.version != self._version:
+            self._spatial_index = SpatialIndex(
+                chain.from_iterable(self.tree_dict.values()), self._version
+            )
+        return self._spatial_index
+
+    def get_topology_graph(self) -> TopologyGraph:
+        """
+        Returns the topology graph of the tree, it is created on first use and recreated after the tree changed.
+
+        Returns:
+            TopologyGraph: The graph of the MicroNodes and MicroLinks in the tree.
+        """
+        if (
+            self._topology_graph is None
+            or self._topology_graph.version != self._version
+        ):
+            self._topology_graph = TopologyGraph(
+                (items[0] for items in self.tree_dict.values()), self._version
+            )
+        return self._topology_graph
+
+    def get_fingerprints(self) -> dict[str, Fingerprint]:
+        """
+        Returns the Merkle fingerprint of every container in the tree, they are created on first use and recreated
+        after the tree changed.
+
+        Returns:
+            dict[str, Fingerprint]: The root fingerprint by container id.
+        """
+        if self._fingerprints is None or self._fingerprints[0] != self._version:
+            objects_by_container: defaultdict[str, list[ImxObject]] = defaultdict(list)
+            for imx_object in chain.from_iterable(self.tree_dict.values()):
+                objects_by_container[self.get_container_id(imx_object) or ""].append(
+                    imx_object
+                )
+            self._fingerprints = (
+                self._version,
+                {
+                    container_id: build_fingerprint(container_id, objects)
+                    for container_id, objects in objects_by_container.items()
+                },
+            )
+        return self._fingerprints[1]
+
+    @property
+    def has_shared_objects(self) -> bool:
+        """
+        Returns if the tree holds objects that are shared with another tree, see `share_objects`.
+
+        Returns:
+            bool: True if the tree holds shared objects.
+        """
+        return bool(self._shared_objects)
+
+    def get_container_id(self, imx_object: ImxObject) -> str | None:
+        """
+        Returns the container id of an object in this tree.
+
+        ??? info
+            A shared object keeps the container id of the tree that created it, in this tree it belongs to
+            the container it is shared with.
+
+        Args:
+            imx_object (ImxObject): The object in this tree.
+
+        Returns:
+            str | None: The container id.
+        """
+        return self._shared_objects.get(id(imx_object), imx_object.container_id)
+
+    def share_objects(
+        self,
+        objects: Iterable[ImxObject],
+        container_id: str,
+        exceptions: BuildExceptions | None = None,
+    ) -> None:
+        """
+        Adds the already build objects of another tree without copying them.
+
+        ??? info
+            The objects are not staged, so the builders do not process them again, they keep their parents,
+            children, extensions, geometries and areas. Shared objects should not be changed, the change is
+            visible in both trees. The build exceptions of the shared puics are copied.
+
+        Marks for internal use.
+
+        Args:
+            objects (Iterable[ImxObject]): The objects to share, complete subtrees.
+            container_id (str): The container id of this tree.
+            exceptions (BuildExceptions, optional): The build exceptions of the other tree.
+        """
+        puics: dict[str, None] = {}
+        for imx_object in objects:
+            self.tree_dict[imx_object.puic].append(imx_object)
+            self._shared_objects[id(imx_object)] = container_id
+            puics[imx_object.puic] = None
+
+        if exceptions is not None:
+            for puic in puics:
+                for exception in exceptions.exceptions.get(puic, []):
+                    self.build_extensions.add(exception, puic)
+        self.update_keys()
+        self.update_index(puics)
+
+    def update_index(self, puics: Iterable[str]) -> None:
+        """
+        Updates the type and path index for the given puics.
+
+        Marks for internal use.
+
+        Args:
+            puics (Iterable[str]): The puics that are added, changed or removed from the tree dictionary.
+        """
+        for puic in puics:
+            indexed = self._indexed.pop(puic, None)
+            if indexed is not None:
+                for index, key in zip((self._type_index, self._path_index), indexed):
+                    index[key].pop(puic, None)
+                    if not index[key]:
+                        del index[key]
+
+            items = self.tree_dict.get(puic)
+            if items:
+                tag, path = items[0].tag, items[0].path
+                self._type_index.setdefault(tag, {})[puic] = None
+                self._path_index.setdefault(path, {})[puic] = None
+                self._indexed[puic] = (tag, path)
+
+    def add_imx_element(
+        self,
+        element: Element,
+        imx_file: ImxFile,
+        container_id: str,
+        build: bool = True,
+    ) -> None:
         """
         Adds an ImxObject derived from an XML element to the tree.
 
@@ -58,13 +254,18 @@ class ObjectTree:
             element (Element): The XML element to be added.
             imx_file (ImxFile): The ImxFile associated with the element.
             container_id (str): The container ID to associate with the ImxObject.
+            build (bool): If True the tree builders run directly, else the element is staged until `build` is called.
         """
         tree_to_add = self._create_tree_dict(
             ImxObject.lookup_tree_from_element(element, imx_file), container_id
         )
-        self._validate_and_build(tree_to_add, imx_file, element)
+        self._validate_and_stage(tree_to_add, imx_file, element)
+        if build:
+            self.build()
 
-    def add_imx_file(self, imx_file: ImxFile, container_id: str) -> None:
+    def add_imx_file(
+        self, imx_file: ImxFile, container_id: str, build: bool = True
+    ) -> None:
         """
         Adds an ImxObject derived from an ImxFile to the tree.
 
@@ -73,20 +274,53 @@ class ObjectTree:
         Args:
             imx_file (ImxFile): The ImxFile to be added.
             container_id (str): The container ID to associate with the ImxObject.
+            build (bool): If True the tree builders run directly, else the file is staged until `build` is called.
         """
         tree_to_add = self._create_tree_dict(
             ImxObject.lookup_tree_from_imx_file(imx_file), container_id
         )
-        self._validate_and_build(tree_to_add, imx_file)
+        self._validate_and_stage(tree_to_add, imx_file)
+        if build:
+            self.build()
+
+    def add_imx_objects(
+        self,
+        objects: list[ImxObject],
+        imx_file: ImxFile,
+        container_id: str,
+        extension_objects: list[ImxObject] | None = None,
+        build: bool = True,
+        element: Element | None = None,
+    ) -> None:
+        """
+        Adds already created ImxObjects to the tree, for example objects build by the streaming loader.
+
+        Marks for internal use.
+
+        Args:
+            objects (list[ImxObject]): The ImxObjects to be added, parents should already be set.
+            imx_file (ImxFile): The ImxFile associated with the objects.
+            container_id (str): The container ID to associate with the ImxObjects.
+            extension_objects (list[ImxObject], optional): The extension objects that belong to the objects.
+            build (bool): If True the tree builders run directly, else the objects are staged until `build` is called.
+            element (Element, optional): The XML element to search the extension objects in, if they are not given.
+        """
+        tree_to_add = self._create_tree_dict(objects, container_id)
+        self._validate_and_stage(
+            tree_to_add, imx_file, element, extension_objects=extension_objects
+        )
+        if build:
+            self.build()
 
-    def _validate_and_build(
+    def _validate_and_stage(
         self,
         tree_to_add: defaultdict[str, list[ImxObject]],
         imx_file: ImxFile,
         element: Element | None = None,
+        extension_objects: list[ImxObject] | None = None,
     ):
         """
-        Validates and builds the tree structure from the provided dictionary.
+        Validates the provided dictionary and stages it for the next build.
 
         Ensures no duplicate PUICs exist in the container and integrates the new tree into the current tree.
 
@@ -94,6 +328,7 @@ class ObjectTree:
             tree_to_add (defaultdict[str, list[ImxObject]]): The tree dictionary to be added.
             imx_file (ImxFile): The ImxFile associated with the objects.
             element (Element, optional): The XML element associated with the objects. Defaults to None.
+            extension_objects (list[ImxObject], optional): Already created extension objects. Defaults to None.
         """
         duplicates = [k for (k, v) in tree_to_add.items() if len(v) > 1]
         if len(duplicates) != 0:
@@ -106,16 +341,144 @@ class ObjectTree:
             else:
                 for item in value:
                     self.tree_dict[key].append(item)
+            self._staged_objects.extend(value)
 
+        self._staged_files.append((imx_file, element, extension_objects))
         self.update_keys()
+        self.update_index(tree_to_add.keys())
+
+    def build(self) -> None:
+        """
+        Runs the tree builders once over everything staged since the previous build.
+
+        ??? info
+            Files added with `build=False` are only merged into the tree, the builders run when this method is
+            called. Extensions are resolved per staged file against the complete tree, children are only set on
+            the staged objects and rail connections are only (re)build if one of its input types is staged. If
+            `parse_geometries` is set, the geographic locations of the staged objects are parsed in bulk. Objects
+            are not classified by area during build, see `classify_areas`. Shared objects are not extended
+            and their rail connections are not rebuild. If `check_refs` is set, the references to puics that
+            are not present in the complete tree replace the previous reference build exceptions.
+        """
+        if not self._staged_files:
+            return
+
+        staged_objects, self._staged_objects = self._staged_objects, []
+        staged_files, self._staged_files = self._staged_files, []
+
+        extended_objects: list[ImxObject] = []
+        for imx_file, element, extension_objects in staged_files:
+            extended_objects.extend(
+                extend_objects(
+                    self.tree_dict,
+                    self.build_extensions,
+                    imx_file,
+                    element,
+                    extension_objects,
+                    self._shared_objects,
+                )
+            )
+
+        add_children(staged_objects)
+
+        if self.parse_geometries:
+            parse_geometries(staged_objects)
+
+        if any(
+            item.tag in RAIL_CONNECTION_INPUT_TYPES
+            for item in chain(staged_objects, extended_objects)
+        ):
+            build_rail_connections(
+                self._get_unshared_by_types, self.find, self.build_extensions
+            )
+
+        self._version += 1
+
+        if self.check_refs:
+            self._add_dangling_ref_exceptions()
+
+    def _get_unshared_by_types(self, object_types: list[str]) -> list[ImxObject]:
+        # shared objects are build by the tree they are shared from
+        return [
+            item
+            for item in self.get_by_types(object_types)
+            if id(item) not in self._shared_objects
+        ]
 
-        extend_objects(self.tree_dict, self.build_extensions, imx_file, element)
-        add_children(self.tree_dict, self.find)
-        build_rail_connections(self.get_by_types, self.find, self.build_extensions)
+    def get_ref_index(self) -> RefIndex:
+        """
+        Returns the reference index of the tree, it is created on first use and recreated after the tree changed.
+
+        ??? info
+            The index is not build during the tree build, so loads that do not use references do not flatten
+            the properties of all objects. References to puics that are not present are available as
+            `RefIndex.dangling`, they are only build exceptions if the tree is build with `check_refs`.
+
+        Returns:
+            RefIndex: The reference index over all objects in the tree.
+        """
+        if self._ref_index is None or self._ref_index.version != self._version:
+            self._ref_index = RefIndex(
+                chain.from_iterable(self.tree_dict.values()), self._keys, self._version
+            )
+        return self._ref_index
+
+    def _add_dangling_ref_exceptions(self) -> None:
+        # a reference that was dangling can be resolved by a later build, so the exceptions are replaced
+        for puic in list(self.build_extensions.exceptions):
+            remaining = [
+                item
+                for item in self.build_extensions.exceptions[puic]
+                if not isinstance(item, ImxRefNotPresent)
+            ]
+            if remaining:
+                self.build_extensions.exceptions[puic] = remaining
+            else:
+                del self.build_extensions.exceptions[puic]
+
+        for source, key, target in self.get_ref_index().dangling:
+            self.build_extensions.add(
+                ImxRefNotPresent(
+                    msg=f"{key} {target} of {source} not present", data=[target]
+                ),
+                source,
+            )
+
+    def set_project_areas(self, project_areas: ProjectAreas | None) -> None:
+        """
+        Sets the project areas, the objects are classified when the areas are queried.
+
+        Args:
+            project_areas (ProjectAreas | None): The areas of the project, if None the areas are not classified.
+        """
+        self.project_areas = project_areas
+        self._areas_version = None
 
-        # todo: link ref and refs
-        # add_refs(self.objects(), self.find, self.build_extensions)
-        # todo: classify area
+    def classify_areas(self) -> None:
+        """
+        Classifies all objects in the tree by project area, if the tree or the areas changed since the last time.
+
+        ??? info
+            Classification parses the geographic locations of all objects, so it is not done during build. It
+            runs on the first `get_by_areas` after the tree or the project areas changed.
+        """
+        if self.project_areas is None or self._areas_version == self._version:
+            return
+        classify_areas(chain.from_iterable(self.tree_dict.values()), self.project_areas)
+        self._areas_version = self._version
+
+    def get_by_areas(self, areas: list[ImxAreaEnum]) -> list[ImxObject]:
+        """
+        Retrieves objects located in the specified areas from the tree.
+
+        Args:
+            areas (list[ImxAreaEnum]): The areas to retrieve the objects of.
+
+        Returns:
+            list[ImxObject]: The list of matching ImxObjects.
+        """
+        self.classify_areas()
+        return [item[0] for item in self.tree_dict.values() if item[0].area in areas]
 
     @staticmethod
     def _create_tree_dict(
@@ -143,9 +506,9 @@ class ObjectTree:
             o.container_id = container_id
             result[o.puic].append(o)
         duplicated = [o for o in objects if len(result[o.puic]) != 1]
-        assert (
-            len(duplicated) == 0
-        ), f"KeyError, multiple results for {[item.puic for item in duplicated]}"
+        assert len(duplicated) == 0, (
+            f"KeyError, multiple results for {[item.puic for item in duplicated]}"
+        )
         return result
 
     def duplicates(self) -> list[str]:
@@ -202,7 +565,7 @@ class ObjectTree:
         Returns:
             list[str]: A list of all unique object types.
         """
-        return list(set([item[0].tag for item in self.tree_dict.values()]))
+        return list(self._type_index.keys())
 
     def get_by_types(self, object_types: list[str]) -> list[ImxObject]:
         """
@@ -215,7 +578,9 @@ class ObjectTree:
             list[ImxObject]: The list of matching ImxObjects.
         """
         return [
-            item[0] for item in self.tree_dict.values() if item[0].tag in object_types
+            self.tree_dict[puic][0]
+            for object_type in dict.fromkeys(object_types)
+            for puic in self._type_index.get(object_type, {})
         ]
 
     def get_all_paths(self) -> list[str]:
@@ -225,7 +590,7 @@ class ObjectTree:
         Returns:
             list[str]: A list of all unique object paths.
         """
-        return list(set([item[0].path for item in self.tree_dict.values()]))
+        return list(self._path_index.keys())
 
     def get_by_path(self, object_paths: list[str]) -> list[ImxObject]:
         """
@@ -238,5 +603,7 @@ class ObjectTree:
             list[ImxObject]: The list of matching ImxObjects.
         """
         return [
-            item[0] for item in self.tree_dict.values() if item[0].path in object_paths
+            self.tree_dict[puic][0]
+            for object_path in dict.fromkeys(object_paths)
+            for puic in self._path_index.get(object_path, {})
         ]
@@ -0,0 +1,71 @@
+import sys
+from collections.abc import Iterable
+
+from imxInsights.domain.imxObject import ImxObject
+
+
+class RefIndex:
+    """
+    An index of the references between IMX objects.
+
+    ??? info
+        The index is build in one pass over the references of all objects, see `ImxObject.refs`. It holds the
+        forward lookup, puic to property key to referenced puics, the reverse lookup, referenced puic to the
+        referencing puic and property key, and the references to puics that are not present. The property keys
+        are interned so they are stored once. The index is immutable, the tree creates a new one after it is
+        changed.
+
+    Args:
+        objects: The objects to index.
+        keys: The puics present in the tree.
+        version: The version of the tree the index is created for.
+
+    Attributes:
+        version: The version of the tree the index is created for.
+        dangling: The source puic, property key and referenced puic of all references to puics not in the tree.
+    """
+
+    def __init__(
+        self, objects: Iterable[ImxObject], keys: frozenset[str], version: int = 0
+    ):
+        self.version: int = version
+        self.dangling: list[tuple[str, str, str]] = []
+        self._refs: dict[str, dict[str, tuple[str, ...]]] = {}
+        self._referenced_by: dict[str, list[tuple[str, str]]] = {}
+
+        for imx_object in objects:
+            if imx_object.puic in self._refs:
+                continue
+            self._refs[imx_object.puic] = imx_object.refs
+            for key, targets in imx_object.refs.items():
+                key = sys.intern(key)
+                for target in targets:
+                    self._referenced_by.setdefault(target, []).append(
+                        (imx_object.puic, key)
+                    )
+                    if target not in keys:
+                        self.dangling.append((imx_object.puic, key, target))
+
+    def get_refs(self, puic: str) -> dict[str, tuple[str, ...]]:
+        """
+        Returns the references of a puic.
+
+        Args:
+            puic: The referencing puic.
+
+        Returns:
+            The property key and referenced puics of every reference.
+        """
+        return dict(self._refs.get(puic, {}))
+
+    def get_referenced_by(self, puic: str) -> list[tuple[str, str]]:
+        """
+        Returns the objects that reference a puic.
+
+        Args:
+            puic: The referenced puic.
+
+        Returns:
+            The puic and property key of every referencing object.
+        """
+        return list(self._referenced_by.get(puic, []))
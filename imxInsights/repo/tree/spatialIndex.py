@@ -0,0 +1,146 @@
+from collections.abc import Iterable
+
+import numpy as np
+import shapely
+from shapely import Geometry, STRtree
+
+from imxInsights.domain.imxObject import ImxObject
+from imxInsights.repo.tree.builders.parseGeometries import parse_geometries
+
+
+def object_geometry(imx_object: ImxObject) -> Geometry | None:
+    """
+    Returns the geometry of an object used for spatial queries.
+
+    Args:
+        imx_object: The object to get the geometry of.
+
+    Returns:
+        The geographic location, else the build geometry (for example of a RailConnection), or None if the
+        object has no geometry.
+    """
+    geographic_location = imx_object.geographic_location
+    if geographic_location is not None:
+        return geographic_location.shapely
+    if not imx_object.geometry.is_empty:
+        return imx_object.geometry
+    return None
+
+
+class SpatialIndex:
+    """
+    A shapely STRtree over the geometries of IMX objects.
+
+    ??? info
+        The geographic locations of all objects are parsed in bulk when the index is created, objects without
+        geometry are not indexed. The index is immutable, the tree creates a new one after it is changed.
+
+    Args:
+        objects: The objects to index.
+        version: The version of the tree the index is created for.
+
+    Attributes:
+        version: The version of the tree the index is created for.
+    """
+
+    def __init__(self, objects: Iterable[ImxObject], version: int = 0):
+        objects = list(objects)
+        parse_geometries(objects)
+        indexed = [
+            (imx_object, geometry)
+            for imx_object in objects
+            if (geometry := object_geometry(imx_object)) is not None
+        ]
+        self.version: int = version
+        self._objects: list[ImxObject] = [imx_object for imx_object, _ in indexed]
+        self._geometries: np.ndarray = np.array(
+            [geometry for _, geometry in indexed], dtype=object
+        )
+        self._tree: STRtree = STRtree(self._geometries)
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def _to_objects(self, indices: np.ndarray) -> list[ImxObject]:
+        return [self._objects[index] for index in np.sort(indices)]
+
+    def query_bbox(
+        self, min_x: float, min_y: float, max_x: float, max_y: float
+    ) -> list[ImxObject]:
+        """
+        Queries the objects that intersect a bounding box.
+
+        Args:
+            min_x: The minimum x of the box.
+            min_y: The minimum y of the box.
+            max_x: The maximum x of the box.
+            max_y: The maximum y of the box.
+
+        Returns:
+            The matching objects in insertion order.
+        """
+        return self.query_intersects(shapely.box(min_x, min_y, max_x, max_y))
+
+    def query_intersects(self, geometry: Geometry) -> list[ImxObject]:
+        """
+        Queries the objects that intersect a geometry.
+
+        Args:
+            geometry: The geometry to query with.
+
+        Returns:
+            The matching objects in insertion order.
+        """
+        return self._to_objects(self._tree.query(geometry, predicate="intersects"))
+
+    def query_within_distance(
+        self, geometry: Geometry, distance: float
+    ) -> list[ImxObject]:
+        """
+        Queries the objects within a distance of a geometry.
+
+        Args:
+            geometry: The geometry to query with.
+            distance: The maximum distance.
+
+        Returns:
+            The matching objects in insertion order.
+        """
+        return self._to_objects(
+            self._tree.query(geometry, predicate="dwithin", distance=distance)
+        )
+
+    def query_nearest(self, geometry: Geometry, k: int = 1) -> list[ImxObject]:
+        """
+        Queries the k nearest objects of a geometry.
+
+        ??? info
+            The distance of the nearest object is used as a first search radius, the radius is doubled until
+            at least k objects are within it. The k nearest objects are always within that radius.
+
+        Args:
+            geometry: The geometry to query with.
+            k: The number of objects to return.
+
+        Returns:
+            The nearest objects ordered by distance, objects with equal distance in insertion order.
+        """
+        if k < 1 or len(self._objects) == 0:
+            return []
+
+        indices, distances = self._tree.query_nearest(
+            geometry, return_distance=True, all_matches=True
+        )
+        if len(indices) < k:
+            radius = max(float(distances[0]) * 2, 1.0)
+            while True:
+                indices = self._tree.query(
+                    geometry, predicate="dwithin", distance=radius
+                )
+                if len(indices) >= k or len(indices) == len(self._objects):
+                    break
+                radius *= 2
+            distances = shapely.distance(self._geometries[indices], geometry)
+
+        order = np.lexsort((indices, distances))[:k]
+        return [self._objects[index] for index in indices[order]]
@@ -0,0 +1,345 @@
+import heapq
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from imxInsights.domain.imxObject import ImxObject
+
+
+@dataclass(frozen=True)
+class _Csr:
+    """A directed graph in compressed sparse row format, edges of a vertex are `indptr[v]:indptr[v + 1]`."""
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+    edge_ids: np.ndarray
+
+    @staticmethod
+    def from_edges(
+        vertex_count: int,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray,
+        edge_ids: np.ndarray,
+    ) -> "_Csr":
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(vertex_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=vertex_count), out=indptr[1:])
+        return _Csr(
+            indptr, targets[order], weights[order].astype(np.float64), edge_ids[order]
+        )
+
+    def neighbors_of(self, vertices: np.ndarray) -> np.ndarray:
+        """Returns the targets of all edges of the given vertices in one vectorized gather."""
+        starts = self.indptr[vertices]
+        lengths = self.indptr[vertices + 1] - starts
+        if lengths.sum() == 0:
+            return np.empty(0, dtype=np.int64)
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self.indices[offsets + np.arange(lengths.sum())]
+
+    def bfs(self, starts: np.ndarray) -> np.ndarray:
+        """Returns the vertices reachable from the start vertices in breadth first order."""
+        visited = np.zeros(len(self.indptr) - 1, dtype=bool)
+        frontier = np.unique(starts)
+        visited[frontier] = True
+        levels = [frontier]
+        while frontier.size:
+            neighbors = self.neighbors_of(frontier)
+            frontier = np.unique(neighbors[~visited[neighbors]])
+            visited[frontier] = True
+            levels.append(frontier)
+        return np.concatenate(levels)
+
+
+class TopologyGraph:
+    """
+    A network model of the MicroNode and MicroLink extensions.
+
+    ??? info
+        The graph is stored as integer indexed CSR arrays. A vertex is a port of a junction, a MicroLink
+        connects two ports in both directions and is weighted by the length of the RailConnection geometry.
+        The Jumpers of a MicroNode connect its ports with weight 0, one way jumpers in one direction only and
+        jumpers that are not traversable are skipped. A MicroNode with jumpers of which none is traversable
+        does not connect its ports. Ports of a MicroNode without jumpers are all connected. Connected
+        components are determined on junction level, ignoring the jumpers.
+
+        Only a jumper with isTraversible "True" is traversable, "False" and "Unknown" are not, so a route is
+        never assumed. A jumper with isTwoWay "True" is traversable in both directions, "False" and "Unknown"
+        from fromIndex to toIndex only. A missing attribute is handled as "True".
+
+    Args:
+        objects: The objects of the tree, the junctions and RailConnections should be extended.
+
+    Attributes:
+        version: The version of the tree the graph is created for.
+        node_puics: The puic of every junction, the index is the node id.
+        link_puics: The puic of every RailConnection, the index is the link id.
+        link_lengths: The length of every RailConnection.
+    """
+
+    def __init__(self, objects: Iterable[ImxObject], version: int = 0):
+        self.version: int = version
+        self._node_ids: dict[str, int] = {}
+        self.node_puics: list[str] = []
+        self.link_puics: list[str] = []
+
+        jumpers: dict[int, list[tuple[int, int, bool, bool]]] = {}
+        link_ports: list[tuple[int, int, int, int]] = []
+        link_lengths: list[float] = []
+        for imx_object in objects:
+            for extension in imx_object.imx_extensions:
+                if extension.tag == "MicroNode":
+                    node_id = self._node_id(imx_object.puic)
+                    jumpers[node_id] = self._parse_jumpers(extension.properties)
+                elif extension.tag == "MicroLink":
+                    link = self._parse_link(extension.properties)
+                    if link is not None:
+                        self.link_puics.append(imx_object.puic)
+                        link_ports.append(link)
+                        link_lengths.append(self._link_length(imx_object))
+
+        self.link_lengths: np.ndarray = np.array(link_lengths, dtype=np.float64)
+        self._build_graphs(link_ports, jumpers)
+
+    def _node_id(self, puic: str) -> int:
+        node_id = self._node_ids.get(puic)
+        if node_id is None:
+            node_id = self._node_ids[puic] = len(self.node_puics)
+            self.node_puics.append(puic)
+        return node_id
+
+    @staticmethod
+    def _parse_jumpers(
+        properties: dict[str, str],
+    ) -> list[tuple[int, int, bool, bool]]:
+        """Returns the from port, to port, is traversable and is two way of every jumper."""
+        jumpers = []
+        for key, value in properties.items():
+            if not key.endswith("@fromIndex"):
+                continue
+            prefix = key.removesuffix("@fromIndex")
+            jumpers.append(
+                (
+                    int(value),
+                    int(properties[f"{prefix}@toIndex"]),
+                    properties.get(f"{prefix}@isTraversible", "True") == "True",
+                    properties.get(f"{prefix}@isTwoWay", "True") == "True",
+                )
+            )
+        return jumpers
+
+    def _parse_link(
+        self, properties: dict[str, str]
+    ) -> tuple[int, int, int, int] | None:
+        from_node = properties.get("FromMicroNode.@nodeRef")
+        to_node = properties.get("ToMicroNode.@nodeRef")
+        if from_node is None or to_node is None:
+            return None
+        return (
+            self._node_id(from_node),
+            int(properties.get("FromMicroNode.@portIndex", 0)),
+            self._node_id(to_node),
+            int(properties.get("ToMicroNode.@portIndex", 0)),
+        )
+
+    @staticmethod
+    def _link_length(rail_connection: ImxObject) -> float:
+        if not rail_connection.geometry.is_empty:
+            return float(rail_connection.geometry.length)
+        return 0.0
+
+    def _build_graphs(
+        self,
+        link_ports: list[tuple[int, int, int, int]],
+        jumpers: dict[int, list[tuple[int, int, bool, bool]]],
+    ) -> None:
+        node_count = len(self.node_puics)
+        links = np.array(link_ports, dtype=np.int64).reshape(-1, 4)
+        link_ids = np.arange(len(links), dtype=np.int64)
+
+        # vertices are the ports of the nodes, the ports of a node are numbered consecutive
+        node_ports: list[set[int]] = [set() for _ in range(node_count)]
+        for from_node, from_port, to_node, to_port in link_ports:
+            node_ports[from_node].add(from_port)
+            node_ports[to_node].add(to_port)
+        for node_id, node_jumpers in jumpers.items():
+            for from_port, to_port, _, _ in node_jumpers:
+                node_ports[node_id].update((from_port, to_port))
+
+        self._vertex_ids: dict[tuple[int, int], int] = {}
+        vertex_nodes: list[int] = []
+        for node_id, ports in enumerate(node_ports):
+            for port in sorted(ports):
+                self._vertex_ids[(node_id, port)] = len(vertex_nodes)
+                vertex_nodes.append(node_id)
+        self._vertex_nodes: np.ndarray = np.array(vertex_nodes, dtype=np.int64)
+
+        sources: list[int] = []
+        targets: list[int] = []
+        for node_id, ports in enumerate(node_ports):
+            vertex = [self._vertex_ids[(node_id, port)] for port in sorted(ports)]
+            # a node with jumpers only connects the ports of its traversable jumpers, maybe none
+            if jumpers.get(node_id):
+                for from_port, to_port, is_traversable, is_two_way in jumpers[node_id]:
+                    if not is_traversable:
+                        continue
+                    from_vertex = self._vertex_ids[(node_id, from_port)]
+                    to_vertex = self._vertex_ids[(node_id, to_port)]
+                    sources.append(from_vertex)
+                    targets.append(to_vertex)
+                    if is_two_way:
+                        sources.append(to_vertex)
+                        targets.append(from_vertex)
+            else:
+                for from_vertex in vertex:
+                    for to_vertex in vertex:
+                        if from_vertex != to_vertex:
+                            sources.append(from_vertex)
+                            targets.append(to_vertex)
+
+        link_from = np.array(
+            [self._vertex_ids[(link[0], link[1])] for link in link_ports],
+            dtype=np.int64,
+        )
+        link_to = np.array(
+            [self._vertex_ids[(link[2], link[3])] for link in link_ports],
+            dtype=np.int64,
+        )
+        jumper_count = len(sources)
+        self._port_graph: _Csr = _Csr.from_edges(
+            len(vertex_nodes),
+            np.concatenate([np.array(sources, dtype=np.int64), link_from, link_to]),
+            np.concatenate([np.array(targets, dtype=np.int64), link_to, link_from]),
+            np.concatenate(
+                [np.zeros(jumper_count), self.link_lengths, self.link_lengths]
+            ),
+            np.concatenate(
+                [np.full(jumper_count, -1, dtype=np.int64), link_ids, link_ids]
+            ),
+        )
+        self._node_graph: _Csr = _Csr.from_edges(
+            node_count,
+            np.concatenate([links[:, 0], links[:, 2]]),
+            np.concatenate([links[:, 2], links[:, 0]]),
+            np.concatenate([self.link_lengths, self.link_lengths]),
+            np.concatenate([link_ids, link_ids]),
+        )
+
+    def _node_vertices(self, puic: str) -> np.ndarray:
+        node_id = self._node_ids.get(puic)
+        if node_id is None:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self._vertex_nodes == node_id)
+
+    def bfs(self, puic: str) -> list[str]:
+        """
+        Traverses the network from a junction, following the jumpers.
+
+        Args:
+            puic: The puic of the junction to start from.
+
+        Returns:
+            The puics of the reachable junctions in breadth first order, starting with the given junction.
+        """
+        vertices = self._node_vertices(puic)
+        if vertices.size == 0:
+            return []
+        node_ids = self._vertex_nodes[self._port_graph.bfs(vertices)]
+        _, first = np.unique(node_ids, return_index=True)
+        return [self.node_puics[node_id] for node_id in node_ids[np.sort(first)]]
+
+    def is_reachable(self, from_puic: str, to_puic: str) -> bool:
+        """
+        Checks if a junction can be reached from another junction, following the jumpers.
+
+        Args:
+            from_puic: The puic of the junction to start from.
+            to_puic: The puic of the junction to reach.
+
+        Returns:
+            True if the junction can be reached.
+        """
+        to_vertices = self._node_vertices(to_puic)
+        from_vertices = self._node_vertices(from_puic)
+        if to_vertices.size == 0 or from_vertices.size == 0:
+            return False
+        return bool(np.isin(to_vertices, self._port_graph.bfs(from_vertices)).any())
+
+    def shortest_path(
+        self, from_puic: str, to_puic: str
+    ) -> tuple[float, list[str]] | None:
+        """
+        Finds the shortest route between two junctions by Dijkstra, weighted by RailConnection length.
+
+        Args:
+            from_puic: The puic of the junction to start from.
+            to_puic: The puic of the junction to reach.
+
+        Returns:
+            The length and the puics of the RailConnections of the route, None if there is no route.
+        """
+        from_vertices = self._node_vertices(from_puic)
+        to_vertices = set(self._node_vertices(to_puic).tolist())
+        if from_vertices.size == 0 or not to_vertices:
+            return None
+
+        graph = self._port_graph
+        indptr = graph.indptr.tolist()
+        indices = graph.indices.tolist()
+        weights = graph.weights.tolist()
+        distances: dict[int, float] = {}
+        previous: dict[int, tuple[int, int]] = {}
+        queue = [(0.0, vertex) for vertex in from_vertices.tolist()]
+        heapq.heapify(queue)
+        best = {vertex: 0.0 for vertex in from_vertices.tolist()}
+        while queue:
+            distance, vertex = heapq.heappop(queue)
+            if vertex in distances:
+                continue
+            distances[vertex] = distance
+            if vertex in to_vertices:
+                return distance, self._link_path(vertex, previous)
+            for edge in range(indptr[vertex], indptr[vertex + 1]):
+                target = indices[edge]
+                new_distance = distance + weights[edge]
+                if target not in distances and new_distance < best.get(
+                    target, float("inf")
+                ):
+                    best[target] = new_distance
+                    previous[target] = (vertex, edge)
+                    heapq.heappush(queue, (new_distance, target))
+        return None
+
+    def _link_path(
+        self, vertex: int, previous: dict[int, tuple[int, int]]
+    ) -> list[str]:
+        link_ids = []
+        while vertex in previous:
+            vertex, edge = previous[vertex]
+            link_id = int(self._port_graph.edge_ids[edge])
+            if link_id >= 0:
+                link_ids.append(link_id)
+        return [self.link_puics[link_id] for link_id in reversed(link_ids)]
+
+    def connected_components(self) -> list[list[str]]:
+        """
+        Groups the junctions in connected networks, ignoring the jumpers.
+
+        Returns:
+            The puics of the junctions of every network, the largest network first.
+        """
+        labels = np.full(len(self.node_puics), -1, dtype=np.int64)
+        label = 0
+        for node_id in range(len(self.node_puics)):
+            if labels[node_id] != -1:
+                continue
+            labels[self._node_graph.bfs(np.array([node_id]))] = label
+            label += 1
+
+        components: list[list[str]] = [[] for _ in range(label)]
+        for node_id, node_label in enumerate(labels.tolist()):
+            components[node_label].append(self.node_puics[node_id])
+        return sorted(components, key=len, reverse=True)
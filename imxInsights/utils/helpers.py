@@ -4,29 +4,77 @@ from pathlib import Path
 from typing import Any
 
 
-def hash_sha256(path: Path):
+def hash_sha256(path_or_content: Path | bytes) -> str:
     """
-    Calculate the SHA-256 hash sum of a file located at the specified path.
+    Calculate the SHA-256 hash sum of a file located at the specified path or of its content.
 
-    This function takes a `Path` object representing the path to a file and
-    calculates the SHA-256 hash sum of the file's contents. It returns the
-    hash sum as a hexadecimal string.
+    This function takes a `Path` object representing the path to a file, or the
+    already read bytes of a file, and calculates the SHA-256 hash sum of the
+    file's contents. It returns the hash sum as a hexadecimal string.
 
     Args:
-        path (Path): The path to the file for which the SHA-256 hash sum
-            should be calculated.
+        path_or_content (Path | bytes): The path to the file, or the file content, for which the
+            SHA-256 hash sum should be calculated.
 
     Returns:
         str: A hexadecimal string representing the SHA-256 hash sum of the file.
 
     Note:
-        This function reads the entire contents of the file into memory
-        to calculate the hash sum. For large files, this may consume a
-        significant amount of memory. Make sure to handle large files
-        appropriately when using this function.
+        A path is read in chunks, so hashing a large file does not load it into memory.
 
     """
-    return f"{hashlib.sha256(path.read_bytes()).hexdigest()}"
+    if isinstance(path_or_content, bytes):
+        return f"{hashlib.sha256(path_or_content).hexdigest()}"
+
+    sha256 = hashlib.sha256()
+    with path_or_content.open("rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            sha256.update(chunk)
+    return f"{sha256.hexdigest()}"
+
+
+def is_ref_key(key: str) -> bool:
+    """
+    Checks if a flattened property key is a reference, the (attribute) name ends with `Ref` or `Refs`.
+
+    Args:
+        key (str): The flattened property key, for example `@trackRef` or `PassageRefs.0`.
+
+    Returns:
+        bool: True if the key is a reference.
+    """
+    parts = key.rsplit(".", 2)
+    name = parts[-2] if len(parts) > 1 and parts[-1].isdigit() else parts[-1]
+    return name.endswith(("Ref", "Refs"))
+
+
+def hash_properties(tag: str, *dictionaries: dict[str, str]) -> str:
+    """
+    Compute a stable content hash of an object tag and its flattened properties.
+
+    ??? info
+        The items of every dictionary are sorted, so the hash does not depend on insertion order. Keys,
+        values and dictionaries are joined with ascii separator characters that do not occur in IMX content.
+
+    Args:
+        tag (str): The tag of the object.
+        *dictionaries (dict[str, str]): The flattened properties, for example properties and extension properties.
+
+    Returns:
+        str: A hexadecimal string of the 128 bit BLAKE2b hash.
+    """
+    content = "\x1d".join(
+        [
+            tag,
+            *(
+                "\x1e".join(
+                    f"{key}\x1f{value}" for key, value in sorted(dictionary.items())
+                )
+                for dictionary in dictionaries
+            ),
+        ]
+    )
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
 
 
 def hash_dict_ignor_nested(dictionary: dict) -> str:
@@ -1,11 +1,50 @@
+from collections import defaultdict
+
+import numpy as np
 import pyproj
+import shapely
 
 # from lxml import etree as ET
 from lxml.etree import _Element as Element
 from shapely import LineString, Point, Polygon
 
+GML_NAMESPACE = "{http://www.opengis.net/gml}"
+
+_COORDINATE_NOISE = str.maketrans({"(": None, ")": None, "'": None, ",": " "})
+
 
 class GmlShapleyFactory:
+    @staticmethod
+    def parse_coordinates(coordinates: str, dimension: int | None = None) -> np.ndarray:
+        """
+        Decodes a GML `coordinates` or `posList` text to a coordinate array.
+
+        ??? info
+            All values are converted by NumPy in one call instead of a float conversion per coordinate. For
+            `coordinates` text the dimension is taken from the first tuple, for `posList` text it should be given.
+
+        Args:
+            coordinates: The GML text, tuples like "x,y[,z]" separated by whitespace or a flat `posList`.
+            dimension: The number of values per coordinate, if None it is determined from the first tuple.
+
+        Returns:
+            An array of shape (number of coordinates, dimension).
+
+        Raises:
+            ValueError: If the number of values does not match the dimension.
+        """
+        if dimension is None:
+            first_tuple = coordinates.split(None, 1)[0]
+            dimension = first_tuple.count(",") + 1
+        values = np.array(
+            coordinates.translate(_COORDINATE_NOISE).split(), dtype=np.float64
+        )
+        if values.size % dimension != 0:
+            raise ValueError(  # noqa: TRY003
+                f"{values.size} values can not be split in coordinates of dimension {dimension}"
+            )
+        return values.reshape(-1, dimension)
+
     @classmethod
     def gml_point_to_shapely(cls, gml_point_coordinates: str) -> Point:
         """
@@ -18,15 +57,7 @@ class GmlShapleyFactory:
             (Shapely.Point): The Shapely Point object.
 
         """
-        coordinates = [
-            float(x)
-            for x in gml_point_coordinates.replace("(", "")
-            .replace(")", "")
-            .replace("'", "")
-            .replace(" ", "")
-            .split(",")
-        ]
-        return Point(coordinates)
+        return shapely.points(cls.parse_coordinates(gml_point_coordinates)[0])
 
     @classmethod
     def gml_linestring_to_shapely(cls, gml_linestring_coordinates: str) -> LineString:
@@ -40,12 +71,7 @@ class GmlShapleyFactory:
             (Shapely.LineString): A Shapely LineString object.
 
         """
-        return LineString(
-            [
-                tuple(map(float, x.split(",")))
-                for x in gml_linestring_coordinates.split(" ")
-            ]
-        )
+        return shapely.linestrings(cls.parse_coordinates(gml_linestring_coordinates))
 
     @classmethod
     def gml_polygon_to_shapely(cls, gml_linestring_coordinates: str) -> Polygon:
@@ -59,43 +85,108 @@ class GmlShapleyFactory:
             (Polygon): A Shapely Polygon object.
 
         """
-        return Polygon(
-            [
-                tuple(map(float, x.split(",")))
-                for x in gml_linestring_coordinates.split(" ")
-            ]
-        )
+        return shapely.polygons(cls.parse_coordinates(gml_linestring_coordinates))
 
     @classmethod
-    def shapley(cls, gml_element: Element):
-        point = gml_element.find(".//{http://www.opengis.net/gml}Point")
+    def _element_coordinates(cls, geometry_element: Element) -> np.ndarray | None:
+        """Decodes the `coordinates`, `posList` or `pos` of a GML geometry element."""
+        coordinates_element = geometry_element.find(f".//{GML_NAMESPACE}coordinates")
+        if coordinates_element is not None and coordinates_element.text is not None:
+            return cls.parse_coordinates(coordinates_element.text)
+
+        for tag in ("posList", "pos"):
+            pos_element = geometry_element.find(f".//{GML_NAMESPACE}{tag}")
+            if pos_element is not None and pos_element.text is not None:
+                dimension = pos_element.get("srsDimension") or geometry_element.get(
+                    "srsDimension", "2"
+                )
+                return cls.parse_coordinates(pos_element.text, int(dimension))
+        return None
+
+    @classmethod
+    def gml_coordinates(cls, gml_element: Element) -> tuple[str, np.ndarray]:
+        """
+        Finds the GML geometry of an element and decodes its coordinates.
+
+        Args:
+            gml_element: The element holding a GML Point, LineString or Polygon.
+
+        Returns:
+            The geometry type, "Point", "LineString" or "Polygon", and the coordinate array.
+
+        Raises:
+            NotImplementedError: If the element has no supported GML geometry.
+        """
+        point = gml_element.find(f".//{GML_NAMESPACE}Point")
         if point is not None:
-            coordinates_element = point.find(
-                ".//{http://www.opengis.net/gml}coordinates"
-            )
-            if coordinates_element is not None and coordinates_element.text is not None:
-                return cls.gml_point_to_shapely(coordinates_element.text)
+            coordinates = cls._element_coordinates(point)
+            if coordinates is not None:
+                return "Point", coordinates
 
-        linestring = gml_element.find(".//{http://www.opengis.net/gml}LineString")
+        linestring = gml_element.find(f".//{GML_NAMESPACE}LineString")
         if linestring is not None:
-            coordinates_element = linestring.find(
-                ".//{http://www.opengis.net/gml}coordinates"
-            )
-            if coordinates_element is not None and coordinates_element.text is not None:
-                return cls.gml_linestring_to_shapely(coordinates_element.text)
+            coordinates = cls._element_coordinates(linestring)
+            if coordinates is not None:
+                return "LineString", coordinates
 
-        polygon = gml_element.findall(".//{http://www.opengis.net/gml}Polygon")
+        polygon = gml_element.findall(f".//{GML_NAMESPACE}Polygon")
         if len(polygon) == 1:
-            coordinates_element = polygon[0].find(
-                ".//{http://www.opengis.net/gml}coordinates"
-            )
-            if coordinates_element is not None and coordinates_element.text is not None:
-                return cls.gml_polygon_to_shapely(coordinates_element.text)
+            coordinates = cls._element_coordinates(polygon[0])
+            if coordinates is not None:
+                return "Polygon", coordinates
 
         raise NotImplementedError(
             f"gml shapley generation for {gml_element.tag} not supported"
         )
 
+    @classmethod
+    def shapley(cls, gml_element: Element):
+        geometry_type, coordinates = cls.gml_coordinates(gml_element)
+        return cls.shapley_bulk([(geometry_type, coordinates)])[0]
+
+    @staticmethod
+    def shapley_bulk(
+        gml_coordinates: list[tuple[str, np.ndarray]],
+    ) -> list[Point | LineString | Polygon]:
+        """
+        Creates shapely geometries from decoded GML coordinates in bulk.
+
+        ??? info
+            The coordinates are grouped by geometry type and dimension, every group is created by a single call
+            to the shapely 2 array constructors instead of one constructor call per geometry.
+
+        Args:
+            gml_coordinates: The geometry type and coordinate array, as returned by `gml_coordinates`.
+
+        Returns:
+            The shapely geometries in the same order as the input.
+        """
+        result: list = [None] * len(gml_coordinates)
+        groups: dict[tuple[str, int], list[int]] = defaultdict(list)
+        for position, (geometry_type, coordinates) in enumerate(gml_coordinates):
+            groups[(geometry_type, coordinates.shape[1])].append(position)
+
+        for (geometry_type, _), positions in groups.items():
+            arrays = [gml_coordinates[position][1] for position in positions]
+            if geometry_type == "Point":
+                geometries = shapely.points(
+                    np.concatenate([item[:1] for item in arrays])
+                )
+            else:
+                indices = np.repeat(
+                    np.arange(len(arrays)), [len(item) for item in arrays]
+                )
+                coordinates = np.concatenate(arrays)
+                if geometry_type == "LineString":
+                    geometries = shapely.linestrings(coordinates, indices=indices)
+                else:
+                    geometries = shapely.polygons(
+                        shapely.linearrings(coordinates, indices=indices)
+                    )
+            for position, geometry in zip(positions, geometries):
+                result[position] = geometry
+        return result
+
 
 class ShapelyTransform:
     """A utility class to transform between RD and WGS84 coordinate systems."""
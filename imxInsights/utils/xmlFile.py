@@ -5,6 +5,7 @@ from lxml import etree
 from lxml.etree import _ElementTree as ElementTree
 
 from imxInsights.utils.helpers import hash_sha256
+from imxInsights.utils.xml_helpers import sniff_root_element
 
 
 @dataclass(frozen=True)
@@ -19,6 +20,9 @@ class XmlFile:
     Args:
         path (Path): The path to the XML file.
         root (ET.ElementTree, optional): An optional pre-parsed XML root element. Default is None.
+        file_hash (str, optional): An optional pre-calculated SHA-256 hash of the file. Default is None.
+        parse (bool, optional): If False the file is only hashed and its root tag is sniffed, used for
+            streaming large files. Default is True.
 
     Attributes:
         path (Path): The path to the XML file.
@@ -37,24 +41,61 @@ class XmlFile:
 
     path: Path
     root: ElementTree | None = field(kw_only=True, hash=False, repr=False, default=None)
-    file_hash: str | None = field(init=False, hash=False, default=None)
+    file_hash: str | None = field(kw_only=True, hash=False, default=None)
+    parse: bool = field(kw_only=True, hash=False, repr=False, default=True)
     tag: str | None = field(init=False, hash=False, default=None)
 
     def __post_init__(self) -> None:
         if self.root is not None:
+            object.__setattr__(self, "tag", self.root.getroot().tag)
             return
 
         if not self.exists:
             raise ValueError(f"Invalid path {self.path}")  # noqa: TRY003
 
-        object.__setattr__(self, "file_hash", hash_sha256(self.path))
+        if not self.parse:
+            if self.file_hash is None:
+                object.__setattr__(self, "file_hash", hash_sha256(self.path))
+            tag, _ = sniff_root_element(self.path)
+            object.__setattr__(self, "tag", tag)
+            return
 
-        parser = etree.XMLParser(remove_comments=True)
-        root = etree.parse(self.path, parser)
+        # read once, the same bytes are used for hashing and parsing
+        content = self.path.read_bytes()
+        if self.file_hash is None:
+            object.__setattr__(self, "file_hash", hash_sha256(content))
+
+        root = self._parse(content, self.path)
         object.__setattr__(self, "tag", root.getroot().tag)
 
         super().__setattr__("root", root)
 
+    @classmethod
+    def from_bytes(
+        cls, path: Path, content: bytes, file_hash: str | None = None
+    ) -> "XmlFile":
+        """
+        Creates a XmlFile from already read content, for example a member of a zip archive.
+
+        Args:
+            path: The (virtual) path of the XML file.
+            content: The content of the XML file.
+            file_hash: An optional pre-calculated SHA-256 hash of the content.
+
+        Returns:
+            The parsed XmlFile.
+        """
+        return cls(
+            path,
+            root=cls._parse(content, path),
+            file_hash=file_hash if file_hash is not None else hash_sha256(content),
+        )
+
+    @staticmethod
+    def _parse(content: bytes, path: Path) -> ElementTree:
+        parser = etree.XMLParser(remove_comments=True)
+        return etree.fromstring(content, parser, base_url=str(path)).getroottree()
+
     @property
     def exists(self) -> bool:
         return self.path.exists() and self.path.is_file()
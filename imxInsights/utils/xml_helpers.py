@@ -1,3 +1,7 @@
+from io import BytesIO
+from pathlib import Path
+
+from lxml import etree
 from lxml.etree import _Element as Element
 
 
@@ -78,3 +82,28 @@ def find_parent_with_tag(element: Element, tags: list[str]) -> Element | None:
         if current_element is not None and current_element.tag in tags:
             return current_element
     return None
+
+
+def sniff_root_element(source: Path | bytes) -> tuple[str, dict[str, str]]:
+    """
+    Reads the tag and attributes of the root element without parsing the whole document.
+
+    ??? info
+        This function uses `iterparse` and stops at the first start event, so only the first chunk
+        of the file is read. This makes it cheap to determine the type and version of large xml files.
+
+    Args:
+        source: The path of the xml file or its content.
+
+    Returns:
+        The tag and the attributes of the root element.
+
+    Raises:
+        ValueError: If the file has no root element.
+    """
+    with (
+        BytesIO(source) if isinstance(source, bytes) else source.open("rb") as xml_file
+    ):
+        for _, element in etree.iterparse(xml_file, events=("start",)):
+            return str(element.tag), dict(element.attrib)
+    raise ValueError("No root element found")  # noqa: TRY003
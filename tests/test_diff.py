@@ -1,4 +1,17 @@
+import csv
+import io
+import json
+
+import numpy as np
+import pytest
+
+from imxInsights import ImxContainer, ImxMultiRepo
+from imxInsights.compair.compairColumnar import compair_codes
+from imxInsights.compair.compairField import compair_values
+from imxInsights.compair.compairMultiRepo import ImxCompareMultiRepo
 from imxInsights.compair.compairObject import ImxComparedObject
+from imxInsights.compair.compairStatusEnum import CompairStatus
+from imxInsights.compair.compairWriters import write_csv, write_ndjson
 
 test_data_container_order_list = (
     "container-1",
@@ -85,3 +98,241 @@ test_data_fields = {
 tester = ImxComparedObject(test_data_fields, test_data_container_order_dict)
 # tester_df = tester.as_pandas_df()
 print()
+
+
+def _field_values(compared_object: ImxComparedObject) -> list:
+    return [
+        (
+            field.name,
+            [(item.container_id, item.value, item.status) for item in field.values],
+        )
+        for field in compared_object.fields
+    ]
+
+
+@pytest.mark.slow
+def test_not_changed_fast_path(
+    imx_v1200_dir_instance: ImxContainer, imx_v1200_zip_instance: ImxContainer
+):
+    multi_repo = ImxMultiRepo([imx_v1200_dir_instance, imx_v1200_zip_instance])
+    compair = multi_repo.compair()
+    not_changed = [
+        puic for puic, value in compair.values.items() if value._data is None
+    ]
+    assert len(not_changed) == 301, "not changed objects should use the fast path"
+
+    for puic in not_changed:
+        imx_obj = multi_repo.tree.tree_dict[puic]
+        expected = ImxComparedObject(
+            compair._get_diff_data(imx_obj, multi_repo.container_order),
+            multi_repo.container_order,
+        )
+        value = compair.values[puic]
+        assert value.global_status == expected.global_status, "status should match"
+        assert (
+            value.container_status == expected.container_status
+        ), "container status should match"
+        assert _field_values(value) == _field_values(
+            expected
+        ), "lazy fields should match"
+
+
+@pytest.mark.slow
+def test_fingerprint_diff(
+    imx_v1200_dir_instance: ImxContainer, imx_v1200_zip_instance: ImxContainer
+):
+    assert (
+        imx_v1200_dir_instance.diff_fingerprint(imx_v1200_dir_instance) == []
+    ), "container should equal itself"
+
+    multi_repo = ImxMultiRepo([imx_v1200_dir_instance, imx_v1200_zip_instance])
+    differences = multi_repo.diff_containers(*multi_repo.container_order)
+    changed = [
+        puic
+        for puic, value in multi_repo.compair().values.items()
+        if value.global_status != CompairStatus.NOT_CHANGED
+    ]
+    assert [path[-1] for path in differences] == changed, "should match the compair"
+    assert differences[0][:2] == ("SignalingDesign", "Signal"), "path is off"
+    assert (
+        imx_v1200_dir_instance.diff_fingerprint(imx_v1200_zip_instance) == differences
+    ), "should match the multi repo diff"
+
+
+def test_compared_object_fields_are_lazy():
+    compared_object = ImxComparedObject(
+        test_data_fields, test_data_container_order_dict
+    )
+    assert compared_object._fields is None, "fields should not be created on init"
+    assert compared_object.global_status == CompairStatus.CHANGED, "should be changed"
+    assert [status for _, _, status in compared_object.container_status] == [
+        CompairStatus.NOT_CHANGED,
+        CompairStatus.CHANGED,
+        CompairStatus.CHANGED,
+        CompairStatus.CHANGED,
+        CompairStatus.CHANGED,
+    ], "container status is off"
+    assert [field.name for field in compared_object.fields] == list(
+        test_data_fields.keys()
+    ), "fields should be created on access"
+
+
+def test_compair_codes_match_compair_values():
+    values = [[value for _, value in field] for field in test_data_fields.values()]
+    uniques: dict[str, int] = {}
+    codes = np.array(
+        [
+            [0 if value is None else uniques.setdefault(value, len(uniques) + 1)]
+            for field in values
+            for value in field
+        ]
+    ).reshape(len(values), -1)
+    statuses = [
+        [list(CompairStatus)[code] for code in row] for row in compair_codes(codes)
+    ]
+    assert statuses == [
+        compair_values(field) for field in values
+    ], "vectorized statuses should match"
+
+
+@pytest.mark.slow
+def test_columnar_compair(
+    imx_v1200_dir_instance: ImxContainer, imx_v1200_zip_instance: ImxContainer
+):
+    multi_repo = ImxMultiRepo(
+        [imx_v1200_dir_instance, imx_v1200_zip_instance, imx_v1200_dir_instance]
+    )
+    compair = multi_repo.compair()
+    columnar = multi_repo.compair(columnar=True)
+    assert list(columnar.values) == list(compair.values), "puics should match"
+    for puic, value in compair.values.items():
+        columnar_value = columnar.values[puic]
+        assert (
+            columnar_value.global_status == value.global_status
+        ), "status should match"
+        assert (
+            columnar_value.container_status == value.container_status
+        ), "container status should match"
+        assert _field_values(columnar_value) == _field_values(
+            value
+        ), "fields should match"
+
+    status_frame = columnar.columnar.get_status_frame()
+    assert list(
+        status_frame.index[status_frame["global_status"] == CompairStatus.CHANGED]
+    ) == ["65ccaade-e1c7-43e8-975b-e377951ba621"], "changed objects is off"
+
+
+@pytest.mark.slow
+def test_sharded_compair(
+    imx_v1200_dir_instance: ImxContainer, imx_v1200_zip_instance: ImxContainer
+):
+    multi_repo = ImxMultiRepo(
+        [imx_v1200_dir_instance, imx_v1200_zip_instance, imx_v1200_dir_instance]
+    )
+    # sharded first, the workers flatten the objects that are not flattened yet
+    sharded = multi_repo.compair(max_workers=2)
+    compair = ImxCompareMultiRepo.from_multi_repo(
+        multi_repo.tree, multi_repo.container_order
+    )
+    assert list(sharded.values) == list(compair.values), "puics should match"
+    for puic, value in compair.values.items():
+        sharded_value = sharded.values[puic]
+        assert sharded_value.global_status == value.global_status, "status should match"
+        assert (
+            sharded_value.container_status == value.container_status
+        ), "container status should match"
+        assert _field_values(sharded_value) == _field_values(
+            value
+        ), "fields should match"
+
+    with pytest.raises(ValueError):
+        multi_repo.compair(max_workers=0)
+    with pytest.raises(ValueError):
+        multi_repo.compair(columnar=True, max_workers=2)
+
+
+@pytest.mark.slow
+def test_iter_compair_and_writers(
+    imx_v1200_dir_instance: ImxContainer, imx_v1200_zip_instance: ImxContainer
+):
+    multi_repo = ImxMultiRepo([imx_v1200_dir_instance, imx_v1200_zip_instance])
+    compair = multi_repo.compair()
+    assert [item.puic for item in multi_repo.iter_compair()] == list(
+        compair.values
+    ), "puics should match"
+    changed = list(multi_repo.iter_compair(global_status=CompairStatus.CHANGED))
+    assert [item.puic for item in changed] == [
+        "65ccaade-e1c7-43e8-975b-e377951ba621"
+    ], "changed objects is off"
+    assert changed[0].tag == "Signal", "tag is off"
+    assert changed[0].path == "Signal", "path is off"
+    assert not list(
+        multi_repo.iter_compair(
+            global_status=CompairStatus.CHANGED, object_types=["Track"]
+        )
+    ), "type filter is off"
+
+    ndjson_file, csv_file = io.StringIO(), io.StringIO()
+    ndjson_count = write_ndjson(multi_repo.iter_compair(), ndjson_file)
+    csv_count = write_csv(multi_repo.iter_compair(), csv_file)
+    rows = [json.loads(line) for line in ndjson_file.getvalue().splitlines()]
+    assert ndjson_count == csv_count == len(rows) > 0, "row count is off"
+    assert list(csv.DictReader(io.StringIO(csv_file.getvalue()))) == [
+        {key: str(value) for key, value in row.items()} for row in rows
+    ], "csv and ndjson rows should match"
+    expected = [
+        (field.name, value.container_id, value.value)
+        for field in compair.values["65ccaade-e1c7-43e8-975b-e377951ba621"].fields
+        for value in field.values
+        if value.status == CompairStatus.CHANGED
+    ]
+    assert [
+        (row["field"], row["container"], row["value"])
+        for row in rows
+        if row["status"] == "changed"
+    ] == expected, "changed rows are off"
+
+
+@pytest.mark.slow
+def test_compair_is_extended_when_a_container_is_added(
+    imx_v1200_dir_instance: ImxContainer,
+    imx_v1200_zip_instance: ImxContainer,
+    imx_v1200_test_dir_file_path: str,
+):
+    multi_repo = ImxMultiRepo([imx_v1200_dir_instance, imx_v1200_zip_instance])
+    compair = multi_repo.compair()
+    assert multi_repo.compair() is compair, "compair should be kept"
+
+    added = ImxContainer(imx_v1200_test_dir_file_path)
+
+    def _from_multi_repo(*args, **kwargs):
+        raise AssertionError("compair should be extended, not created")
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(
+            ImxCompareMultiRepo, "from_multi_repo", classmethod(_from_multi_repo)
+        )
+        multi_repo.add_container(added)
+        extended = multi_repo.compair()
+    assert extended is not compair, "compair should be extended"
+    assert len(compair.container_order) == 2, "kept compair should not change"
+    expected = ImxCompareMultiRepo.from_multi_repo(
+        multi_repo.tree, multi_repo.container_order
+    )
+    assert list(extended.values) == list(expected.values), "puics should match"
+    for puic, value in expected.values.items():
+        extended_value = extended.values[puic]
+        assert (
+            extended_value.global_status == value.global_status
+        ), "status should match"
+        assert (
+            extended_value.container_status == value.container_status
+        ), "container status should match"
+        assert _field_values(extended_value) == _field_values(
+            value
+        ), "fields should match"
+
+    multi_repo.remove_container(imx_v1200_zip_instance)
+    assert multi_repo.compair() is not extended, "compair should be discarded"
+    assert multi_repo.compair().container_order == multi_repo.container_order
@@ -1,6 +1,11 @@
+import copy
+from pathlib import Path
+
 import pytest
+from lxml import etree
 
-from imxInsights import ImxMultiRepo, ImxSingleFile
+from imxInsights import ImxContainer, ImxMultiRepo, ImxSingleFile
+from imxInsights.compair.compairStatusEnum import CompairStatus
 
 
 @pytest.mark.slow
@@ -88,6 +93,132 @@ def test_imx_parse_project_v500(imx_v500_project_instance):
     assert imx.new_situation is None, "does not have a new situation"
 
 
+@pytest.mark.slow
+def test_imx_parse_project_v500_streaming(
+    imx_v500_project_instance, imx_v500_project_test_file_path
+):
+    imx = imx_v500_project_instance
+    imx_streamed = ImxSingleFile(imx_v500_project_test_file_path, streaming=True)
+    assert imx_streamed.file.root is None, "document should not be kept"
+    assert imx_streamed.file.file_hash == imx.file.file_hash, "file hash should match"
+    assert imx_streamed.new_situation is None, "does not have a new situation"
+
+    situation = imx.initial_situation
+    streamed_situation = imx_streamed.initial_situation
+    assert set(streamed_situation.get_keys()) == set(
+        situation.get_keys()
+    ), "objects should match"
+    assert len(streamed_situation.get_build_exceptions()) == 0, "no exceptions"
+    for item in situation.get_all():
+        streamed_item = streamed_situation.find(item.puic)
+        assert streamed_item.element is None, "object should be detached"
+        assert streamed_item.path == item.path, "path should match"
+        assert streamed_item.properties == item.properties, "properties should match"
+        assert (
+            streamed_item.extension_properties == item.extension_properties
+        ), "extension properties should match"
+        assert [child.puic for child in streamed_item.direct_children] == [
+            child.puic for child in item.direct_children
+        ], "children should match"
+        assert streamed_item.geometry.equals(item.geometry), "geometry should match"
+
+
+_EXTENDED_PUIC = "4d1ec911-6c22-4b40-8eb5-68a180f1c59f"
+
+
+def _write_project_with_new_situation(source: str, target: Path) -> None:
+    namespace = "{http://www.prorail.nl/IMSpoor}"
+    tree = etree.parse(source)
+    initial_situation = tree.find(f".//{namespace}InitialSituation")
+    new_situation = copy.deepcopy(initial_situation)
+    new_situation.tag = f"{namespace}NewSituation"
+    initial_situation.addnext(new_situation)
+
+    signals = new_situation.findall(f".//{namespace}Signal")
+    track = new_situation.find(f".//{namespace}Track")
+    signals[0].set("name", "updated")
+    track.set("name", "updated")
+    signals[1].getparent().remove(signals[1])
+    # edits that are not in the situation changes
+    signals[2].set("name", "unlisted")
+    signals[3].getparent().remove(signals[3])
+    # extension objects have no puic, they are not in the situation changes
+    new_situation.find(
+        f".//{namespace}MicroLink[@implementationObjectRef='{_EXTENDED_PUIC}']"
+        f"/{namespace}FromMicroNode"
+    ).set("portIndex", "2")
+    changes = tree.find(f".//{namespace}SituationChanges")
+    for tag, puics in [
+        ("Updated", [signals[0].get("puic"), track.get("puic")]),
+        ("Deleted", [signals[1].get("puic")]),
+    ]:
+        etree.SubElement(changes, f"{namespace}{tag}").text = " ".join(puics)
+    tree.write(target, xml_declaration=True, encoding="UTF-8")
+
+
+@pytest.mark.slow
+def test_imx_parse_project_v500_share_unchanged(
+    imx_v500_project_test_file_path, tmp_path
+):
+    file_path = tmp_path / "new_situation.xml"
+    _write_project_with_new_situation(imx_v500_project_test_file_path, file_path)
+    imx = ImxSingleFile(file_path)
+    imx_shared = ImxSingleFile(file_path, share_unchanged=True)
+    assert len(imx_shared.situation_changes.updated) == 2, "changes are off"
+
+    situation = imx.new_situation
+    shared_situation = imx_shared.new_situation
+    assert set(shared_situation.get_keys()) == set(
+        situation.get_keys()
+    ), "objects should match"
+    for item in situation.get_all():
+        shared_item = shared_situation.find(item.puic)
+        assert shared_item.properties == item.properties, "properties should match"
+        assert (
+            shared_item.extension_properties == item.extension_properties
+        ), "extension properties should match"
+        assert [child.puic for child in shared_item.direct_children] == [
+            child.puic for child in item.direct_children
+        ], "children should match"
+        assert shared_item.geometry.equals(item.geometry), "geometry should match"
+    shared = [
+        item
+        for item in shared_situation.get_all()
+        if item is imx_shared.initial_situation.find(item.puic)
+    ]
+    assert 0 < len(shared) < len(list(shared_situation.get_all())), "should share"
+    unlisted = [
+        item
+        for item in shared_situation.get_by_types(["Signal"])
+        if item.name == "unlisted"
+    ]
+    assert len(unlisted) == 1, "edit not in the situation changes should be build"
+    assert unlisted[0] not in shared, "edited object should not be shared"
+    assert (
+        shared_situation.get_container_id(shared[0]) == shared_situation.container_id
+    ), "container id of shared object is off"
+    assert (
+        shared_situation.get_fingerprint().digest
+        == situation.get_fingerprint().digest
+    ), "fingerprint should match"
+
+    compair = imx_shared.compair()
+    expected = ImxMultiRepo([imx.initial_situation, imx.new_situation]).compair()
+    changed = {
+        puic
+        for puic, value in compair.values.items()
+        if value.global_status == CompairStatus.CHANGED
+    }
+    assert _EXTENDED_PUIC in changed, "extended object should be changed"
+    assert changed == {
+        puic
+        for puic, value in expected.values.items()
+        if value.global_status == CompairStatus.CHANGED
+    }, "changed objects should match"
+    with pytest.raises(ValueError):
+        ImxMultiRepo([imx_shared.initial_situation, imx_shared.new_situation])
+
+
 @pytest.mark.slow
 def test_imx_parse_v1200_zip(imx_v1200_zip_instance):
     imx = imx_v1200_zip_instance
@@ -107,3 +238,12 @@ def test_imx_parse_v1200_dir(imx_v1200_dir_instance):
     assert len(list(imx.get_all())) == 302, "objects in tree should is off"
     # dir has one more extension course of mismatch on file hash for observations
     assert len(imx.get_build_exceptions()) == 7, "should have x exceptions"
+
+
+@pytest.mark.slow
+def test_imx_parse_v1200_zip_in_place(imx_v1200_test_zip_file_path):
+    imx = ImxContainer(imx_v1200_test_zip_file_path, max_workers=4)
+    assert imx.path == Path(imx_v1200_test_zip_file_path), "should not be extracted"
+    assert imx.files.signaling_design.path.parent == imx.path, "member of zip"
+    assert len(list(imx.get_all())) == 302, "objects in tree should is off"
+    assert len(imx.get_build_exceptions()) == 6, "should have x exceptions"
@@ -0,0 +1,269 @@
+import pytest
+from shapely import Point
+
+from imxInsights import ImxContainer, ImxMultiRepo, ImxSingleFile
+from imxInsights.exceptions.imxExceptions import ImxRefNotPresent
+from imxInsights.file.containerizedImx import imxContainerFiles
+from imxInsights.repo.tree.imxObjectTree import ObjectTree
+
+
+@pytest.mark.slow
+def test_deferred_build_equals_direct_build(imx_v1200_dir_instance: ImxContainer):
+    imx = imx_v1200_dir_instance
+    imx_files = [
+        imx_file
+        for imx_file in [
+            imx.files.signaling_design,
+            imx.files.furniture,
+            imx.files.train_control,
+            imx.files.installation_design,
+            imx.files.network_configuration,
+            imx.files.schema_layout,
+            imx.files.observations,
+        ]
+        if imx_file is not None
+    ]
+
+    direct_tree = ObjectTree()
+    for imx_file in imx_files:
+        direct_tree.add_imx_file(imx_file, imx.container_id)
+
+    deferred_tree = ObjectTree()
+    for imx_file in imx_files:
+        deferred_tree.add_imx_file(imx_file, imx.container_id, build=False)
+    assert all(
+        len(item.direct_children) == 0 for item in deferred_tree.get_all()
+    ), "builders should not run before build"
+    deferred_tree.build()
+
+    assert deferred_tree.keys == direct_tree.keys, "trees should hold same objects"
+    assert (
+        deferred_tree.build_extensions.exceptions.keys()
+        == direct_tree.build_extensions.exceptions.keys()
+    ), "trees should have same exceptions"
+    for item in deferred_tree.get_all():
+        other = direct_tree.find(item.puic)
+        assert other is not None
+        assert [child.puic for child in item.direct_children] == [
+            child.puic for child in other.direct_children
+        ], "children should match"
+        assert item.geometry.equals(other.geometry), "geometry should match"
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_container_parallel_load(
+    imx_v1200_test_dir_file_path: str, use_processes: bool, monkeypatch
+):
+    imx = ImxContainer(imx_v1200_test_dir_file_path)
+
+    contents = []
+
+    def _load_container_file(file_info, container_id, content=None):
+        contents.append(content)
+        return load_container_file(file_info, container_id, content)
+
+    load_container_file = imxContainerFiles._load_container_file
+    monkeypatch.setattr(
+        imxContainerFiles, "_load_container_file", _load_container_file
+    )
+    imx_parallel = ImxContainer(
+        imx_v1200_test_dir_file_path, max_workers=4, use_processes=use_processes
+    )
+    assert contents, "files should be loaded"
+    assert all(
+        (content is not None) == use_processes for content in contents
+    ), "files read by the process pool should not be read again"
+    assert (
+        imx_parallel.files.signaling_design.file_hash
+        == imx.files.signaling_design.file_hash
+    ), "file hash should match"
+    assert set(imx_parallel.get_keys()) == set(imx.get_keys()), "objects should match"
+    assert len(imx_parallel.get_build_exceptions()) == len(
+        imx.get_build_exceptions()
+    ), "exceptions should match"
+
+
+@pytest.mark.slow
+def test_children_are_direct_children(imx_v500_project_instance: ImxSingleFile):
+    situation = imx_v500_project_instance.initial_situation
+    for item in situation.get_all():
+        assert all(
+            child.parent is item for child in item.direct_children
+        ), "children should be direct children"
+        assert [child.puic for child in item.get_descendants()] == [
+            element.get("puic") for element in item.element.xpath(".//*[@puic]")
+        ], "descendants should match the xml"
+
+    item = next(item for item in situation.get_all() if item.direct_children)
+    with pytest.deprecated_call():
+        children = item.children
+    assert children == item.get_descendants(), "children should be all descendants"
+
+
+@pytest.mark.slow
+def test_type_and_path_index(imx_v1200_dir_instance: ImxContainer):
+    imx = imx_v1200_dir_instance
+    items = [value[0] for value in imx._tree.tree_dict.values()]
+    assert set(imx.get_types()) == {item.tag for item in items}, "types should match"
+    assert set(imx.get_all_paths()) == {
+        item.path for item in items
+    }, "paths should match"
+    for path in imx.get_all_paths():
+        assert imx.get_by_paths([path]) == [
+            item for item in items if item.path == path
+        ], "objects by path should match"
+
+    multi_repo = ImxMultiRepo([imx])
+    multi_repo.add_container(imx)
+    signals = multi_repo.tree.get_by_types(["Signal"])
+    assert [item.puic for item in signals] == [
+        item.puic for item in imx.get_by_types(["Signal"])
+    ], "objects by type should match"
+    for container in list(multi_repo.containers):
+        multi_repo.remove_container(container)
+    assert len(multi_repo.tree.keys) == 0, "tree should be empty"
+    assert multi_repo.tree.get_all_types() == [], "type index should be empty"
+    assert multi_repo.tree.get_all_paths() == [], "path index should be empty"
+
+
+@pytest.mark.slow
+def test_object_is_slotted(imx_v500_project_instance: ImxSingleFile):
+    items = list(imx_v500_project_instance.initial_situation.get_all())
+    assert not hasattr(items[0], "__dict__"), "object should be slotted"
+    paths = {}
+    for item in items:
+        assert paths.setdefault(item.path, item.path) is item.path, "path is interned"
+
+
+@pytest.mark.slow
+def test_properties_are_lazy(imx_v1200_test_dir_file_path: str):
+    imx = ImxContainer(imx_v1200_test_dir_file_path)
+    signal = imx.get_by_types(["Signal"])[0]
+    assert signal._properties is None, "properties should not be flattened on load"
+    assert signal.properties["@puic"] == signal.puic, "properties on first access"
+    assert signal.properties is signal.properties, "properties should be cached"
+
+    extended = next(item for item in imx.get_all() if item.imx_extensions)
+    extension_properties = extended.extension_properties
+    assert extended.extension_properties is extension_properties, "should be cached"
+    extended.extend_imx_object(extended.imx_extensions[0])
+    assert (
+        extended.extension_properties != extension_properties
+    ), "extension properties should be invalidated"
+
+
+@pytest.mark.slow
+def test_geographic_location_is_cached(imx_v1200_test_dir_file_path: str):
+    imx = ImxContainer(imx_v1200_test_dir_file_path)
+    signal = imx.get_by_types(["Signal"])[0]
+    assert signal.geographic_location is signal.geographic_location, "cached"
+
+    imx_parsed = ImxContainer(imx_v1200_test_dir_file_path, parse_geometries=True)
+    assert all(
+        item._geographic_location_parsed for item in imx_parsed.get_all()
+    ), "geometries should be parsed during build"
+    assert imx_parsed.find(signal.puic).geographic_location.shapely.equals(
+        signal.geographic_location.shapely
+    ), "geometry should match"
+
+
+@pytest.mark.slow
+def test_ref_index(imx_v500_project_instance: ImxSingleFile):
+    situation = imx_v500_project_instance.initial_situation
+    rail_connection = situation.get_by_types(["RailConnection"])[0]
+    track_puic = rail_connection.properties["@trackRef"]
+    assert situation.get_refs(rail_connection)["@trackRef"] == (
+        track_puic,
+    ), "forward lookup should match the property"
+    assert (
+        rail_connection.puic,
+        "@trackRef",
+    ) in situation.get_referenced_by(track_puic), "reverse lookup should match"
+
+    dangling = situation.get_dangling_refs()
+    assert len(dangling) == 37, "dangling references is off"
+    assert (
+        len(situation.get_build_exceptions()) == 0
+    ), "dangling references should not be build exceptions by default"
+
+
+@pytest.mark.slow
+def test_dangling_refs_are_build_exceptions(
+    imx_v500_project_test_file_path: str, imx_v1200_test_dir_file_path: str
+):
+    situation = ImxSingleFile(
+        imx_v500_project_test_file_path, check_refs=True
+    ).initial_situation
+    dangling = situation.get_dangling_refs()
+    exceptions = situation.get_build_exceptions()
+    assert {source for source, _, _ in dangling} == set(
+        exceptions
+    ), "dangling references should be build exceptions"
+    assert all(
+        isinstance(item, ImxRefNotPresent)
+        for items in exceptions.values()
+        for item in items
+    ), "exceptions should be references not present"
+
+    imx = ImxContainer(imx_v1200_test_dir_file_path, check_refs=True)
+    extension_refs = [
+        (source, key, target)
+        for source, key, target in imx.get_dangling_refs()
+        if key.startswith("extension.MicroNode")
+    ]
+    assert extension_refs, "extension references should be checked"
+    source, key, target = extension_refs[0]
+    assert any(
+        key in item.msg and target in item.msg
+        for item in imx.get_build_exceptions()[source]
+    ), "extension reference should be a build exception"
+
+
+@pytest.mark.slow
+def test_rail_connections_are_oriented(imx_v500_project_instance: ImxSingleFile):
+    situation = imx_v500_project_instance.initial_situation
+    rail_connections = situation.get_by_types(["RailConnection"])
+    assert all(
+        not item.geometry.is_empty for item in rail_connections
+    ), "all rail connections should have a geometry"
+    for item in rail_connections:
+        start = Point(item.geometry.coords[0])
+        from_junction = situation.find(
+            item.extension_properties["extension.MicroLink.FromMicroNode.@nodeRef"]
+        )
+        to_junction = situation.find(
+            item.extension_properties["extension.MicroLink.ToMicroNode.@nodeRef"]
+        )
+        assert start.distance(from_junction.geographic_location.shapely) <= (
+            start.distance(to_junction.geographic_location.shapely)
+        ), "geometry should start at the FromMicroNode"
+
+
+@pytest.mark.slow
+def test_multi_repo_shares_objects(
+    imx_v1200_dir_instance: ImxContainer, imx_v1200_zip_instance: ImxContainer
+):
+    multi_repo = ImxMultiRepo([imx_v1200_dir_instance])
+    signal = imx_v1200_dir_instance.get_by_types(["Signal"])[0]
+    assert multi_repo.tree.tree_dict[signal.puic] == [
+        signal
+    ], "objects should not be copied"
+
+    multi_repo.add_container(imx_v1200_zip_instance)
+    multi_repo.add_container(imx_v1200_dir_instance)
+    assert multi_repo.container_order == (
+        imx_v1200_dir_instance.container_id,
+        imx_v1200_zip_instance.container_id,
+        imx_v1200_dir_instance.container_id,
+    ), "container order should follow the containers"
+
+    multi_repo.remove_container(imx_v1200_dir_instance)
+    assert multi_repo.container_order == (
+        imx_v1200_zip_instance.container_id,
+        imx_v1200_dir_instance.container_id,
+    ), "container order should follow the containers"
+    assert [item.container_id for item in multi_repo.tree.tree_dict[signal.puic]] == [
+        imx_v1200_zip_instance.container_id,
+        imx_v1200_dir_instance.container_id,
+    ], "one occurrence should be removed"
@@ -0,0 +1,64 @@
+import pytest
+from lxml import etree
+from shapely import Point
+
+from imxInsights.domain.imxGeographicLocation import ImxGeographicLocation
+from imxInsights.utils.shapley_helpers import GmlShapleyFactory
+
+
+def test_parse_coordinates():
+    coordinates = GmlShapleyFactory.parse_coordinates("1.5,2 3,4.25")
+    assert coordinates.tolist() == [[1.5, 2.0], [3.0, 4.25]], "2d coordinates"
+    coordinates = GmlShapleyFactory.parse_coordinates("1,2,3\n 4,5,6")
+    assert coordinates.shape == (2, 3), "3d coordinates"
+    coordinates = GmlShapleyFactory.parse_coordinates("1 2 3 4 5 6", dimension=3)
+    assert coordinates.tolist() == [[1, 2, 3], [4, 5, 6]], "pos list coordinates"
+
+
+def test_shapley_bulk():
+    gml = """
+    <root xmlns:gml="http://www.opengis.net/gml">
+        <a><gml:Point><gml:coordinates>1,2</gml:coordinates></gml:Point></a>
+        <b><gml:LineString><gml:coordinates>0,0 1,1 2,0</gml:coordinates></gml:LineString></b>
+        <c><gml:LineString srsDimension="3"><gml:posList>0 0 1 1 1 2</gml:posList></gml:LineString></c>
+        <d><gml:Polygon><gml:coordinates>0,0 1,0 1,1 0,0</gml:coordinates></gml:Polygon></d>
+    </root>
+    """
+    elements = list(etree.fromstring(gml))
+    geometries = GmlShapleyFactory.shapley_bulk(
+        [GmlShapleyFactory.gml_coordinates(element) for element in elements]
+    )
+    assert [geometry.geom_type for geometry in geometries] == [
+        "Point",
+        "LineString",
+        "LineString",
+        "Polygon",
+    ], "geometry types should match input order"
+    assert geometries[2].has_z, "pos list should keep the z value"
+    for element, geometry in zip(elements, geometries):
+        assert GmlShapleyFactory.shapley(element).equals(geometry), "bulk equals single"
+
+
+def test_from_elements_skips_unsupported_geometry():
+    gml = """
+    <root xmlns="http://www.prorail.nl/IMSpoor" xmlns:gml="http://www.opengis.net/gml">
+        <a><GeographicLocation><gml:Point>
+            <gml:coordinates>1,2</gml:coordinates>
+        </gml:Point></GeographicLocation></a>
+        <b><GeographicLocation><gml:MultiPoint><gml:pointMember><gml:Point>
+        </gml:Point></gml:pointMember></gml:MultiPoint></GeographicLocation></b>
+        <c><GeographicLocation><gml:LineString>
+            <gml:coordinates>0,0 1,1</gml:coordinates>
+        </gml:LineString></GeographicLocation></c>
+        <d />
+    </root>
+    """
+    elements = list(etree.fromstring(gml))
+    with pytest.raises(NotImplementedError):
+        ImxGeographicLocation.from_element(elements[1])
+
+    locations = ImxGeographicLocation.from_elements(elements)
+    assert locations[0].shapely.equals(Point(1, 2)), "point should be parsed"
+    assert locations[1] is None, "unsupported geometry should not fail the batch"
+    assert locations[2].shapely.geom_type == "LineString", "line should be parsed"
+    assert locations[3] is None, "no geographic location"
@@ -0,0 +1,86 @@
+import pytest
+
+from imxInsights import ImxContainer, ImxMultiRepo, ImxSingleFile
+from imxInsights.domain.imxEnums import ImxAreaEnum
+from imxInsights.repo.tree.spatialIndex import object_geometry
+
+
+@pytest.mark.slow
+def test_spatial_queries(imx_v1200_dir_instance: ImxContainer):
+    imx = imx_v1200_dir_instance
+    with_geometry = [
+        item for item in imx.get_all() if object_geometry(item) is not None
+    ]
+    point = object_geometry(with_geometry[0]).centroid
+
+    nearest = imx.query_nearest(point, k=5)
+    distances = [object_geometry(item).distance(point) for item in nearest]
+    expected = sorted(object_geometry(item).distance(point) for item in with_geometry)
+    assert distances == expected[:5], "should be the 5 nearest objects"
+
+    within = imx.query_within_distance(point, 100)
+    assert {item.puic for item in within} == {
+        item.puic
+        for item in with_geometry
+        if object_geometry(item).distance(point) <= 100
+    }, "should match brute force"
+
+    bbox = point.buffer(100).bounds
+    assert {item.puic for item in imx.query_bbox(*bbox)} == {
+        item.puic
+        for item in with_geometry
+        if object_geometry(item).intersects(point.buffer(100).envelope)
+    }, "should match brute force"
+
+
+@pytest.mark.slow
+def test_spatial_index_invalidation(imx_v1200_dir_instance: ImxContainer):
+    imx = imx_v1200_dir_instance
+    multi_repo = ImxMultiRepo([imx])
+    point = object_geometry(imx.get_by_types(["Signal"])[0])
+    assert len(multi_repo.query_within_distance(point, 1)) > 0, "should find signal"
+
+    multi_repo.remove_container(multi_repo.containers[0])
+    assert multi_repo.query_within_distance(point, 1) == [], "index should be rebuild"
+
+
+@pytest.mark.slow
+def test_classify_areas(
+    imx_v500_project_instance: ImxSingleFile, imx_v500_project_test_file_path: str
+):
+    imx_lazy = ImxSingleFile(imx_v500_project_test_file_path)
+    assert all(
+        item.area is None for item in imx_lazy.initial_situation.get_all()
+    ), "objects should not be classified on load"
+    assert not any(
+        item._geographic_location_parsed
+        for item in imx_lazy.initial_situation.get_by_types(["Signal"])
+    ), "geographic locations should not be parsed on load"
+
+    imx = imx_v500_project_instance
+    imx.initial_situation.classify_areas()
+    for item in imx.initial_situation.get_all():
+        geometry = object_geometry(item)
+        if geometry is None:
+            assert item.area is None, "objects without geometry have no area"
+            continue
+        expected = next(
+            (
+                area_type
+                for area_type, area in imx.project_areas.items()
+                if area.shapely.intersects(geometry)
+            ),
+            ImxAreaEnum.OUTSIDE,
+        )
+        assert item.area == expected, "should be the innermost area"
+
+    user_area = imx.initial_situation.get_by_areas([ImxAreaEnum.USER_AREA])
+    assert len(user_area) == 2921, "objects in user area is off"
+
+    imx_streamed = ImxSingleFile(imx_v500_project_test_file_path, streaming=True)
+    assert [
+        item.puic
+        for item in imx_streamed.initial_situation.get_by_areas(
+            [ImxAreaEnum.USER_AREA]
+        )
+    ] == [item.puic for item in user_area], "streaming should classify the same"
@@ -0,0 +1,58 @@
+import networkx as nx
+import pytest
+
+from imxInsights import ImxContainer, ImxSingleFile
+
+
+@pytest.mark.slow
+def test_topology_graph(imx_v500_project_instance: ImxSingleFile):
+    situation = imx_v500_project_instance.initial_situation
+    graph = situation.get_topology()
+    assert situation.get_topology() is graph, "graph should be cached"
+    assert len(graph.link_puics) == 121, "micro links is off"
+    assert len(graph.node_puics) == 126, "micro nodes is off"
+
+    expected = nx.MultiGraph()
+    expected.add_nodes_from(graph.node_puics)
+    for rail_connection in situation.get_by_types(["RailConnection"]):
+        properties = rail_connection.extension_properties
+        expected.add_edge(
+            properties["extension.MicroLink.FromMicroNode.@nodeRef"],
+            properties["extension.MicroLink.ToMicroNode.@nodeRef"],
+            weight=rail_connection.geometry.length,
+        )
+    assert sorted(map(sorted, graph.connected_components())) == sorted(
+        map(sorted, nx.connected_components(expected))
+    ), "components should match networkx"
+
+    start = graph.connected_components()[0][0]
+    reachable = graph.bfs(start)
+    assert reachable[0] == start, "bfs should start at the junction"
+    assert all(
+        graph.is_reachable(start, puic) for puic in reachable
+    ), "bfs junctions should be reachable"
+
+    end = reachable[-1]
+    length, route = graph.shortest_path(start, end)
+    assert length >= nx.shortest_path_length(
+        expected, start, end, weight="weight"
+    ), "route following the jumpers can not be shorter"
+    assert length == pytest.approx(
+        sum(situation.find(puic).geometry.length for puic in route)
+    ), "length should be the sum of the route"
+    assert graph.shortest_path(start, "unknown") is None, "no route expected"
+
+
+@pytest.mark.slow
+def test_topology_graph_blocked_jumpers(imx_v1200_dir_instance: ImxContainer):
+    graph = imx_v1200_dir_instance.get_topology()
+    # the jumpers of this node connect port 0 to port 1 and 2 and are not traversable
+    node = "087e22ef-407c-432e-b1ff-7f80c91b6621"
+    port_1_node = "cc5e5be7-2b22-4c5a-954c-94c9c3210859"
+    port_2_node = "520ae762-6dfe-4881-b565-4c4159cedcd4"
+    assert graph.is_reachable(port_2_node, node), "node should be reachable"
+    assert not graph.is_reachable(
+        port_2_node, port_1_node
+    ), "node with only non traversable jumpers should block"
+    assert graph.bfs(port_2_node) == [port_2_node, node], "bfs should stop at node"
+    assert graph.shortest_path(port_2_node, port_1_node) is None, "no route expected"
@@ -0,0 +1,12 @@
+from pathlib import Path
+
+from imxInsights.utils.xml_helpers import sniff_root_element
+from tests.helpers import sample_path
+
+
+def test_sniff_root_element():
+    tag, attributes = sniff_root_element(
+        Path(sample_path("1200/set_1/IMSpoor-SignalingDesign.xml"))
+    )
+    assert tag == "{http://www.prorail.nl/IMSpoor}SignalingDesign", "tag should match"
+    assert attributes["imxVersion"] == "12.0.0", "imx version should be 12.0.0"